@@ -0,0 +1,92 @@
+"""
+高阶单分段（纯白点）滑条的求值基准测试.
+
+对比 V3.5 之前逐采样点计算 C(n, i) (1-t)^(n-i) t^i 的方式与 bezier_core 的求值方式，
+并记录相对德卡斯特里奥算法的最大误差. 用法:
+
+    python benchmarks/bench_high_order.py [--segments 100] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bezier_core.bernstein import basis_cache  # noqa: E402
+from bezier_core.evaluation import de_casteljau_point, evaluate_point  # noqa: E402
+from bezier_core.tessellation import tessellate_segment  # noqa: E402
+
+ANCHOR_COUNTS = (10, 20, 40, 80, 120, 160, 200, 300)
+
+
+def legacy_binomial_coefficient(n, k):
+    """V3.5 的 binomial_coefficient（大整数）"""
+    if k < 0 or k > n:
+        return 0
+    if k == 0 or k == n:
+        return 1
+    k = min(k, n - k)
+    result = 1
+    for i in range(k):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def legacy_point(t, points):
+    """V3.5 的 calculate_bezier_point，去掉 QPoint 截断"""
+    n = len(points) - 1
+    x, y = 0, 0
+    for i, (px, py) in enumerate(points):
+        coefficient = legacy_binomial_coefficient(n, i) * (1 - t) ** (n - i) * t ** i
+        x += px * coefficient
+        y += py * coefficient
+    return x, y
+
+
+def best_time(func, repeat):
+    """返回 repeat 次运行中最短的耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(num_segments, repeat):
+    rng = np.random.default_rng(0)
+    t_values = [k / num_segments for k in range(num_segments + 1)]
+    print(f"curve_segments = {num_segments}, best of {repeat}")
+    print(f"{'anchors':>8} {'legacy ms':>10} {'point ms':>10} {'cold ms':>10} {'warm ms':>10} {'max error':>10}")
+    for anchors in ANCHOR_COUNTS:
+        points = rng.uniform(0, 512, (anchors, 2))
+        point_list = points.tolist()
+
+        legacy_ms = best_time(lambda: [legacy_point(t, point_list) for t in t_values], repeat)
+        point_ms = best_time(lambda: [evaluate_point(points, t) for t in t_values], repeat)
+
+        def cold():
+            basis_cache.clear()
+            return tessellate_segment(points, num_segments)
+        cold_ms = best_time(cold, repeat)
+        warm_ms = best_time(lambda: tessellate_segment(points, num_segments), repeat)
+
+        samples = tessellate_segment(points, num_segments)
+        reference = np.array([de_casteljau_point(points, t) for t in t_values])
+        max_error = np.abs(samples - reference).max()
+        print(f"{anchors:>8} {legacy_ms:>10.2f} {point_ms:>10.2f} {cold_ms:>10.3f} {warm_ms:>10.3f} {max_error:>10.1e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=100, help="每个分段的采样段数 (curve_segments)")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数，取最短耗时")
+    args = parser.parse_args()
+    run(args.segments, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
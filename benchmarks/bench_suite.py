@@ -0,0 +1,374 @@
+"""
+曲线热点路径的基准测试，覆盖 V3.5 与 legacy_versions 中的各个版本.
+
+测量四项：曲线细分 (tessellation)、Ctrl 最近点搜索 (ctrl_nearest)、Alt 预览生成 (alt_preview)、
+锚点影响力计算 (influence)，并在锚点数、红锚点数、curve_segments 上扫描. 用法:
+
+    python benchmarks/bench_suite.py [--versions V3.5 V3.0] [--anchors 5 20 80 300]
+                                     [--reds 0 4 16] [--segments 10 100 1000]
+                                     [--save-baseline benchmarks/baseline.json]
+                                     [--check benchmarks/baseline.json] [--tolerance 0.5]
+
+各版本的方法通过 ast 从源文件中提取，模块顶层只执行 import 和不含调用的常量赋值（不会加载 EditorReader.dll，也不创建窗口），
+挂到一个代替 QWidget 的最小外壳上运行. 源文件无法被当前 Python 解析的版本会被跳过，原因记录在结果的
+versions 和 skipped 中（例如 V3.1 在 Python 3.12 之前因 f-string 中的反斜杠无法解析）.
+--check 时，若某项耗时超过基线的 (1 + tolerance) 倍且绝对差超过 --min-delta 毫秒，或基线中测过的用例
+这次被跳过（版本无法加载、超出预算），以退出码 1 结束.
+
+基线保存在 benchmarks/baseline.json，由 tests/test_benchmarks.py 中标记为 benchmark 的测试对比:
+
+    python -m pytest -m benchmark
+
+计时与机器相关，更换测试机器或有意改变性能时用 --save-baseline 重新生成基线.
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from PyQt5.QtCore import QPoint, QPointF, Qt  # noqa: E402
+
+BENCHMARKS = ("tessellation", "ctrl_nearest", "alt_preview", "influence")
+SKIPPED_MODULES = {"clr", "Editor_Reader"}
+DEFAULT_ANCHORS = (5, 20, 80, 300)
+DEFAULT_REDS = (0, 4, 16)
+DEFAULT_SEGMENTS = (10, 100, 1000)
+WINDOW_SIZE = (1600, 900)
+
+
+class EditorShim:
+    """代替 QWidget 的最小外壳，只提供热点路径会用到的接口"""
+
+    def update(self, *args):
+        pass
+
+    def width(self):
+        return WINDOW_SIZE[0]
+
+    def height(self):
+        return WINDOW_SIZE[1]
+
+
+class FakeEvent:
+    """只带位置和修饰键的鼠标事件"""
+
+    def __init__(self, pos, modifiers=Qt.NoModifier):
+        self._pos = pos
+        self._modifiers = modifiers
+
+    def pos(self):
+        return self._pos
+
+    def localPos(self):
+        return QPointF(self._pos)
+
+    def x(self):
+        return self._pos.x()
+
+    def y(self):
+        return self._pos.y()
+
+    def modifiers(self):
+        return self._modifiers
+
+    def button(self):
+        return Qt.NoButton
+
+    def buttons(self):
+        return Qt.NoButton
+
+
+class FakePainter:
+    """所有绘制调用都是空操作的 QPainter"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def _calls_self_method(node):
+    """表达式中是否调用了 self 的方法（这类初始化依赖窗口，不在外壳上执行）"""
+    for child in ast.walk(node):
+        if (isinstance(child, ast.Call) and isinstance(child.func, ast.Attribute)
+                and isinstance(child.func.value, ast.Name) and child.func.value.id == "self"):
+            return True
+    return False
+
+
+def _defaults_function(init_node):
+    """把 __init__ 顶层的 self.xxx = ... 赋值提取为 _init_defaults(self)，每条单独 try，失败的忽略"""
+    statements = []
+    for stmt in init_node.body:
+        if not isinstance(stmt, ast.Assign) or _calls_self_method(stmt.value):
+            continue
+        if not all(isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                   and target.value.id == "self" for target in stmt.targets):
+            continue
+        statements.append(ast.Try(
+            body=[stmt],
+            handlers=[ast.ExceptHandler(type=ast.Name("Exception", ast.Load()), name=None, body=[ast.Pass()])],
+            orelse=[], finalbody=[],
+        ))
+    return ast.FunctionDef(
+        name="_init_defaults",
+        args=ast.arguments(posonlyargs=[], args=[ast.arg("self")], kwonlyargs=[], kw_defaults=[], defaults=[]),
+        body=statements or [ast.Pass()], decorator_list=[], returns=None,
+    )
+
+
+def load_editor_class(path):
+    """从编辑器源文件中提取 BezierCurveEditor 的方法，返回挂在 EditorShim 上的类"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    module_body = []
+    editor_class = None
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            if not any(alias.name.split(".")[0] in SKIPPED_MODULES for alias in node.names):
+                module_body.append(node)
+        elif isinstance(node, ast.ImportFrom):
+            if (node.module or "").split(".")[0] not in SKIPPED_MODULES:
+                module_body.append(node)
+        elif isinstance(node, ast.FunctionDef):
+            module_body.append(node)
+        elif isinstance(node, ast.Assign) and not any(isinstance(child, ast.Call) for child in ast.walk(node.value)):
+            module_body.append(node)  # 模块级常量；含调用的赋值（加载 DLL 等）不执行
+        elif isinstance(node, ast.ClassDef) and node.name == "BezierCurveEditor":
+            editor_class = node
+    if editor_class is None:
+        raise ValueError("BezierCurveEditor not found")
+
+    methods = [node for node in editor_class.body if isinstance(node, ast.FunctionDef) and node.name != "__init__"]
+    init_nodes = [node for node in editor_class.body if isinstance(node, ast.FunctionDef) and node.name == "__init__"]
+    if init_nodes:
+        methods.append(_defaults_function(init_nodes[0]))
+    shim_class = ast.ClassDef(
+        name="BezierCurveEditor", bases=[ast.Name("EditorShim", ast.Load())], keywords=[],
+        body=methods, decorator_list=[],
+    )
+    module = ast.fix_missing_locations(ast.Module(body=module_body + [shim_class], type_ignores=[]))
+
+    namespace = {"__name__": "bench_editor", "__file__": path, "EditorShim": EditorShim}
+    exec(compile(module, path, "exec"), namespace)
+    return namespace["BezierCurveEditor"]
+
+
+def discover_versions():
+    """返回 {版本名: 源文件路径}，例如 {"V3.5": ".../bezier_editor_V3.5.py"}"""
+    paths = glob.glob(os.path.join(REPO_ROOT, "bezier_editor_V*.py"))
+    paths += glob.glob(os.path.join(REPO_ROOT, "legacy_versions", "bezier_editor_V*.py"))
+    versions = {os.path.basename(path)[len("bezier_editor_"):-len(".py")]: path for path in paths}
+    return dict(sorted(versions.items()))
+
+
+def make_editor(editor_class, anchors, reds, num_segments):
+    """创建外壳实例并放入一条确定的随机曲线"""
+    editor = editor_class()
+    if hasattr(editor, "_init_defaults"):
+        editor._init_defaults()
+    rng = np.random.default_rng(anchors * 1000 + reds)
+    coordinates = rng.uniform((200, 100), (1400, 800), (anchors, 2)).astype(int)
+    editor.control_points = [QPoint(int(x), int(y)) for x, y in coordinates]
+    editor.red_anchors = {int(idx) for idx in np.linspace(0, anchors - 1, reds + 2)[1:-1].round()}
+    editor.curve_segments = num_segments
+    editor.is_ctrl_pressed = False
+    editor.is_alt_pressed = False
+    editor.pre_selected_point_index = None
+    # 基准测试测量计算本身的耗时，后台计算统一改为同步执行
+    editor.background_computation = False
+    return editor
+
+
+def tessellate(editor):
+    """调用版本自带的 update_curve_cache；更早的版本在 paintEvent 中逐点调用 calculate_bezier_point"""
+    if hasattr(editor, "update_curve_cache"):
+        editor.update_curve_cache()
+    else:
+        editor.cached_curve_points = [
+            editor.calculate_bezier_point(t / editor.curve_segments, editor.control_points)
+            for t in range(editor.curve_segments + 1)
+        ]
+
+
+def prepare(benchmark, editor):
+    """返回要计时的无参函数；该版本不支持此项时返回 None"""
+    if benchmark == "tessellation":
+        return lambda: tessellate(editor)
+
+    tessellate(editor)
+    curve_points = editor.cached_curve_points
+    if benchmark == "ctrl_nearest":
+        if not hasattr(editor, "update_ctrl_highlight"):
+            return None
+        middle = curve_points[len(curve_points) // 2]
+        event = FakeEvent(QPoint(int(middle.x()) + 3, int(middle.y()) + 3), Qt.ControlModifier)
+        return lambda: editor.update_ctrl_highlight(event, 30)
+
+    if benchmark == "alt_preview":
+        if not hasattr(editor, "update_preview_slider"):
+            return None
+        editor.is_alt_pressed = True
+        k = len(editor.control_points) // 2 - 1
+        start, end = editor.control_points[k], editor.control_points[k + 1]
+        event = FakeEvent(QPoint((start.x() + end.x()) // 2, (start.y() + end.y()) // 2), Qt.AltModifier)
+        return lambda: editor.update_preview_slider(event)
+
+    if benchmark == "influence":
+        if not hasattr(editor, "draw_influence_weights"):
+            return None
+        interior = [i for i in range(1, len(editor.control_points) - 1) if i not in editor.red_anchors]
+        if not interior:
+            return None
+        editor.pre_selected_point_index = interior[len(interior) // 2]
+        painter = FakePainter()
+        return lambda: editor.draw_influence_weights(painter)
+    raise ValueError(benchmark)
+
+
+def best_time(func, repeat, budget):
+    """最多运行 repeat 次（累计超过 budget 秒后提前停止），返回最短耗时（毫秒）"""
+    best = float("inf")
+    spent = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        if spent > budget:
+            break
+    return best * 1000
+
+
+def case_key(benchmark, anchors, reds, num_segments):
+    return f"{benchmark}/anchors={anchors}/red={reds}/segments={num_segments}"
+
+
+def run(versions, anchor_counts, red_counts, segment_counts, repeat, budget):
+    results = {}
+    skipped = {}
+    statuses = {}
+    for version, path in versions.items():
+        try:
+            editor_class = load_editor_class(path)
+        except (SyntaxError, ValueError) as e:
+            skipped[version] = f"cannot load: {e.__class__.__name__}: {e}"
+            statuses[version] = {"path": os.path.relpath(path, REPO_ROOT), "status": "skipped", "reason": skipped[version]}
+            print(f"{version}: skipped ({skipped[version]})")
+            continue
+        statuses[version] = {"path": os.path.relpath(path, REPO_ROOT), "status": "measured"}
+
+        supports_red = "red_anchors" in open(path, encoding="utf-8").read()
+        results[version] = {}
+        print(f"{version}:")
+        for benchmark in BENCHMARKS:
+            for num_segments in segment_counts:
+                over_budget = False
+                for anchors in anchor_counts:
+                    for reds in red_counts:
+                        if reds and (not supports_red or reds > anchors - 2):
+                            continue
+                        key = case_key(benchmark, anchors, reds, num_segments)
+                        if over_budget:
+                            skipped[f"{version}/{key}"] = "over budget"
+                            continue
+                        func = prepare(benchmark, make_editor(editor_class, anchors, reds, num_segments))
+                        if func is None:
+                            continue
+                        elapsed = best_time(func, repeat, budget)
+                        results[version][key] = round(elapsed, 4)
+                        print(f"  {key:<48} {elapsed:>10.3f} ms")
+                        # 单次已超过预算时，更多锚点的用例只会更慢，跳过
+                        over_budget = elapsed / 1000 > budget
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "versions": statuses,
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def check(report, baseline, tolerance, min_delta):
+    """
+    对比基线，返回退化项列表 [(版本, 用例, 基线毫秒, 当前毫秒)].
+
+    基线中测过、这次却被跳过的用例（版本无法加载或超出预算）也算退化，当前毫秒为 None；
+    这次没有请求的版本和用例不参与对比.
+    """
+    regressions = []
+    for version, cases in baseline.get("results", {}).items():
+        version_skipped = version in report["skipped"]
+        if version not in report["results"] and not version_skipped:
+            continue
+        current = report["results"].get(version, {})
+        for key, base in cases.items():
+            elapsed = current.get(key)
+            if elapsed is None:
+                if version_skipped or f"{version}/{key}" in report["skipped"]:
+                    regressions.append((version, key, base, None))
+                continue
+            if elapsed > base * (1 + tolerance) and elapsed - base > min_delta:
+                regressions.append((version, key, base, elapsed))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--versions", nargs="+", help="要测试的版本，例如 V3.5 V3.0（默认全部）")
+    parser.add_argument("--anchors", nargs="+", type=int, default=DEFAULT_ANCHORS, help="锚点数")
+    parser.add_argument("--reds", nargs="+", type=int, default=DEFAULT_REDS, help="红锚点数（不支持红锚点的版本只测 0）")
+    parser.add_argument("--segments", nargs="+", type=int, default=DEFAULT_SEGMENTS, help="curve_segments")
+    parser.add_argument("--repeat", type=int, default=5, help="每项最多重复次数，取最短耗时")
+    parser.add_argument("--budget", type=float, default=2.0, help="每项累计耗时上限（秒）")
+    parser.add_argument("--output", help="把结果写入 JSON 文件")
+    parser.add_argument("--save-baseline", metavar="PATH", help="把结果保存为基线")
+    parser.add_argument("--check", metavar="PATH", help="与基线对比，出现退化时以退出码 1 结束")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="允许的相对退化比例")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="忽略小于该值（毫秒）的绝对差")
+    args = parser.parse_args()
+
+    versions = discover_versions()
+    if args.versions:
+        unknown = set(args.versions) - set(versions)
+        if unknown:
+            parser.error(f"unknown versions: {', '.join(sorted(unknown))}")
+        versions = {version: versions[version] for version in args.versions}
+
+    report = run(versions, args.anchors, args.reds, args.segments, args.repeat, args.budget)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            print(f"results written to {path}")
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("platform") != report["platform"] or baseline.get("python") != report["python"]:
+            print(f"note: baseline was recorded on {baseline.get('platform')} / Python {baseline.get('python')}")
+        regressions = check(report, baseline, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.check}:")
+            for version, key, base, elapsed in regressions:
+                if elapsed is None:
+                    reason = report["skipped"].get(version) or report["skipped"].get(f"{version}/{key}")
+                    print(f"  {version} {key}: {base:.3f} ms -> skipped ({reason})")
+                else:
+                    print(f"  {version} {key}: {base:.3f} ms -> {elapsed:.3f} ms ({elapsed / base:.2f}x)")
+            sys.exit(1)
+        print(f"no regressions against {args.check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+bezier_core: 与界面无关的贝塞尔曲线计算模块.
+
+点坐标统一使用形状为 (n, 2) 的 float64 数组，不依赖 PyQt5.
+"""
+from .arclength import ArcLengthTable
+from .bernstein import BernsteinBasisCache, basis_cache, bernstein_matrix, binomial_coefficient, uniform_t_values
+from .evaluation import bernstein_row, bernstein_value, de_casteljau_point, evaluate_point
+from .geometry import ViewCamera, playfield_rect, remap_coordinates, remap_points
+from .osu_format import OsuSlider, format_curve_points, format_slider, parse_curve_points, parse_slider
+from .segments import SegmentIndex, split_segments
+from .spatial import PointHash, SampleGrid, SegmentGrid, point_segment_distances
+from .tessellation import (
+    CurveCache, Tessellation, tessellate_curve, tessellate_segment, tessellate_segment_adaptive
+)
+from .worker import BackgroundWorker, WorkerResult
@@ -0,0 +1,73 @@
+"""
+累计弧长表：每次刷新曲线缓存时构建一次，总长度 O(1)，距离与曲线参数的互查 O(log n).
+
+曲线参数取 "分段序号 + 分段内 t"，在整条曲线上单调递增，第 k 段覆盖 [k, k + 1].
+"""
+import numpy as np
+
+
+class ArcLengthTable:
+    """
+    采样折线的累计弧长表.
+
+    Attributes:
+        cumulative: 第 k 个采样点到曲线起点的折线长度.
+        params: 第 k 个采样点的曲线参数.
+    """
+
+    def __init__(self, points, params=None):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.points = points
+        self.cumulative = np.zeros(len(points))
+        if len(points) > 1:
+            np.cumsum(np.hypot(*np.diff(points, axis=0).T), out=self.cumulative[1:])
+        self.params = np.arange(len(points), dtype=np.float64) if params is None else np.asarray(params, np.float64)
+
+    @classmethod
+    def from_tessellation(cls, tessellation):
+        """根据 Tessellation 构建，曲线参数由分段序号和每个采样点的 t 值组成"""
+        params = np.array(tessellation.t_values, dtype=np.float64)
+        for segment_idx, (range_start, range_end) in enumerate(tessellation.sample_ranges):
+            params[range_start + 1:range_end + 1] += segment_idx  # 分段起点与前一段终点重合，保持前一段的参数
+        return cls(tessellation.points, params)
+
+    @property
+    def total_length(self):
+        return float(self.cumulative[-1]) if len(self.cumulative) else 0.0
+
+    def _locate(self, keys, value):
+        """二分查找 value 所在的采样区间，返回 (区间起点序号, 区间内插值比例)"""
+        idx = int(np.clip(np.searchsorted(keys, value, side="right") - 1, 0, len(keys) - 2))
+        span = keys[idx + 1] - keys[idx]
+        fraction = (value - keys[idx]) / span if span > 0 else 0.0
+        return idx, min(max(fraction, 0.0), 1.0)
+
+    def distance_at(self, param):
+        """曲线参数 → 到起点的弧长"""
+        if len(self.cumulative) < 2:
+            return 0.0
+        idx, fraction = self._locate(self.params, param)
+        return float(self.cumulative[idx] + (self.cumulative[idx + 1] - self.cumulative[idx]) * fraction)
+
+    def param_at_distance(self, distance):
+        """到起点的弧长 → 曲线参数，超出范围时截断到曲线两端"""
+        if len(self.cumulative) < 2:
+            return 0.0
+        idx, fraction = self._locate(self.cumulative, distance)
+        return float(self.params[idx] + (self.params[idx + 1] - self.params[idx]) * fraction)
+
+    def segment_t_at_distance(self, distance):
+        """到起点的弧长 → (分段序号, 分段内 t)"""
+        param = self.param_at_distance(distance)
+        segment_idx = min(int(param), max(int(self.params[-1]) - 1, 0)) if len(self.params) else 0
+        return segment_idx, param - segment_idx
+
+    def point_at_distance(self, distance):
+        """到起点的弧长 → 折线上的点 (x, y)"""
+        if len(self.points) == 0:
+            return None
+        if len(self.points) == 1:
+            return float(self.points[0, 0]), float(self.points[0, 1])
+        idx, fraction = self._locate(self.cumulative, distance)
+        x, y = self.points[idx] + (self.points[idx + 1] - self.points[idx]) * fraction
+        return float(x), float(y)
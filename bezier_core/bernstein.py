@@ -0,0 +1,140 @@
+"""
+Bernstein 基函数及进程内共享的基矩阵缓存.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def uniform_t_values(num_segments):
+    """返回 [0, 1] 上等间距的 num_segments + 1 个 t 值"""
+    return np.linspace(0.0, 1.0, num_segments + 1)
+
+
+# 超过该阶数时改用对数形式计算基矩阵，避免大整数二项式系数参与浮点运算
+DIRECT_ORDER_LIMIT = 60
+
+
+def binomial_coefficient(n, k):
+    """计算二项式系数 C(n, k)，k 超出 [0, n] 时返回 0"""
+    if k < 0 or k > n:
+        return 0
+    return math.comb(n, k)
+
+
+def log_binomials(order):
+    """返回 ln C(order, i), i = 0..order"""
+    i = np.arange(order + 1, dtype=np.float64)
+    lgamma = np.vectorize(math.lgamma, otypes=[np.float64])
+    return math.lgamma(order + 1) - lgamma(i + 1) - lgamma(order - i + 1)
+
+
+def bernstein_matrix(order, t_values):
+    """
+    计算 Bernstein 基矩阵.
+
+    低阶时直接按 C(n, i) t^i (1-t)^(n-i) 计算；高阶时在对数空间求值，
+    二项式系数不会溢出，极小的幂次也只会平滑地下溢为 0.
+
+    Args:
+        order: 曲线阶数 (控制点数量 - 1).
+        t_values: 采样参数 t 的序列.
+
+    Returns:
+        形状为 (len(t_values), order + 1) 的矩阵，第 k 行是 t_values[k] 处的全部基函数值.
+    """
+    t = np.asarray(t_values, dtype=np.float64).reshape(-1, 1)
+    i = np.arange(order + 1, dtype=np.float64)
+    if order <= DIRECT_ORDER_LIMIT:
+        binomials = np.array([math.comb(order, k) for k in range(order + 1)], dtype=np.float64)
+        return binomials * t ** i * (1.0 - t) ** (order - i)
+
+    interior = (t > 0.0) & (t < 1.0)
+    safe_t = np.where(interior, t, 0.5)
+    log_basis = log_binomials(order) + i * np.log(safe_t) + (order - i) * np.log1p(-safe_t)
+    matrix = np.where(interior, np.exp(log_basis), 0.0)
+    # t = 0 和 t = 1 处只有首/尾控制点有影响
+    matrix[:, 0] = np.where(t[:, 0] <= 0.0, 1.0, matrix[:, 0])
+    matrix[:, -1] = np.where(t[:, 0] >= 1.0, 1.0, matrix[:, -1])
+    return matrix
+
+
+class BernsteinBasisCache:
+    """
+    按 (分段阶数, 采样段数) 缓存均匀采样的 Bernstein 基矩阵.
+
+    缓存表按占用字节数做 LRU 淘汰，表本身只读，可以被多处同时引用.
+    查找和淘汰由锁保护，GUI 线程和后台计算线程可以同时使用同一个缓存.
+    hits / misses / evictions 计数用于观察缓存命中情况.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._tables = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, order, num_segments):
+        """返回形状为 (num_segments + 1, order + 1) 的基矩阵"""
+        key = (order, num_segments)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        # 计算基矩阵时不持有锁；两个线程同时缺失同一张表时，后写入的覆盖先写入的
+        table = bernstein_matrix(order, uniform_t_values(num_segments))
+        table.setflags(write=False)
+        with self._lock:
+            previous = self._tables.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.nbytes
+            self._tables[key] = table
+            self.current_bytes += table.nbytes
+            self._evict()
+        return table
+
+    def row(self, order, num_segments, sample_idx):
+        """返回第 sample_idx 个采样点处全部控制点的影响力"""
+        return self.get(order, num_segments)[sample_idx]
+
+    def column(self, order, num_segments, point_idx):
+        """返回第 point_idx 个控制点在全部采样点处的影响力"""
+        return self.get(order, num_segments)[:, point_idx]
+
+    def _evict(self):
+        # 调用方持有锁；至少保留最新的一张表，即使它本身超过了内存上限
+        while self.current_bytes > self.max_bytes and len(self._tables) > 1:
+            _, table = self._tables.popitem(last=False)
+            self.current_bytes -= table.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        """清空缓存（不重置计数器）"""
+        with self._lock:
+            self._tables.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """返回缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._tables),
+            "bytes": self.current_bytes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# 进程内共享的基矩阵缓存
+basis_cache = BernsteinBasisCache()
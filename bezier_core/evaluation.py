@@ -0,0 +1,80 @@
+"""
+高阶曲线的数值稳定求值.
+
+纯白点滑条常常是 80-200 个锚点的单一分段，直接按 C(n, i) t^i (1-t)^(n-i)
+逐项计算会让大整数二项式系数与极小的幂次相乘. 这里的求值都只使用浮点运算：
+
+- bernstein_row: 从二项分布的众数出发，用相邻基函数之比递推整行，O(n)；
+- bernstein_value: 在对数空间计算单个基函数值，O(1)；
+- de_casteljau_point: 只做凸组合的德卡斯特里奥算法，O(n^2)，作为兜底.
+"""
+import math
+
+import numpy as np
+
+# 基函数之和偏离 1 超过该值时认为递推结果不可信，改用德卡斯特里奥算法
+PARTITION_TOLERANCE = 1e-9
+
+
+def bernstein_value(order, i, t):
+    """计算单个 Bernstein 基函数值 B(order, i, t)，超出定义域时返回 0"""
+    if not (0 <= i <= order) or not (0 <= t <= 1):
+        return 0.0
+    if t == 0:
+        return 1.0 if i == 0 else 0.0
+    if t == 1:
+        return 1.0 if i == order else 0.0
+    log_basis = (
+        math.lgamma(order + 1) - math.lgamma(i + 1) - math.lgamma(order - i + 1)
+        + i * math.log(t) + (order - i) * math.log1p(-t)
+    )
+    return math.exp(log_basis)
+
+
+def bernstein_row(order, t):
+    """
+    计算 t 处全部 order + 1 个 Bernstein 基函数值.
+
+    先在对数空间求出众数位置 m 处的值，再分别向两侧按
+    B(i+1) = B(i) * (n-i)/(i+1) * t/(1-t) 递推. 离开众数后比值都小于 1，
+    因此不会溢出，远端的值只会下溢为 0.
+    """
+    row = np.zeros(order + 1)
+    if t <= 0:
+        row[0] = 1.0
+        return row
+    if t >= 1:
+        row[-1] = 1.0
+        return row
+
+    mode = min(order, int((order + 1) * t))
+    row[mode] = bernstein_value(order, mode, t)
+    ratio = t / (1.0 - t)
+
+    # 向右递推：B(i+1) / B(i) = (n - i) / (i + 1) * t / (1 - t)
+    i = np.arange(mode, order, dtype=np.float64)
+    row[mode + 1:] = row[mode] * np.cumprod((order - i) / (i + 1) * ratio)
+
+    # 向左递推：B(i-1) / B(i) = i / (n - i + 1) * (1 - t) / t
+    i = np.arange(mode, 0, -1, dtype=np.float64)
+    row[:mode][::-1] = row[mode] * np.cumprod(i / (order - i + 1) / ratio)
+    return row
+
+
+def de_casteljau_point(points, t):
+    """德卡斯特里奥算法求单点，只做凸组合，任意阶数下都数值稳定"""
+    work = np.array(points, dtype=np.float64).reshape(-1, 2)
+    for r in range(1, len(work)):
+        work[:-r] = work[:-r] + (work[1:len(work) - r + 1] - work[:-r]) * t
+    return float(work[0, 0]), float(work[0, 1])
+
+
+def evaluate_point(points, t):
+    """计算单个参数 t 处的曲线点，返回 (x, y)；递推结果异常时退回德卡斯特里奥算法"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    row = bernstein_row(len(points) - 1, t)
+    total = row.sum()
+    if not np.isfinite(total) or abs(total - 1.0) > PARTITION_TOLERANCE:
+        return de_casteljau_point(points, t)
+    x, y = row @ points
+    return float(x), float(y)
@@ -0,0 +1,118 @@
+"""
+编辑器坐标与 osu! 坐标之间的映射.
+
+编辑器中的红色矩形对应 osu! 编辑器可见区域 [-65, 575] × [-56, 424]，矩形底边对应 osu! 的 y 最大值.
+ViewCamera 把这一映射表示为缩放 + 平移，文档（锚点）保存在 osu! 坐标中，窗口和矩形大小只影响相机.
+"""
+import numpy as np
+
+# osu! 坐标系中红色矩形对应的范围
+OSU_X_MIN = -65
+OSU_X_MAX = 575
+OSU_Y_MIN = -56
+OSU_Y_MAX = 424
+
+
+def playfield_rect(width, height, rect_scale):
+    """
+    根据窗口尺寸计算红色矩形，与编辑器绘制的矩形一致.
+
+    Returns:
+        (左下角 x, 左下角 y, 右上角 x, 右上角 y).
+    """
+    center_x = width // 2
+    center_y = height // 2
+    rect_width = int(width * rect_scale)
+    rect_height = int(rect_width * 3 / 4)
+    rect_x = center_x - rect_width // 2
+    rect_y = center_y - rect_height // 2
+    return rect_x, rect_y + rect_height, rect_x + rect_width, rect_y
+
+
+def remap_coordinates(x, y, rect_bottom_left_x, rect_bottom_left_y, rect_top_right_x, rect_top_right_y, reverse=False):
+    """
+    将点坐标从编辑器坐标系映射到 osu! 坐标系 (reverse=True 时反向映射).
+
+    Args:
+        x, y: 要映射的坐标，可以是标量或 numpy 数组.
+        rect_bottom_left_x: 红色矩形左下角在编辑器坐标系中的 X 坐标.
+        rect_bottom_left_y: 红色矩形左下角在编辑器坐标系中的 Y 坐标.
+        rect_top_right_x: 红色矩形右上角在编辑器坐标系中的 X 坐标.
+        rect_top_right_y: 红色矩形右上角在编辑器坐标系中的 Y 坐标.
+        reverse: 如果为 True, 执行反向映射 (osu! 坐标系 -> 编辑器坐标系).
+
+    Returns:
+        映射后的 (x, y)，不取整；矩形宽或高为 0 时返回 (0, 0).
+    """
+    # 编辑器坐标系中红色矩形的宽度和高度
+    rect_width_current = rect_top_right_x - rect_bottom_left_x
+    rect_height_current = rect_bottom_left_y - rect_top_right_y
+
+    if rect_width_current == 0 or rect_height_current == 0:
+        return 0, 0  # 避免除以零
+
+    # 计算 X 和 Y 坐标的比例和偏移
+    scale_x = (OSU_X_MAX - OSU_X_MIN) / rect_width_current
+    scale_y = (OSU_Y_MAX - OSU_Y_MIN) / rect_height_current
+
+    if reverse:  # 反向映射 (osu! 坐标系 -> 编辑器坐标系)
+        new_x = (1.0 / scale_x) * (x - OSU_X_MIN) + rect_bottom_left_x
+        new_y = (1.0 / scale_y) * (y - OSU_Y_MAX) + rect_bottom_left_y  # 注意 Y 轴反转
+    else:  # 正向映射 (编辑器坐标系 -> osu! 坐标系)
+        offset_x = OSU_X_MIN - rect_bottom_left_x * scale_x
+        offset_y = OSU_Y_MAX - rect_bottom_left_y * scale_y
+        new_x = scale_x * x + offset_x
+        new_y = scale_y * y + offset_y
+    return new_x, new_y
+
+
+def remap_points(points, rect, reverse=False):
+    """对 (n, 2) 数组整体做 remap_coordinates，rect 为 playfield_rect() 的返回值"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    new_x, new_y = remap_coordinates(points[:, 0], points[:, 1], *rect, reverse=reverse)
+    return np.column_stack(np.broadcast_arrays(new_x, new_y)).astype(np.float64).reshape(-1, 2)
+
+
+class ViewCamera:
+    """
+    osu! 坐标 -> 屏幕坐标的视图变换：screen = osu * scale + offset（x、y 各自独立）.
+
+    窗口大小或红色矩形大小变化时只需要重新计算相机，不改变文档中的锚点.
+    """
+
+    def __init__(self, scale_x=1.0, scale_y=1.0, offset_x=0.0, offset_y=0.0):
+        self.scale_x = float(scale_x)
+        self.scale_y = float(scale_y)
+        self.offset_x = float(offset_x)
+        self.offset_y = float(offset_y)
+
+    @classmethod
+    def from_playfield(cls, width, height, rect_scale):
+        """按 playfield_rect() 计算的红色矩形建立相机，与 remap_coordinates 的映射一致"""
+        bottom_left_x, bottom_left_y, top_right_x, top_right_y = playfield_rect(width, height, rect_scale)
+        if top_right_x == bottom_left_x or bottom_left_y == top_right_y:
+            return cls()  # 窗口尺寸为 0 时退化为单位变换
+        scale_x = (top_right_x - bottom_left_x) / (OSU_X_MAX - OSU_X_MIN)
+        scale_y = (bottom_left_y - top_right_y) / (OSU_Y_MAX - OSU_Y_MIN)
+        return cls(scale_x, scale_y, bottom_left_x - OSU_X_MIN * scale_x, bottom_left_y - OSU_Y_MAX * scale_y)
+
+    @property
+    def scale(self):
+        """平均缩放比例（屏幕像素 / osu! 单位），用于换算长度"""
+        return (self.scale_x + self.scale_y) / 2
+
+    def to_screen(self, x, y):
+        """osu! 坐标 -> 屏幕坐标，x、y 可以是标量或 numpy 数组"""
+        return x * self.scale_x + self.offset_x, y * self.scale_y + self.offset_y
+
+    def to_document(self, x, y):
+        """屏幕坐标 -> osu! 坐标，x、y 可以是标量或 numpy 数组"""
+        return (x - self.offset_x) / self.scale_x, (y - self.offset_y) / self.scale_y
+
+    def document_vector(self, dx, dy):
+        """屏幕上的位移 -> osu! 坐标中的位移"""
+        return dx / self.scale_x, dy / self.scale_y
+
+    def document_length(self, length):
+        """屏幕上的长度（像素）-> osu! 坐标中的长度，用于把像素阈值换算到文档坐标"""
+        return length / self.scale
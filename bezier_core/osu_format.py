@@ -0,0 +1,100 @@
+"""
+osu! 滑条字符串的解析与生成.
+
+红锚点在 osu! 中表示为连续两个相同的点. 点坐标为 osu! 坐标系下的整数.
+"""
+
+SUPPORTED_CURVE_TYPES = ("B", "P", "L")
+
+
+class OsuSlider:
+    """
+    解析后的 osu! 滑条.
+
+    Attributes:
+        points: 全部锚点的 (x, y) 列表，第一个为滑条起点；红锚点只保留一个.
+        red_anchors: 红锚点在 points 中的索引集合.
+        curve_type: 曲线类型字母（"B" / "P" / "L" 等）.
+        start_time, object_type, hit_sound, repeats, length: 原字符串中的其它字段，不存在时为 None.
+    """
+
+    def __init__(self, points, red_anchors, curve_type, start_time=None, object_type=None,
+                 hit_sound=None, repeats=None, length=None):
+        self.points = points
+        self.red_anchors = red_anchors
+        self.curve_type = curve_type
+        self.start_time = start_time
+        self.object_type = object_type
+        self.hit_sound = hit_sound
+        self.repeats = repeats
+        self.length = length
+
+
+def parse_curve_points(curve_data, start_point):
+    """
+    解析形如 "B|83:188|129:149|110:95" 的曲线字段.
+
+    Returns:
+        (含起点在内的锚点列表, 红锚点索引集合).
+    """
+    points = [start_point]
+    red_anchors = set()
+    prev_point = None  # 用于存储前一个点，检测连续相同点
+    for pt in curve_data[2:].split("|"):  # 去掉 "B|" 等类型前缀
+        x, y = pt.split(":")
+        current_point = (int(x), int(y))
+
+        # 检查是否与前一个点坐标相同（红锚点标记）
+        if prev_point is not None and prev_point == current_point:
+            # 如果与前一个点坐标相同，则跳过此点，并将前一个点的索引添加到红锚点集合中
+            red_anchors.add(len(points) - 1)
+            prev_point = None  # 重置前一个点，避免连续三个相同点的情况
+            continue
+
+        points.append(current_point)
+        prev_point = current_point
+    return points, red_anchors
+
+
+def parse_slider(slider_data):
+    """
+    解析 osu! 滑条字符串 "x,y,time,type,hitsound,B|x:y|...,repeats,length[,...]".
+
+    Raises:
+        ValueError: 字段不足或坐标无法解析.
+    """
+    parts = slider_data.strip().split(",")
+    if len(parts) < 6:
+        raise ValueError("Invalid slider format")
+
+    curve_data = parts[5]
+    points, red_anchors = parse_curve_points(curve_data, (int(parts[0]), int(parts[1])))
+    return OsuSlider(
+        points, red_anchors, curve_data.split("|", 1)[0],
+        start_time=int(parts[2]),
+        object_type=parts[3],
+        hit_sound=parts[4],
+        repeats=int(parts[6]) if len(parts) > 6 else None,
+        length=float(parts[7]) if len(parts) > 7 else None,
+    )
+
+
+def format_curve_points(points, duplicated_indices, curve_type="B"):
+    """
+    生成曲线字段，不包含起点 points[0].
+
+    duplicated_indices 中的索引对应的点会重复输出一次（osu! 的红锚点表示法）.
+    """
+    curve_parts = [curve_type]
+    for i, (x, y) in enumerate(points[1:], 1):
+        curve_parts.append(f"{int(x)}:{int(y)}")
+        if i in duplicated_indices:
+            curve_parts.append(f"{int(x)}:{int(y)}")
+    return "|".join(curve_parts)
+
+
+def format_slider(points, red_anchors, start_time, object_type, hit_sound, repeats, length):
+    """生成完整的 osu! 滑条字符串"""
+    start_x, start_y = points[0]
+    curve_data = format_curve_points(points, red_anchors)
+    return f"{int(start_x)},{int(start_y)},{start_time},{object_type},{hit_sound},{curve_data},{repeats},{length}"
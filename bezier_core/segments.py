@@ -0,0 +1,66 @@
+"""
+红锚点分段索引：每个文档版本构建一次，用二分查找回答"锚点 / 采样点属于哪个分段".
+"""
+from bisect import bisect_left, bisect_right
+
+
+def split_segments(num_points, red_anchors):
+    """按红锚点把控制点切分为分段，返回 (起点索引, 终点索引) 列表，红锚点同时属于前后两段"""
+    segments = []
+    start_idx = 0
+    for red_idx in sorted(red_anchors):
+        if red_idx > start_idx:  # 确保有足够的点形成一段
+            segments.append((start_idx, red_idx))
+        start_idx = red_idx
+    # 处理最后一段（最后一个红色锚点到结束）
+    if start_idx < num_points - 1:
+        segments.append((start_idx, num_points - 1))
+    return segments
+
+
+class SegmentIndex:
+    """
+    红锚点分段及其在细分结果中的采样范围.
+
+    Attributes:
+        segments: 每个分段的 (起点锚点索引, 终点锚点索引).
+        sample_ranges: 每个分段在细分结果中的 (起始采样序号, 结束采样序号)，两端都包含.
+        t_values: 每个采样点在所属分段内的 t 值；没有细分结果时为 None.
+    """
+
+    def __init__(self, segments, sample_ranges=(), t_values=None):
+        self.segments = list(segments)
+        self.sample_ranges = list(sample_ranges)
+        self.t_values = t_values
+        self._anchor_starts = [start for start, _ in self.segments]
+        self._sample_ends = [end for _, end in self.sample_ranges]
+
+    @classmethod
+    def from_anchors(cls, num_points, red_anchors):
+        """只根据锚点构建，不包含采样信息"""
+        return cls(split_segments(num_points, red_anchors))
+
+    def __len__(self):
+        return len(self.segments)
+
+    def segment_of_anchor(self, anchor_idx):
+        """
+        返回锚点所属分段的序号，找不到时返回 None.
+
+        红锚点同时是前一段的终点和后一段的起点，这里归入后一段；最后一个锚点归入最后一段.
+        """
+        if not self.segments or not 0 <= anchor_idx <= self.segments[-1][1]:
+            return None
+        if anchor_idx == self.segments[-1][1]:
+            return len(self.segments) - 1
+        return bisect_right(self._anchor_starts, anchor_idx) - 1
+
+    def segment_of_sample(self, sample_idx):
+        """返回采样点所属分段的序号，相邻分段共享的端点采样归入前一段；找不到时返回 None"""
+        if not self.sample_ranges or not 0 <= sample_idx <= self._sample_ends[-1]:
+            return None
+        return bisect_left(self._sample_ends, sample_idx)
+
+    def local_t(self, sample_idx):
+        """返回采样点在所属分段内的 t 值"""
+        return float(self.t_values[sample_idx])
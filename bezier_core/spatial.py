@@ -0,0 +1,269 @@
+"""
+空间索引：用均匀网格 / 空间哈希回答"离某点最近的点（线段）"和"某半径内的点"，查询代价与点的总数无关.
+"""
+import math
+
+import numpy as np
+
+
+def point_segment_distances(points, starts, ends):
+    """
+    逐行计算 points[k] 到线段 starts[k]-ends[k] 的距离.
+
+    points 可以是单个点 (1, 2)，此时按广播计算它到每条线段的距离. 退化线段按端点处理.
+    """
+    ab = ends - starts
+    ap = points - starts
+    length_squared = np.einsum("ij,ij->i", ab, ab)
+    safe_length = np.where(length_squared > 0, length_squared, 1.0)
+    param = np.clip(np.einsum("ij,ij->i", ap, ab) / safe_length, 0.0, 1.0)
+    projection = starts + ab * param[:, None]
+    return np.hypot(*(points - projection).T)
+
+
+class SampleGrid:
+    """
+    静态点集（例如曲线采样点）的均匀网格索引，点集变化时整体重建.
+
+    构建时把点按所在格子排序，每个格子只记录排序后数组中的一段区间.
+    """
+
+    def __init__(self, points, cell_size):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        if not len(self.points):
+            return
+
+        cells = np.floor(self.points / self.cell_size).astype(np.int64)
+        self._order = np.lexsort((cells[:, 1], cells[:, 0]))
+        sorted_cells = cells[self._order]
+        boundaries = np.flatnonzero(np.any(np.diff(sorted_cells, axis=0) != 0, axis=1)) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(self.points)]))
+        keys = map(tuple, sorted_cells[starts].tolist())
+        self._cells = dict(zip(keys, zip(starts.tolist(), ends.tolist())))
+        self._min_corner = self.points.min(axis=0)
+        self._max_corner = self.points.max(axis=0)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _candidates(self, x, y, radius):
+        """返回以 (x, y) 为中心、边长 2 * radius 的正方形覆盖的格子中全部点的索引（升序）"""
+        x0, x1 = math.floor((x - radius) / self.cell_size), math.floor((x + radius) / self.cell_size)
+        y0, y1 = math.floor((y - radius) / self.cell_size), math.floor((y + radius) / self.cell_size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            # 查询范围比已占用的格子还多时，直接遍历已占用的格子
+            spans = [span for (cx, cy), span in self._cells.items() if x0 <= cx <= x1 and y0 <= cy <= y1]
+        else:
+            spans = [self._cells[cell] for cell in
+                     ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)) if cell in self._cells]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate([self._order[start:end] for start, end in spans]))
+
+    def _distances(self, indices, x, y):
+        return np.hypot(self.points[indices, 0] - x, self.points[indices, 1] - y)
+
+    def _covers_all(self, x, y, radius):
+        return (x - radius <= self._min_corner[0] and x + radius >= self._max_corner[0]
+                and y - radius <= self._min_corner[1] and y + radius >= self._max_corner[1])
+
+    def nearest(self, x, y, max_distance=math.inf):
+        """
+        返回离 (x, y) 最近的点 (索引, 距离)；距离相同时取索引最小的点.
+
+        超过 max_distance 时返回 (None, inf). 不限距离时从一个格子开始逐步扩大搜索范围.
+        """
+        if not len(self.points):
+            return None, math.inf
+        radius = self.cell_size if math.isinf(max_distance) else max_distance
+        while True:
+            indices = self._candidates(x, y, radius)
+            if len(indices):
+                distances = self._distances(indices, x, y)
+                k = int(np.argmin(distances))
+                # 正方形之外的点离中心都超过 radius，所以找到的点在 radius 以内时就是全局最近点
+                if distances[k] <= radius or self._covers_all(x, y, radius):
+                    if distances[k] > max_distance:
+                        return None, math.inf
+                    return int(indices[k]), float(distances[k])
+            if radius >= max_distance or self._covers_all(x, y, radius):
+                return None, math.inf
+            radius = min(radius * 2, max_distance)
+
+    def within_radius(self, x, y, radius):
+        """返回与 (x, y) 距离不超过 radius 的点的索引（升序）"""
+        if not len(self.points):
+            return np.empty(0, dtype=np.int64)
+        indices = self._candidates(x, y, radius)
+        return indices[self._distances(indices, x, y) <= radius]
+
+    def nearest_distances(self, points, block_size=1 << 16):
+        """
+        返回 points 中每个点到最近点的距离，形状 (n,)；点集为空时全为 inf.
+
+        查询点按所在格子分组，每组只与周围 rings 圈格子中的点计算距离：最近距离不超过 rings 个格子边长的
+        查询点已经确定，其余的点扩大一倍范围再查. 每次只计算不超过 block_size 个距离，内存与两个点集
+        大小的乘积无关.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        distances = np.full(len(points), math.inf)
+        if not len(self.points) or not len(points):
+            return distances
+
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        sorted_cells = cells[order]
+        boundaries = np.flatnonzero(np.any(np.diff(sorted_cells, axis=0) != 0, axis=1)) + 1
+        for group in np.split(order, boundaries):
+            cx, cy = cells[group[0]].tolist()
+            center_x, center_y = (cx + 0.5) * self.cell_size, (cy + 0.5) * self.cell_size
+            pending = group
+            rings = 1
+            while len(pending):
+                radius = (rings + 0.5) * self.cell_size  # 覆盖所在格子周围 rings 圈格子
+                covers_all = self._covers_all(center_x, center_y, radius)
+                indices = self._candidates(center_x, center_y, radius)
+                if len(indices):
+                    candidates = self.points[indices]
+                    nearest = np.empty(len(pending))
+                    step = max(1, block_size // len(indices))
+                    for start in range(0, len(pending), step):
+                        differences = points[pending[start:start + step], None, :] - candidates[None, :, :]
+                        nearest[start:start + step] = np.hypot(differences[..., 0], differences[..., 1]).min(axis=1)
+                    # 搜索范围之外的点离组内任一查询点都超过 rings 个格子边长
+                    resolved = np.ones(len(pending), dtype=bool) if covers_all else nearest <= rings * self.cell_size
+                    distances[pending[resolved]] = nearest[resolved]
+                    pending = pending[~resolved]
+                rings *= 2
+        return distances
+
+
+class PointHash:
+    """
+    动态点集（例如控制点）的空间哈希，格子到点索引集合的映射.
+
+    单个点移动时只改动它离开和进入的两个格子，插入、删除等改变索引的操作需要 rebuild.
+    """
+
+    def __init__(self, cell_size, points=()):
+        self.cell_size = float(cell_size)
+        self.rebuild(points)
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def rebuild(self, points):
+        """按新的点集整体重建"""
+        self._points = [(float(x), float(y)) for x, y in points]
+        self._cells = {}
+        for i, (x, y) in enumerate(self._points):
+            self._cells.setdefault(self._cell(x, y), set()).add(i)
+
+    def move(self, index, x, y):
+        """把索引为 index 的点移动到 (x, y)"""
+        old_cell = self._cell(*self._points[index])
+        new_cell = self._cell(x, y)
+        self._points[index] = (float(x), float(y))
+        if old_cell == new_cell:
+            return
+        bucket = self._cells[old_cell]
+        bucket.discard(index)
+        if not bucket:
+            del self._cells[old_cell]
+        self._cells.setdefault(new_cell, set()).add(index)
+
+    def within_radius(self, x, y, radius):
+        """返回与 (x, y) 距离不超过 radius 的点的索引（升序）"""
+        x0, y0 = self._cell(x - radius, y - radius)
+        x1, y1 = self._cell(x + radius, y + radius)
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for i in self._cells.get((cx, cy), ()):
+                    px, py = self._points[i]
+                    if math.hypot(px - x, py - y) <= radius:
+                        found.append(i)
+        found.sort()
+        return found
+
+    def nearest(self, x, y, max_distance):
+        """
+        返回 max_distance 以内离 (x, y) 最近的点 (索引, 距离)；距离相同时取索引最小的点.
+
+        没有时返回 (None, inf). 只搜索 max_distance 覆盖的格子，所以 max_distance 必须有限.
+        """
+        best_index, best_distance = None, math.inf
+        for i in self.within_radius(x, y, max_distance):
+            px, py = self._points[i]
+            distance = math.hypot(px - x, py - y)
+            if distance < best_distance:
+                best_index, best_distance = i, distance
+        return best_index, best_distance
+
+
+class SegmentGrid:
+    """
+    静态线段集合（例如控制多边形的边）的均匀网格索引，线段集合变化时整体重建.
+
+    每条线段登记到它的包围盒覆盖的所有格子中，查询时只对附近格子里的线段计算距离.
+    """
+
+    def __init__(self, starts, ends, cell_size):
+        self.starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        self.ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+        self._cells = {}
+        if not len(self.starts):
+            return
+
+        lower = np.floor(np.minimum(self.starts, self.ends) / self.cell_size).astype(np.int64)
+        upper = np.floor(np.maximum(self.starts, self.ends) / self.cell_size).astype(np.int64)
+        for i, (x0, y0, x1, y1) in enumerate(np.hstack((lower, upper)).tolist()):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    self._cells.setdefault((cx, cy), []).append(i)
+
+    @classmethod
+    def from_polyline(cls, points, cell_size):
+        """由折线的顶点构建，第 i 条线段连接 points[i] 和 points[i + 1]"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return cls(points[:-1], points[1:], cell_size)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _candidates(self, x, y, radius):
+        """返回以 (x, y) 为中心、边长 2 * radius 的正方形覆盖的格子中全部线段的索引（升序、去重）"""
+        x0, x1 = math.floor((x - radius) / self.cell_size), math.floor((x + radius) / self.cell_size)
+        y0, y1 = math.floor((y - radius) / self.cell_size), math.floor((y + radius) / self.cell_size)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            buckets = [bucket for (cx, cy), bucket in self._cells.items() if x0 <= cx <= x1 and y0 <= cy <= y1]
+        else:
+            buckets = [self._cells[cell] for cell in
+                       ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)) if cell in self._cells]
+        if not buckets:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(buckets))
+
+    def nearest(self, x, y, max_distance):
+        """
+        返回 max_distance 以内离 (x, y) 最近的线段 (索引, 距离)；距离相同时取索引最小的线段.
+
+        没有时返回 (None, inf). 只搜索 max_distance 覆盖的格子，所以 max_distance 必须有限.
+        """
+        indices = self._candidates(x, y, max_distance)
+        if not len(indices):
+            return None, math.inf
+        distances = point_segment_distances(
+            np.array([[x, y]], dtype=np.float64), self.starts[indices], self.ends[indices]
+        )
+        k = int(np.argmin(distances))
+        if distances[k] > max_distance:
+            return None, math.inf
+        return int(indices[k]), float(distances[k])
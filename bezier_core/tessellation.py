@@ -0,0 +1,269 @@
+"""
+曲线细分引擎：把每个红锚点分段按一次 Bernstein 基矩阵 × 控制点数组的矩阵乘法求值.
+
+支持两种模式：
+- 均匀模式：每个分段固定 num_segments + 1 个采样点，基矩阵来自共享缓存；
+- 自适应模式：按像素容差逐层二分，平直的部分只保留很少的采样点.
+"""
+import numpy as np
+
+from .bernstein import basis_cache, bernstein_matrix, uniform_t_values
+from .evaluation import bernstein_row
+from .segments import SegmentIndex, split_segments
+from .spatial import point_segment_distances
+
+# 自适应模式下每个分段初始的最少区间数
+ADAPTIVE_MIN_INTERVALS = 4
+
+
+def tessellate_segment(points, num_segments):
+    """对单个分段均匀采样 num_segments + 1 个点，返回 (num_segments + 1, 2) 数组"""
+    points = np.asarray(points, dtype=np.float64)
+    return basis_cache.get(len(points) - 1, num_segments) @ points
+
+
+def tessellate_segment_adaptive(points, tolerance, max_segments):
+    """
+    按平直度自适应细分单个分段.
+
+    每一层同时检查所有待定区间：在区间的 1/4、1/2、3/4 处求值，若任一点到弦的距离
+    超过 tolerance（像素）就二分该区间. 区间宽度不会小于 1 / max_segments，
+    因此采样点数不会超过均匀模式.
+
+    Returns:
+        (采样点数组, 对应的 t 值数组).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    order = len(points) - 1
+    max_segments = max(1, max_segments)
+    initial = min(max(ADAPTIVE_MIN_INTERVALS, order), max_segments)
+    min_width = 1.0 / max_segments
+
+    edges = uniform_t_values(initial)
+    starts, ends = edges[:-1], edges[1:]
+    accepted = [edges]
+    while len(starts):
+        widths = ends - starts
+        probes = starts[:, None] + widths[:, None] * np.array([0.25, 0.5, 0.75])
+        probe_points = bernstein_matrix(order, probes.ravel()) @ points
+        chord_points = bernstein_matrix(order, np.concatenate([starts, ends])) @ points
+        chord_starts = np.repeat(chord_points[:len(starts)], 3, axis=0)
+        chord_ends = np.repeat(chord_points[len(starts):], 3, axis=0)
+        errors = point_segment_distances(probe_points, chord_starts, chord_ends).reshape(-1, 3).max(axis=1)
+
+        split = (errors > tolerance) & (widths * 0.5 >= min_width)
+        middles = probes[split, 1]
+        accepted.append(middles)
+        starts, ends = np.concatenate([starts[split], middles]), np.concatenate([middles, ends[split]])
+
+    t_values = np.unique(np.concatenate(accepted))
+    return bernstein_matrix(order, t_values) @ points, t_values
+
+
+class Tessellation:
+    """
+    整条曲线的细分结果.
+
+    Attributes:
+        points: (N, 2) 采样点数组.
+        t_values: 每个采样点在所属分段内的 t 值.
+        index: 分段索引（SegmentIndex），包含每个分段的锚点范围和采样范围；相邻分段共享端点采样.
+        num_segments: 均匀模式下每个分段的采样段数；自适应模式下为 None.
+    """
+
+    def __init__(self, points, t_values, index, num_segments=None):
+        self.points = points
+        self.t_values = t_values
+        self.index = index
+        self.num_segments = num_segments
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def segments(self):
+        return self.index.segments
+
+    @property
+    def sample_ranges(self):
+        return self.index.sample_ranges
+
+    @property
+    def is_uniform(self):
+        return self.num_segments is not None
+
+    def segment_of_sample(self, sample_idx):
+        """返回采样点所属分段的序号，找不到时返回 None"""
+        return self.index.segment_of_sample(sample_idx)
+
+    def segment_basis_row(self, segment_idx, sample_idx):
+        """返回分段内全部锚点在第 sample_idx 个采样点处的影响力"""
+        segment_start, segment_end = self.segments[segment_idx]
+        order = segment_end - segment_start
+        if self.is_uniform:
+            return basis_cache.row(order, self.num_segments, sample_idx - self.sample_ranges[segment_idx][0])
+        return bernstein_row(order, self.t_values[sample_idx])
+
+    def segment_weights(self, segment_idx, point_idx):
+        """返回分段内第 point_idx 个锚点在该分段全部采样点处的影响力"""
+        segment_start, segment_end = self.segments[segment_idx]
+        order = segment_end - segment_start
+        if self.is_uniform:
+            return basis_cache.column(order, self.num_segments, point_idx)
+        range_start, range_end = self.sample_ranges[segment_idx]
+        return bernstein_matrix(order, self.t_values[range_start:range_end + 1])[:, point_idx]
+
+
+def _tessellate_segment_buffer(points, num_segments, tolerance):
+    """细分单个分段，返回 (采样点数组, t 值数组)"""
+    if tolerance is None:
+        return tessellate_segment(points, num_segments), uniform_t_values(num_segments)
+    return tessellate_segment_adaptive(points, tolerance, num_segments)
+
+
+def _assemble(segments, buffers, num_segments, tolerance):
+    """把各分段的细分结果拼接为 Tessellation，去掉每个后续分段与前一段重合的第一个点"""
+    segment_samples = []
+    segment_t_values = []
+    sample_ranges = []
+    start_sample_idx = 0
+    for samples, t_values in buffers:
+        sample_ranges.append((start_sample_idx, start_sample_idx + len(samples) - 1))
+        start_sample_idx += len(samples) - 1  # 相邻分段的端点重合
+        if segment_samples:
+            samples, t_values = samples[1:], t_values[1:]  # 如果不是第一段，移除第一个点以避免重复
+        segment_samples.append(samples)
+        segment_t_values.append(t_values)
+
+    t_values = np.concatenate(segment_t_values)
+    return Tessellation(
+        np.concatenate(segment_samples), t_values, SegmentIndex(segments, sample_ranges, t_values),
+        num_segments if tolerance is None else None
+    )
+
+
+def _empty_tessellation(num_segments, tolerance):
+    return Tessellation(np.empty((0, 2)), np.empty(0), SegmentIndex([]), num_segments if tolerance is None else None)
+
+
+def tessellate_curve(points, red_anchors, num_segments, tolerance=None):
+    """
+    按红锚点分段细分整条曲线，返回 Tessellation.
+
+    tolerance 为 None 时使用均匀模式；否则使用自适应模式，num_segments 作为每个分段的采样上限.
+    相邻分段共享端点，拼接时去掉后一段的第一个点，与编辑器原有的缓存布局一致.
+    控制点少于 2 个时返回空的 Tessellation.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2:
+        return _empty_tessellation(num_segments, tolerance)
+
+    segments = split_segments(len(points), red_anchors)
+    buffers = [_tessellate_segment_buffer(points[start:end + 1], num_segments, tolerance) for start, end in segments]
+    return _assemble(segments, buffers, num_segments, tolerance)
+
+
+class CurveCache:
+    """
+    按分段缓存的细分结果，拖动单个锚点时只重算包含该锚点的分段.
+
+    每个分段的采样结果以 (起点锚点索引, 终点锚点索引) 为键保存. update() 传入 dirty_anchors 时，
+    只有包含这些锚点的分段和键发生变化的分段（例如切换红锚点后新出现的分段）会重新细分；
+    不传时全部重建. 插入、删除锚点会改变索引，必须全部重建.
+
+    Attributes:
+        tessellation: 最近一次 update() 的结果.
+        dirty_sample_ranges: 分段布局不变时，本次重算的分段在 tessellation.points 中的采样范围列表；
+            布局变化或全部重建时为 None.
+        rebuilt_segments: 本次重新细分的分段数.
+    """
+
+    def __init__(self):
+        self.tessellation = None
+        self.dirty_sample_ranges = None
+        self.rebuilt_segments = 0
+        self._buffers = {}
+        self._settings = None
+
+    def invalidate(self):
+        """丢弃所有分段缓存，下次 update() 全部重建"""
+        self._buffers = {}
+        self._settings = None
+
+    def update(self, points, red_anchors, num_segments, tolerance=None, dirty_anchors=None):
+        """刷新细分结果并返回 Tessellation"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        settings = (len(points), num_segments, tolerance)
+        if dirty_anchors is None or settings != self._settings:
+            self.invalidate()
+        self._settings = settings
+        previous = self.tessellation
+
+        if len(points) < 2:
+            self.tessellation = _empty_tessellation(num_segments, tolerance)
+            self.dirty_sample_ranges = None
+            return self.tessellation
+
+        dirty_anchors = set(dirty_anchors or ())
+        segments = split_segments(len(points), red_anchors)
+        buffers = {}
+        rebuilt = []
+        for i, (start, end) in enumerate(segments):
+            buffer = self._buffers.get((start, end))
+            if buffer is None or any(start <= idx <= end for idx in dirty_anchors):
+                buffer = _tessellate_segment_buffer(points[start:end + 1], num_segments, tolerance)
+                rebuilt.append(i)
+            buffers[(start, end)] = buffer
+        self._buffers = buffers
+        self.rebuilt_segments = len(rebuilt)
+
+        self.tessellation = _assemble(segments, [buffers[segment] for segment in segments], num_segments, tolerance)
+        if (previous is not None and previous.segments == segments
+                and previous.sample_ranges == self.tessellation.sample_ranges):
+            self.dirty_sample_ranges = [self.tessellation.sample_ranges[i] for i in rebuilt]
+        else:
+            self.dirty_sample_ranges = None
+        return self.tessellation
+
+    def preview(self, points, red_anchors, num_segments, tolerance=None, inserted=None, deleted=None):
+        """
+        细分插入或删除一个锚点之后的曲线，用于预览，不修改缓存.
+
+        points、red_anchors 为编辑后的锚点和红锚点. inserted 为新锚点在编辑后的索引，deleted 为被删除锚点
+        在编辑前的索引，二者给出一个. 不包含被编辑锚点的分段直接复用缓存中对应分段的采样结果，
+        通常只有一个分段需要重新细分. update() 总是整体替换分段缓存而不原地修改，
+        所以可以在后台线程中调用.
+
+        Returns:
+            (Tessellation, 重新细分的分段序号列表).
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) < 2:
+            return _empty_tessellation(num_segments, tolerance), []
+
+        if inserted is not None:
+            def origin(idx):
+                return idx if idx < inserted else (None if idx == inserted else idx - 1)
+        elif deleted is not None:
+            def origin(idx):
+                return idx if idx < deleted else idx + 1
+        else:
+            def origin(idx):
+                return idx
+        cached_buffers, settings = self._buffers, self._settings
+        reusable = settings is not None and settings[1:] == (num_segments, tolerance)
+
+        segments = split_segments(len(points), red_anchors)
+        buffers = []
+        rebuilt = []
+        for i, (start, end) in enumerate(segments):
+            buffer = None
+            origin_start, origin_end = origin(start), origin(end)
+            # 首尾都对应编辑前的锚点且跨度不变，说明分段内没有被插入或删除的锚点
+            if reusable and origin_start is not None and origin_end is not None and origin_end - origin_start == end - start:
+                buffer = cached_buffers.get((origin_start, origin_end))
+            if buffer is None:
+                buffer = _tessellate_segment_buffer(points[start:end + 1], num_segments, tolerance)
+                rebuilt.append(i)
+            buffers.append(buffer)
+        return _assemble(segments, buffers, num_segments, tolerance), rebuilt
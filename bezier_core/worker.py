@@ -0,0 +1,84 @@
+"""
+后台计算线程：按通道只保留最新提交的任务，过期的结果由调用方根据版本号丢弃.
+"""
+import itertools
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# 一次后台计算的结果. sequence 为提交序号，revision 为提交时的文档版本号，
+# context 为提交时附带的信息（例如鼠标位置），error 为计算中抛出的异常（没有时为 None）
+WorkerResult = namedtuple("WorkerResult", ["channel", "sequence", "revision", "context", "value", "error"])
+
+
+class BackgroundWorker:
+    """
+    在单个后台线程中依次执行计算任务，每个通道只保留最新提交的任务.
+
+    同一通道提交新任务时，还在排队的旧任务被取消；已经开始的旧任务照常完成，但它的结果
+    is_latest() 为 False. 任务完成后在后台线程调用 callback(WorkerResult)，
+    回调需要自行把结果转交给 GUI 线程.
+    """
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bezier-worker")
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._latest = {}
+        self._futures = {}
+        self.submitted = 0
+        self.completed = 0
+        self.skipped = 0
+
+    def submit(self, channel, revision, context, func, *args):
+        """提交任务并返回它的提交序号"""
+        with self._lock:
+            sequence = next(self._sequence)
+            self._latest[channel] = sequence
+            previous = self._futures.get(channel)
+            if previous is not None and previous.cancel():
+                self.skipped += 1
+            self._futures[channel] = self._executor.submit(
+                self._run, channel, sequence, revision, context, func, args
+            )
+            self.submitted += 1
+        return sequence
+
+    def _run(self, channel, sequence, revision, context, func, args):
+        with self._lock:
+            if self._latest.get(channel) != sequence:
+                # 排队期间已有更新的任务，不再计算
+                self.skipped += 1
+                return
+        try:
+            value, error = func(*args), None
+        except Exception as exc:
+            value, error = None, exc
+        with self._lock:
+            self.completed += 1
+        self._callback(WorkerResult(channel, sequence, revision, context, value, error))
+
+    def is_latest(self, result):
+        """结果是否来自该通道最新提交的任务"""
+        with self._lock:
+            return self._latest.get(result.channel) == result.sequence
+
+    def cancel(self, channel):
+        """使该通道已提交的任务全部过期"""
+        with self._lock:
+            self._latest[channel] = next(self._sequence)
+
+    def wait(self, timeout=None):
+        """等待已提交的任务全部结束（用于测试和基准测试）"""
+        with self._lock:
+            futures = list(self._futures.values())
+        wait(futures, timeout)
+
+    def shutdown(self):
+        """取消排队中的任务并关闭后台线程，不等待正在执行的任务"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        """返回任务统计信息"""
+        return {"submitted": self.submitted, "completed": self.completed, "skipped": self.skipped}
@@ -39,36 +39,151 @@ class HoverButton(QPushButton):
                     self.parent_widget.update_help_position()
 
         super(HoverButton, self).leaveEvent(event)
-from PyQt5.QtGui import QPainter, QPainterPath, QColor, QPen, QPixmap, QBrush, QVector2D, QIcon
-from PyQt5.QtCore import Qt, QPoint, QLocale, QLineF, QPropertyAnimation, QSize
+from PyQt5.QtGui import QPainter, QPainterPath, QPolygonF, QColor, QPen, QPixmap, QBrush, QVector2D, QIcon, QMouseEvent, QTransform, QFontMetrics
+from PyQt5.QtCore import Qt, QObject, QPoint, QPointF, QRect, QRectF, QLocale, QLineF, QPropertyAnimation, QSize, QTimer, pyqtSignal
 from PyQt5 import QtGui,QtCore
 import sys
 import math
 import pickle
+import time
+import traceback
 import os
-import clr
 import datetime
 import json
-
-# 获取 DLL 绝对路径
-dll_path = os.path.abspath("EditorReader.dll")
-# 确保 DLL 存在
-if not os.path.exists(dll_path):
-    raise FileNotFoundError(f"找不到 DLL: {dll_path}")
-sys.path.append(dll_path)
-clr.AddReference("EditorReader")
-# 导入 EditorReader 类
-from Editor_Reader import EditorReader
-# 创建 EditorReader 实例
-reader = EditorReader()
+import numpy as np
+from bezier_core.arclength import ArcLengthTable
+from bezier_core.bernstein import basis_cache, binomial_coefficient
+from bezier_core.evaluation import bernstein_row, bernstein_value, evaluate_point
+from bezier_core.geometry import ViewCamera
+from bezier_core.osu_format import (
+    SUPPORTED_CURVE_TYPES, format_curve_points, format_slider, parse_curve_points, parse_slider
+)
+from bezier_core.segments import SegmentIndex
+from bezier_core.spatial import PointHash, SampleGrid, SegmentGrid
+from bezier_core.tessellation import CurveCache, tessellate_curve
+from bezier_core.worker import BackgroundWorker
+
+CURVE_SAMPLE_GRID_CELL_SIZE = 8  # 曲线采样点网格索引的格子边长（osu! 坐标）
+CONTROL_POINT_HASH_CELL_SIZE = 16  # 控制点空间哈希的格子边长（osu! 坐标）
+CONTROL_EDGE_GRID_CELL_SIZE = 32  # 控制多边形边的网格索引的格子边长（osu! 坐标）
+MOUSE_MOVE_FRAME_INTERVAL_MS = 16  # 鼠标移动处理的最短间隔（毫秒），约 60 帧
+LOG_MOUSE_MOVE_STATS = False  # 为 True 时每次释放鼠标都打印鼠标移动合并的统计信息
+INFLUENCE_WEIGHT_LEVELS = 32  # 影响力染色的量化级数，每一级一次绘制调用
+COLOR_LUT_SIZE = 256  # 渐变色查找表的级数
+
+_editor_reader = None
+
+def get_editor_reader():
+    """首次使用时才加载 EditorReader.dll 并创建 EditorReader 实例，没有 osu! 环境时也能导入本模块"""
+    global _editor_reader
+    if _editor_reader is None:
+        import clr
+        # 获取 DLL 绝对路径
+        dll_path = os.path.abspath("EditorReader.dll")
+        # 确保 DLL 存在
+        if not os.path.exists(dll_path):
+            raise FileNotFoundError(f"找不到 DLL: {dll_path}")
+        sys.path.append(dll_path)
+        clr.AddReference("EditorReader")
+        # 导入 EditorReader 类
+        from Editor_Reader import EditorReader
+        _editor_reader = EditorReader()
+    return _editor_reader
+
+def qpoints_to_array(points):
+    """将 QPoint / QPointF 列表转换为 (n, 2) 的 float64 数组"""
+    return np.array([(p.x(), p.y()) for p in points], dtype=np.float64).reshape(-1, 2)
+
+def polygon_buffer(polygon):
+    """返回与 QPolygonF 共享内存的 (n, 2) float64 视图；data() 会先分离隐式共享的副本，写入不会影响其它副本"""
+    pointer = polygon.data()
+    pointer.setsize(len(polygon) * 16)  # 每个 QPointF 是两个 double
+    return np.frombuffer(pointer, dtype=np.float64).reshape(-1, 2)
+
+def array_to_polygon(array):
+    """将 (n, 2) float64 数组整块拷贝进 QPolygonF，不逐点创建 QPointF"""
+    polygon = QPolygonF(len(array))
+    if len(array):
+        polygon_buffer(polygon)[:] = array
+    return polygon
+
+def compute_preview_result(curve_cache, curve_array, preview_points, preview_red_anchors, num_segments, tolerance,
+                           inserted=None, deleted=None, sample_grid=None):
+    """
+    计算预览曲线及其与原始曲线逐点的偏移量，返回 (QPolygonF, 偏移量列表). 只读取传入的数据，可以在后台线程中调用.
+
+    curve_cache 不为 None 时只重新细分包含插入 / 删除锚点的分段，其余分段复用缓存.
+    sample_grid 为原始曲线采样点的网格索引，自适应采样时用于查询最近采样点；为 None 时按 curve_array 临时构建.
+    """
+    if curve_cache is not None:
+        preview_tessellation, rebuilt_segments = curve_cache.preview(
+            preview_points, preview_red_anchors, num_segments, tolerance, inserted, deleted
+        )
+    else:
+        preview_tessellation = tessellate_curve(preview_points, preview_red_anchors, num_segments, tolerance)
+        rebuilt_segments = range(len(preview_tessellation.segments))
+    preview_array = preview_tessellation.points
+
+    # 计算与原始曲线的偏移量（超出原始曲线长度的部分偏移量为 0）
+    offsets = np.zeros(len(preview_array))
+    if curve_array is not None and tolerance is not None:
+        # 自适应采样时两条曲线的采样点不一一对应，改用到原始曲线最近采样点的距离（通过网格索引只查询附近的采样点）；
+        # 复用的分段与原始曲线的采样点完全相同，偏移量为 0，只需计算重新细分的分段
+        if sample_grid is None:
+            sample_grid = SampleGrid(curve_array, CURVE_SAMPLE_GRID_CELL_SIZE)
+        for segment_idx in rebuilt_segments:
+            range_start, range_end = preview_tessellation.sample_ranges[segment_idx]
+            offsets[range_start:range_end + 1] = sample_grid.nearest_distances(preview_array[range_start:range_end + 1])
+    elif curve_array is not None:
+        overlap = min(len(preview_array), len(curve_array))
+        offsets[:overlap] = np.hypot(*(preview_array[:overlap] - curve_array[:overlap]).T)
+    return array_to_polygon(preview_array), offsets.tolist()
+
+def compute_ctrl_highlight(sample_grid, tessellation, num_points, x, y, threshold):
+    """
+    查找阈值内离 (x, y) 最近的曲线采样点及该点处各锚点的影响力. 只读取传入的数据，可以在后台线程中调用.
+
+    Returns:
+        (采样点索引, 锚点影响力列表)；阈值内没有采样点时返回 (None, []).
+    """
+    closest_idx, min_distance = sample_grid.nearest(x, y, threshold)
+    if closest_idx is None or not min_distance < threshold:
+        return None, []
+    # 按照红色锚点分段计算影响力：找出最近点所在的分段，只有该分段内的锚点有影响力
+    anchor_influences = [0.0] * num_points
+    segment_idx = tessellation.segment_of_sample(closest_idx)
+    if segment_idx is not None:
+        segment_start, segment_end = tessellation.segments[segment_idx]
+        influences = tessellation.segment_basis_row(segment_idx, closest_idx)
+        anchor_influences[segment_start:segment_end + 1] = influences.tolist()
+    return closest_idx, anchor_influences
+
+class BackgroundResultRelay(QObject):
+    """后台线程通过这个对象的信号把计算结果交给 GUI 线程（跨线程的信号连接自动排队）"""
+    result_ready = pyqtSignal(object)
 
 class BezierCurveEditor(QWidget):
     def __init__(self):
         super().__init__()
         self.setMouseTracking(True)
+        self.pending_mouse_move = None  # 尚未处理的最新一次鼠标移动事件（副本）
+        self.pending_mouse_move_count = 0  # pending_mouse_move 代表的鼠标移动事件数（包括被它覆盖的事件）
+        self.mouse_move_timer = QTimer(self)  # 帧定时器，每帧最多处理一次鼠标移动
+        self.mouse_move_timer.setSingleShot(True)
+        self.mouse_move_timer.timeout.connect(self.flush_pending_mouse_move)
+        self.last_mouse_move_time = 0.0  # 上一次处理鼠标移动的时间（秒）
+        self.last_mouse_move_ms = 0.0  # 上一次处理鼠标移动的耗时（毫秒）
+        self.mouse_moves_received = 0  # 收到的鼠标移动事件数
+        self.mouse_moves_processed = 0  # 实际处理的鼠标移动事件数
+        self.mouse_moves_merged = 0  # 被后续事件覆盖、没有单独处理的鼠标移动事件数
+        self.background_computation = True  # 预览曲线和 Ctrl 高亮是否在后台线程计算
+        self.background_relay = BackgroundResultRelay(self)
+        self.background_relay.result_ready.connect(self.apply_background_result)
+        self.background_worker = BackgroundWorker(self.background_relay.result_ready.emit)
+        self.background_results_dropped = 0  # 因为已有更新的任务、文档已变化或计算出错而丢弃的后台结果数
         self.setWindowTitle("Bezier Curve Editor for osu!")
         self.setGeometry(100, 100, 1600, 900)
-        self.control_points = []  # 存储控制点
+        self.control_points = []  # 存储控制点（QPointF，osu! 坐标）
         self.red_anchors = set()  # 存储红色锚点的索引
         self.history = []  # 操作历史
         self.future = []  # 撤销后的操作
@@ -76,6 +191,11 @@ class BezierCurveEditor(QWidget):
         self.dragging_point = None  # 当前拖动的控制点索引
         self.image = None  # 导入的图片
         self.image_scale = 1.0  # 图片缩放比例
+        self.scaled_image = None  # 缩放后的图片缓存（QPixmap）
+        self.scaled_image_key = None  # 缓存对应的 (图片, 综合缩放比例, 设备像素比, 是否平滑缩放)
+        self.scaled_image_size = (0, 0)  # 缩放后图片的逻辑尺寸（宽, 高）
+        self.static_layers = None  # 静态图层缓存：(背景 QPixmap, 矩形边界 QPixmap)
+        self.static_layers_key = None  # 静态图层对应的 (窗口宽, 窗口高, rect_scale, 设备像素比)
         self.image_opacity = 0.7  # 图片透明度
         self.image_sliders_visible = False  # 控制图片相关滑块的可见性
         self.curve_segments = 100  # 曲线绘制段数
@@ -85,12 +205,14 @@ class BezierCurveEditor(QWidget):
 
         self.dragging_curve_only = False  # 是否正在单独拖动曲线 (新增)
         self.dragging_curve_and_image = False  # 是否正在拖动曲线和图片 (新增)
+        self.gesture_transform = None  # 旋转 / 平移手势中尚未应用到控制点的变换（QTransform，osu! 坐标），绘制时作用于曲线
         self.is_ctrl_right_dragging = False  # 是否正在拖动曲线的局部
         self.is_ctrl_dragging_deformation = False
         self.last_mouse_pos = QPoint()  # 上次鼠标位置
-        self.drag_start_pos = None
+        self.drag_start_pos = None  # Ctrl 变形拖动上一次的鼠标位置（osu! 坐标）
         self.locked_closest_point = None
         self.locked_t = None # 保存拖动开始时的 t 值
+        self.deformation_context = None  # Ctrl 变形拖动的 (起点锚点索引, 终点锚点索引, 影响力数组)，按下时计算一次
 
         self.curve_scale = 1.0  # 曲线整体缩放比例
         self.outline_width = 4  # 描边粗细 (初始值，之后会被计算的值覆盖)
@@ -98,11 +220,15 @@ class BezierCurveEditor(QWidget):
         self.rect_scale = 0.75  # 矩形默认大小为窗口的 65%
         self.rect_width = 0    # 矩形宽度（动态计算）
         self.rect_height = 0   # 矩形高度（动态计算）
+        self.camera = ViewCamera()  # osu! 坐标 -> 屏幕坐标的视图相机，随窗口和矩形大小更新
         self.image_offset_x = 0  # 图片水平偏移量
         self.image_offset_y = 0  # 图片垂直偏移量
-        self.preview_point = None  # 预览点的 QPoint 对象
+        self.preview_point = None  # 预览点（QPointF，osu! 坐标）
         self.is_preview_enabled = False  # 布尔值，指示是否启用预览
         self.preview_segment_index = -1 # 预览插入线段的索引
+        self.preview_slider_points = None  # 预览曲线的采样点（QPolygonF，osu! 坐标）
+        self.preview_offsets = None  # 预览曲线各采样点与原始曲线的偏移量
+        self.preview_revision = 0  # 预览曲线的版本号，由 apply_preview_slider 在预览曲线变化时加 1
         self.highlighted_segment_index = None
         self.is_dragging_control_point = False
         self.pre_selected_point_index = None
@@ -110,7 +236,26 @@ class BezierCurveEditor(QWidget):
         self.rect_height_large = 0
         self.is_right_button_pressed = False
         self.is_left_button_pressed = False
-        self.cached_curve_points = None  # 初始化缓存为空
+        self.adaptive_tessellation = False  # 是否按平直度自适应采样（Ctrl + T 切换）
+        self.flatness_tolerance = 0.5  # 自适应采样的平直度容差（osu! 坐标）
+        self.cached_curve_points = None  # 曲线采样点（QPolygonF），初始化缓存为空
+        self.cached_curve_array = None  # 曲线采样点的 float64 数组
+        self.curve_tessellation = None  # 细分结果：采样点、分段范围和每个采样点的 t 值
+        self.screen_curve = (None, None)  # 映射到屏幕坐标的曲线采样点（QPolygonF）和由它构建的 QPainterPath
+        self.screen_curve_key = None  # screen_curve 对应的 (文档版本号, 视图变换)
+        self.document_bounds = (None, None)  # 曲线和控制点在屏幕上的包围矩形，见 cached_document_bounds
+        self.document_bounds_key = None  # document_bounds 对应的 (文档版本号, 视图变换)
+        self.painted_frame = None  # 上一次绘制时的 (场景状态, 文档状态, 悬停状态, 悬停区域, 文档区域)，见 update_changed_region
+        self.color_luts = {}  # 渐变色查找表：(max_color, min_color) -> (颜色列表, 预览虚线画笔列表)
+        self.curve_cache = CurveCache()  # 按分段缓存的细分结果，拖动锚点时只重算受影响的分段
+        self.red_segment_index = SegmentIndex([])  # 红锚点分段索引，随每次缓存刷新重建
+        self.arc_length_table = ArcLengthTable(np.empty((0, 2)))  # 曲线的累计弧长表，随每次缓存刷新重建
+        self.document_revision = 0  # 文档版本号，每次刷新曲线缓存时递增
+        self.curve_sample_grid = None  # 曲线采样点的网格索引，用于最近点查询
+        self.curve_sample_grid_revision = -1  # 网格索引对应的文档版本号
+        self.control_point_hash = PointHash(CONTROL_POINT_HASH_CELL_SIZE)  # 控制点的空间哈希，用于悬停和删除的命中测试
+        self.control_edge_grid = None  # 控制多边形边的网格索引，用于 Alt 插入锚点时的最近边查询
+        self.control_edge_grid_revision = -1  # 边索引对应的文档版本号
         self.update_curve_cache()  # 初始调用，计算缓存
         self.initial_slider_length = 0  # 初始滑条长度
         self.current_slider_length = 0  # 当前滑条长度
@@ -121,16 +266,19 @@ class BezierCurveEditor(QWidget):
         self.is_alt_pressed = False    # 跟踪 Alt 键状态
         self.closest_curve_point = None  # 最近曲线点
         self.anchor_influences = []  # 锚点影响力列表
+        self.highlight_revision = 0  # Ctrl 高亮的版本号，由 apply_ctrl_highlight 加 1
 
-        self.rotation_pivot_point = None  # 旋转基准点 (QPoint)
+        self.rotation_pivot_point = None  # 旋转基准点 (QPointF，osu! 坐标)
         self.has_rotation_pivot = False   # 是否已设置旋转基准点 (bool)
         self.is_rotating_curve = False    # 是否正在旋转曲线 (bool)
-        self.rotation_start_pos = None    # 旋转开始时的鼠标位置 (QPoint)
+        self.rotation_start_pos = None    # 旋转开始时的鼠标位置 (QPoint，屏幕坐标)
+        self.rotation_angle = 0.0         # 手势变换中尚未应用到控制点的累计旋转角度（弧度）
 
         # 初始化自动备份
         self.backup_file = "bezier_Curve_backup.pkl"
         self.backup_counter = 0  # 历史记录更新计数器
         self.backup_threshold = 5  # 每 5 次历史记录更新触发备份
+        self.update_camera()  # 恢复旧版（屏幕坐标）备份时需要当前窗口的相机
         self.restore_backup_on_startup() # 检查并恢复备份
 
         # 检查osu_songs_path是否有效
@@ -140,6 +288,10 @@ class BezierCurveEditor(QWidget):
         self.save_shortcut = QShortcut(Qt.Key_S | Qt.ControlModifier, self)
         self.save_shortcut.activated.connect(self.quick_save)
 
+        # 绑定 Ctrl + T 快捷键：切换自适应曲线采样
+        self.adaptive_shortcut = QShortcut(Qt.Key_T | Qt.ControlModifier, self)
+        self.adaptive_shortcut.activated.connect(self.toggle_adaptive_tessellation)
+
         self.init_ui()
 
         # 在 init_ui() 之后，通过 sliders 字典访问 circle_size 滑块
@@ -252,7 +404,8 @@ class BezierCurveEditor(QWidget):
                 <b>文件操作：</b><br>
                 ▪ <span style="color:#FF8A9B">CTRL+S</span> 快速保存<br>
                 ▪ <span style="color:#FF8A9B">CTRL+Z</span> 撤销操作<br>
-                ▪ <span style="color:#FF8A9B">CTRL+Y</span> 重做操作
+                ▪ <span style="color:#FF8A9B">CTRL+Y</span> 重做操作<br>
+                ▪ <span style="color:#FF8A9B">CTRL+T</span> 切换自适应曲线采样
                 """
             self.help_label_text_shift = """
                 <b>shift修饰键说明：</b><br>
@@ -348,7 +501,8 @@ class BezierCurveEditor(QWidget):
                 <b>File Operations:</b><br>
                 ▪ <span style="color:#FF8A9B">CTRL+S</span> Quick Save<br>
                 ▪ <span style="color:#FF8A9B">CTRL+Z</span> Undo Operation<br>
-                ▪ <span style="color:#FF8A9B">CTRL+Y</span> Redo Operation
+                ▪ <span style="color:#FF8A9B">CTRL+Y</span> Redo Operation<br>
+                ▪ <span style="color:#FF8A9B">CTRL+T</span> Toggle Adaptive Curve Sampling
                 """
             self.help_label_text_shift = """
                 <b>SHIFT Modifier Key Explanation:</b><br>
@@ -387,25 +541,19 @@ class BezierCurveEditor(QWidget):
                     dy = point.y() - center_y
                     new_x = center_x + dx * scale_factor
                     new_y = center_y + dy * scale_factor
-                    point.setX(int(new_x))
-                    point.setY(int(new_y))
+                    point.setX(new_x)
+                    point.setY(new_y)
 
                 self.update_curve_cache()
                 self.update()
                 self.save_state()
 
     def calculate_curve_length(self):
-        """计算当前贝塞尔曲线的长度"""
+        """计算当前贝塞尔曲线的长度（直接读取累计弧长表）"""
         if not self.cached_curve_points or len(self.cached_curve_points) < 2:
             return 0
 
-        total_length = 0
-        for i in range(len(self.cached_curve_points) - 1):
-            p1 = self.cached_curve_points[i]
-            p2 = self.cached_curve_points[i + 1]
-            total_length += math.sqrt((p2.x() - p1.x()) ** 2 + (p2.y() - p1.y()) ** 2)
-
-        return total_length
+        return self.arc_length_table.total_length
 
     def load_selected_slider(self):
         """从 EditorReader 读取选中的滑条信息"""
@@ -470,6 +618,7 @@ class BezierCurveEditor(QWidget):
         """
         try:
             # 绑定 osu! 进程并获取选中的物件
+            reader = get_editor_reader()
             reader.SetProcess()
             reader.FetchAll()
             reader.FetchSelected()
@@ -483,73 +632,21 @@ class BezierCurveEditor(QWidget):
             slider_data = selectedObject.ToString()
 
             # 解析 osu! 滑条格式
-            parts = slider_data.split(",")
-            start_x, start_y = int(parts[0]), int(parts[1])
-            self.start_time = int(parts[2])  # 保存滑条开始时间
-            self.object_type = parts[3]      # 定义物件属性
-            self.hit_sound = parts[4]        # hitsound
-            self.repeats = int(parts[6])     # 保存滑条重复次数
-            self.length = float(parts[7])    # 保存滑条长度
-            curve_data = parts[5]  # 形如 "B|83:188|129:149|110:95"
-
-            # 确保是滑条（B| 或 C| 开头）
-            if not (curve_data.startswith("B|") or curve_data.startswith("P|") or curve_data.startswith("L|")):
+            slider = parse_slider(slider_data)
+            self.start_time = slider.start_time    # 保存滑条开始时间
+            self.object_type = slider.object_type  # 定义物件属性
+            self.hit_sound = slider.hit_sound      # hitsound
+            self.repeats = slider.repeats          # 保存滑条重复次数
+            self.length = slider.length            # 保存滑条长度
+
+            # 确保是滑条（B|、P| 或 L| 开头）
+            if slider.curve_type not in SUPPORTED_CURVE_TYPES:
                 QMessageBox.warning(self, self.msg_title_error, self.msg_error_not_slider_or_unsupported)
                 return
 
-            # 获取当前视图的边界
-            center_x = self.width() // 2
-            center_y = self.height() // 2
-            rect_width = int(self.width() * self.rect_scale)
-            rect_height = int(rect_width * 3 / 4)
-            rect_x = center_x - rect_width // 2
-            rect_y = center_y - rect_height // 2
-            rect_bottom_left_current_x = rect_x
-            rect_bottom_left_current_y = rect_y + rect_height
-            rect_top_right_current_x = rect_x + rect_width
-            rect_top_right_current_y = rect_y
-
-            # 清空当前控制点
-            self.control_points = []
-            self.red_anchors = set()
-
-            # 添加起始点（转换坐标）
-            remapped_start = self.remap_coordinates(
-                QPoint(start_x, start_y),
-                rect_bottom_left_current_x, rect_bottom_left_current_y,
-                rect_top_right_current_x, rect_top_right_current_y,
-                reverse=True
-            )
-            self.control_points.append(remapped_start)
-
-            # 解析滑条锚点
-            control_points_str = curve_data[2:].split("|")  # 去掉 "B|" 或 "C|"
-            remapped_slider_points = [] # 用于存储反向映射后的滑条点
-            prev_point = None # 用于存储前一个点，检测连续相同点
-
-            for pt in control_points_str:
-                x, y = map(int, pt.split(":"))
-                current_point = QPoint(int(x), int(y))
-
-                # 检查是否与前一个点坐标相同（红锚点标记）
-                if prev_point is not None and prev_point.x() == current_point.x() and prev_point.y() == current_point.y():
-                    # 如果与前一个点坐标相同，则跳过此点（因为已经添加过了）
-                    # 并将前一个点的索引添加到红锚点集合中
-                    self.red_anchors.add(len(self.control_points) + len(remapped_slider_points) - 1)
-                    prev_point = None # 重置前一个点，避免连续三个相同点的情况
-                    continue
-
-                # 正常处理点坐标
-                new_point_remapped = self.remap_coordinates( # 调用 remap_coordinates 进行反向映射
-                    current_point,
-                    rect_bottom_left_current_x, rect_bottom_left_current_y,
-                    rect_top_right_current_x, rect_top_right_current_y,
-                    reverse=True # 传入 reverse=True 参数，执行反向映射
-                )
-                remapped_slider_points.append(new_point_remapped) # 将反向映射后的点添加到 remapped_slider_points 列表
-                prev_point = current_point # 更新前一个点
-
-            self.control_points.extend(remapped_slider_points) # 将反向映射后的滑条点列表添加到 self.control_points
+            # 替换当前控制点（文档直接使用 osu! 坐标）
+            self.control_points = self.osu_points_to_editor(slider.points)
+            self.red_anchors = slider.red_anchors
             self.allow_save2osu = True
             # 更新曲线显示
             self.update_curve_cache()
@@ -571,6 +668,7 @@ class BezierCurveEditor(QWidget):
                     QMessageBox.warning(self, self.msg_title_error, self.msg_set_osu_path)
                     return
 
+                reader = get_editor_reader()
                 reader.SetProcess()
                 reader.FetchAll()
                 reader.FetchSelected()
@@ -600,46 +698,12 @@ class BezierCurveEditor(QWidget):
                 selectedObject = reader.selectedObjects[0]
                 original_slider = selectedObject.ToString()
 
-                # 获取当前视图的边界
-                center_x = self.width() // 2
-                center_y = self.height() // 2
-                rect_width = int(self.width() * self.rect_scale)
-                rect_height = int(rect_width * 3 / 4)
-                rect_x = center_x - rect_width // 2
-                rect_y = center_y - rect_height // 2
-                rect_bottom_left_current_x = rect_x
-                rect_bottom_left_current_y = rect_y + rect_height
-                rect_top_right_current_x = rect_x + rect_width
-                rect_top_right_current_y = rect_y
-
-                # 反向转换坐标（BezierCurveEditor → osu!）
-                first_mapped_point = self.remap_coordinates(
-                    self.control_points[0],
-                    rect_bottom_left_current_x, rect_bottom_left_current_y,
-                    rect_top_right_current_x, rect_top_right_current_y,
-                    reverse=False  # 导出时反向映射
+                # 取整为 osu! 坐标并生成修改后的滑条数据
+                new_slider = format_slider(
+                    self.editor_points_to_osu(), self.red_anchors,
+                    self.start_time, self.object_type, self.hit_sound, self.repeats, self.length
                 )
 
-                # ✅ 生成修改后的滑条数据（去掉第一个点）
-                new_control_points = []
-                for i, pt in enumerate(self.control_points[1:], 1):  # 🚀 从索引 `1` 开始，去掉第一个点
-                    osu_point = self.remap_coordinates(
-                        pt,
-                        rect_bottom_left_current_x, rect_bottom_left_current_y,
-                        rect_top_right_current_x, rect_top_right_current_y,
-                        reverse=False
-                    )
-                    new_control_points.append(f"{osu_point.x()}:{osu_point.y()}")
-
-                    # 如果当前点是红色锚点，则重复添加该点（红锚点在osu!中表示为连续两个相同的点）
-                    if i in self.red_anchors:
-                        new_control_points.append(f"{osu_point.x()}:{osu_point.y()}")
-
-                new_curve_data = "B|" + "|".join(new_control_points)
-
-                # 重新拼接 osu! 滑条字符串
-                new_slider = f"{first_mapped_point.x()},{first_mapped_point.y()},{self.start_time},{self.object_type},{self.hit_sound},{new_curve_data},{self.repeats},{self.length}"
-
                 # 替换 osu! 文件内容
                 osu_data = [line.replace(original_slider, new_slider) for line in osu_data]
 
@@ -659,15 +723,8 @@ class BezierCurveEditor(QWidget):
 
 
     def bernstein_basis_polynomial(self, n, i, t):
-        if not (0 <= i <= n) or not (0 <= t <= 1):
-            return 0
-        if i < 0 or n < 0 or (n - i) < 0:
-            return 0
-        binomial_coefficient = math.factorial(n) / (math.factorial(i) * math.factorial(n - i))
-        power_of_t = t ** i
-        power_of_one_minus_t = (1 - t) ** (n - i)
-        basis = binomial_coefficient * power_of_t * power_of_one_minus_t
-        return basis
+        """计算 Bernstein 基函数值（对数空间求值，高阶时不会产生大整数运算）"""
+        return bernstein_value(n, i, t)
 
     def init_ui(self):
         # 确保icons目录存在
@@ -774,11 +831,13 @@ class BezierCurveEditor(QWidget):
             self.control_points = []
             self.red_anchors = set() # 清理红锚点数据
 
-            self.rotation_pivot_point = None  # 旋转基准点 (QPoint)
+            self.rotation_pivot_point = None  # 旋转基准点 (QPointF，osu! 坐标)
             self.has_rotation_pivot = False   # 是否已设置旋转基准点 (bool)
             self.initial_slider_length = 0  # 初始滑条长度
             self.current_slider_length = 0  # 当前滑条长度
             self.image = None
+            self.scaled_image = None
+            self.scaled_image_key = None
             self.dragging_point = None
             self.preview_point = None
             self.is_preview_enabled = False
@@ -1133,6 +1192,10 @@ class BezierCurveEditor(QWidget):
             # 保存滑块引用
             self.sliders[config["name"]] = slider
 
+            # 拖动图片缩放和矩形大小滑块时底图先快速缩放，松开后重绘一次得到平滑缩放的结果
+            if config["name"] in ["scale", "rect_scale"]:
+                slider.sliderReleased.connect(self.update)
+
             # 为circle_size滑块添加值标签
             if config["name"] == "circle_size":
                 self.circle_size_value_label = QLabel(str(slider.value()), self.sliders_panel)
@@ -1239,10 +1302,12 @@ class BezierCurveEditor(QWidget):
                     button.move(2, y_pos)
 
         self.update_circle_size()   # 在窗口大小改变时调用 update_circle_size 函数，更新描边粗细
-        self.update_curve_cache()  # 刷新缓存
+        self.update_camera()       # 只更新视图相机，锚点和曲线缓存都在 osu! 坐标中，不需要重算
         self.update()              # 并请求重绘，应用新的描边粗细
 
     def keyPressEvent(self, event):
+        self.flush_pending_mouse_move()
+        self.bake_gesture_transform()
         # 撤销操作 (Ctrl+Z)
         if event.key() == Qt.Key_Z and event.modifiers() == Qt.ControlModifier:
             self.undo()
@@ -1279,6 +1344,7 @@ class BezierCurveEditor(QWidget):
             self.update()
 
     def undo(self):
+        self.bake_gesture_transform()
         if self.history:
             self.future.append((self.control_points.copy(), self.red_anchors.copy()))  # 保存当前状态到 future
             last_state = self.history.pop()  # 恢复上一个状态
@@ -1295,6 +1361,7 @@ class BezierCurveEditor(QWidget):
             print("No history to undo")
 
     def redo(self):
+        self.bake_gesture_transform()
         if self.future:
             # 将当前状态保存到 history
             self.history.append((self.control_points.copy(), self.red_anchors.copy()))
@@ -1310,6 +1377,7 @@ class BezierCurveEditor(QWidget):
             self.update()
 
     def keyReleaseEvent(self, event):
+        self.flush_pending_mouse_move()
         # 释放Shift键时更新状态
         if event.key() == Qt.Key_Shift:
             self.is_shift_pressed = False
@@ -1321,6 +1389,9 @@ class BezierCurveEditor(QWidget):
         # 释放Ctrl键时更新状态
         elif event.key() == Qt.Key_Control:
             self.is_ctrl_pressed = False
+            # 还在计算中的高亮不再需要；Alt + Ctrl 的头尾锚点预览也随之过期
+            self.background_worker.cancel("highlight")
+            self.background_worker.cancel("preview")
             # 恢复完整帮助内容
             self.help_label.setText(self.help_label_text_full)
             self.help_label.adjustSize()
@@ -1329,6 +1400,7 @@ class BezierCurveEditor(QWidget):
         # 释放Alt键时更新状态
         elif event.key() == Qt.Key_Alt:
             self.is_alt_pressed = False
+            self.background_worker.cancel("preview")  # 还在计算中的预览不再需要
             # 恢复完整帮助内容
             self.help_label.setText(self.help_label_text_full)
             self.help_label.adjustSize()
@@ -1336,6 +1408,9 @@ class BezierCurveEditor(QWidget):
             self.update()
 
     def mousePressEvent(self, event):
+        self.flush_pending_mouse_move()
+        self.bake_gesture_transform()
+        pos = self.document_pos(event)  # 鼠标位置（osu! 坐标）
         if event.button() == Qt.MiddleButton:
             if event.modifiers() == Qt.ControlModifier:
                 # Ctrl + 鼠标中键：开始拖动曲线和图片 (保持不变)
@@ -1375,7 +1450,7 @@ class BezierCurveEditor(QWidget):
                                 self.control_points[current_idx],
                                 tangent_dir
                             )
-                            if projected_point:
+                            if projected_point is not None:
                                 self.control_points[prev_idx] = projected_point
 
                         if next_idx is not None:
@@ -1384,15 +1459,16 @@ class BezierCurveEditor(QWidget):
                                 self.control_points[current_idx],
                                 tangent_dir
                             )
-                            if projected_point:
+                            if projected_point is not None:
                                 self.control_points[next_idx] = projected_point
-                        self.update_curve_cache()
+                        # 只有相邻的两个锚点被投影移动
+                        self.update_curve_cache(dirty_anchors=tuple(idx for idx in (prev_idx, next_idx) if idx is not None))
                         self.update()
                         return
                 # 如果是普通锚点，保持原有的拖动逻辑
                 self.dragging_point = current_idx
                 self.is_dragging_control_point = True
-                self.drag_start_point = event.pos()
+                self.drag_start_point = pos
 
                 # 保存拖动开始时的状态，用于shift+左键拖动时计算
                 self.save_state() # 保存状态，以便可以撤销
@@ -1435,15 +1511,15 @@ class BezierCurveEditor(QWidget):
                 if event.modifiers() == Qt.ShiftModifier:
                     # 记录初始锚点坐标和鼠标位置
                     self.initial_anchor_pos = self.control_points[self.dragging_point]
-                    self.shift_drag_start_pos = event.pos()
+                    self.shift_drag_start_pos = pos
                     return
 
                 # Shift+拖动时基于初始坐标计算位移
                 if event.modifiers() == Qt.ShiftModifier and hasattr(self, 'initial_anchor_pos'):
-                    delta = event.pos() - self.shift_drag_start_pos
+                    delta = pos - self.shift_drag_start_pos
                     new_x = self.initial_anchor_pos.x() + delta.x()
                     new_y = self.initial_anchor_pos.y() + delta.y()
-                    self.control_points[self.dragging_point] = QPoint(int(new_x), int(new_y))
+                    self.control_points[self.dragging_point] = QPointF(new_x, new_y)
                     self.update_curve_cache()
                     self.update()
                     return
@@ -1452,14 +1528,14 @@ class BezierCurveEditor(QWidget):
             # 3. 仅在无预选中锚点和无修饰键时 左键加添锚点 (保持不变)
             elif self.pre_selected_point_index is None and event.modifiers() == Qt.NoModifier: # 确保没有预选中点和没有修饰键
                 self.save_state()
-                self.control_points.append(event.pos())
+                self.control_points.append(pos)
                 # 添加到末尾不需要更新红色锚点索引
                 self.update_curve_cache()
                 self.update()
             # Alt + Ctrl：添加头尾锚点 (保持不变) - 但只有在没有预选点时才触发，避免冲突
             elif event.modifiers() & Qt.AltModifier and event.modifiers() & Qt.ControlModifier and len(self.control_points) >= 2 and self.pre_selected_point_index is None:
                 self.save_state()
-                insert_index = self.get_insert_position(event.pos())
+                insert_index = self.get_insert_position(pos)
                 if insert_index is not None:
                     if insert_index == 0:
                         # 更新红色锚点索引，考虑在头部插入新点后的索引变化
@@ -1468,30 +1544,25 @@ class BezierCurveEditor(QWidget):
                             updated_red_anchors.add(idx + 1)  # 所有红色锚点索引+1
                         self.red_anchors = updated_red_anchors
 
-                        self.control_points.insert(0, event.pos())
+                        self.control_points.insert(0, pos)
                     else:
                         # 添加到末尾不需要更新红色锚点索引
-                        self.control_points.append(event.pos())
+                        self.control_points.append(pos)
                     self.update_curve_cache()
                     self.update()
             # 仅 Alt：添加中间锚点 (保持不变) - 但只有在没有预选点时才触发，避免冲突
             elif event.modifiers() == Qt.AltModifier and self.pre_selected_point_index is None:
-                self.insert_control_point(event.pos())
+                self.insert_control_point(pos)
             elif event.modifiers() == Qt.ControlModifier and self.closest_curve_point is not None:
                 # Ctrl + 左键：开始拖动曲线变形 (保持不变)
                 self.save_state()
                 self.is_ctrl_dragging_deformation = True
-                self.drag_start_pos = event.pos()
+                self.drag_start_pos = pos
                 self.locked_closest_point = self.closest_curve_point
-                # 计算并锁定 t 值 (保持不变)
-                min_distance = float('inf')
-                closest_idx = -1
-                for i, point in enumerate(self.cached_curve_points):
-                    distance = self.distance(self.locked_closest_point, point)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest_idx = i
-                self.locked_t = closest_idx / self.curve_segments if self.curve_segments > 0 else 0
+                # 计算并锁定 t 值
+                closest_idx, _ = self.nearest_curve_sample(self.locked_closest_point)
+                self.locked_t = float(self.curve_tessellation.t_values[closest_idx]) if closest_idx is not None else 0
+                self.deformation_context = self.build_deformation_context(closest_idx)
 
 
         elif event.button() == Qt.RightButton:
@@ -1538,13 +1609,13 @@ class BezierCurveEditor(QWidget):
                             new_next_y = red_point.y() - direction_y * prev_distance
 
                             # 更新后一个点的位置
-                            self.control_points[next_idx] = QPoint(int(new_next_x), int(new_next_y))
-                            self.update_curve_cache()
+                            self.control_points[next_idx] = QPointF(new_next_x, new_next_y)
+                            self.update_curve_cache(dirty_anchors=(next_idx,))
                             self.update()
 
             # 【新增：Alt + 右键设置旋转基准点】
             elif event.modifiers() == Qt.AltModifier:
-                self.rotation_pivot_point = event.pos() # 设置旋转基准点为当前鼠标位置
+                self.rotation_pivot_point = pos # 设置旋转基准点为当前鼠标位置
                 self.has_rotation_pivot = True # 标记已设置基准点
             # 无修饰符的右键：如果有预选中锚点则切换红色锚点，否则如果有旋转基准点则开始旋转
             elif event.modifiers() == Qt.NoModifier:
@@ -1555,29 +1626,77 @@ class BezierCurveEditor(QWidget):
                         self.red_anchors.remove(self.pre_selected_point_index)
                     else:
                         self.red_anchors.add(self.pre_selected_point_index)
-                    self.update_curve_cache()
+                    self.update_curve_cache(dirty_anchors=())  # 锚点位置不变，只重算新出现的分段
                     self.update()
                 elif self.has_rotation_pivot: # 确保已设置基准点
                     self.is_rotating_curve = True # 标记开始旋转
                     self.save_state()
                     self.rotation_start_pos = event.pos() # 记录旋转开始时的鼠标位置
+                    self.rotation_angle = 0.0
 
 
         self.update()
 
 
     def mouseMoveEvent(self, event):
-        self.pre_selected_point_index = None
-        min_distance_pre_select = float('inf')
-        pre_select_threshold = 10
+        """
+        只记录最新的鼠标状态，由帧定时器每帧最多处理一次.
+
+        高回报率鼠标和数位板的事件远多于屏幕能显示的帧数，同一帧内较早的移动事件直接被覆盖.
+        上一次处理耗时超过一帧时，间隔按这次耗时拉长，处理之间至少留出同样长的时间给绘制和其他事件.
+        Qt 会在事件处理结束后回收 event，所以这里保存一份副本.
+        """
+        self.mouse_moves_received += 1
+        self.pending_mouse_move_count += 1
+        if self.pending_mouse_move is not None:
+            self.mouse_moves_merged += 1
+        self.pending_mouse_move = QMouseEvent(
+            event.type(), event.localPos(), event.windowPos(), event.screenPos(),
+            event.button(), event.buttons(), event.modifiers()
+        )
+        if not self.mouse_move_timer.isActive():
+            elapsed_ms = (time.perf_counter() - self.last_mouse_move_time) * 1000
+            interval_ms = max(MOUSE_MOVE_FRAME_INTERVAL_MS, self.last_mouse_move_ms)
+            self.mouse_move_timer.start(max(0, int(interval_ms - elapsed_ms)))
+
+    def flush_pending_mouse_move(self):
+        """立即处理尚未处理的鼠标移动；按下、释放鼠标和键盘、滚轮事件之前调用，保证事件顺序不变"""
+        self.mouse_move_timer.stop()
+        event = self.pending_mouse_move
+        if event is None:
+            return
+        self.pending_mouse_move = None
+        merged_events = self.pending_mouse_move_count
+        self.pending_mouse_move_count = 0
+        start = time.perf_counter()
+        self.process_mouse_move(event, merged_events)
+        self.last_mouse_move_time = time.perf_counter()
+        self.last_mouse_move_ms = (self.last_mouse_move_time - start) * 1000
+        self.mouse_moves_processed += 1
+
+    def mouse_move_stats(self):
+        """返回鼠标移动合并的统计信息"""
+        received = self.mouse_moves_received
+        return {
+            "received": received,
+            "processed": self.mouse_moves_processed,
+            "merged": self.mouse_moves_merged,
+            "merge_rate": self.mouse_moves_merged / received if received else 0.0,
+            "last_ms": self.last_mouse_move_ms,
+        }
+
+    def log_mouse_move_stats(self):
+        """LOG_MOUSE_MOVE_STATS 为 True 时打印鼠标移动合并的统计信息"""
+        if not LOG_MOUSE_MOVE_STATS:
+            return
+        stats = self.mouse_move_stats()
+        print(f"鼠标移动: 收到 {stats['received']}，处理 {stats['processed']}，合并 {stats['merged']} "
+              f"({stats['merge_rate']:.0%})，上次处理耗时 {stats['last_ms']:.1f} ms")
 
-        if not self.is_ctrl_pressed:
-            for i, point in enumerate(self.control_points):
-                distance = self.distance(point, event.pos())
-                if distance < pre_select_threshold:
-                    if distance < min_distance_pre_select:
-                        min_distance_pre_select = distance
-                        self.pre_selected_point_index = i
+    def process_mouse_move(self, event, merged_events=1):
+        """处理一次鼠标移动；merged_events 为这次处理代表的原始鼠标移动事件数（合并的事件也计入）"""
+        pos = self.document_pos(event)  # 鼠标位置（osu! 坐标）
+        self.update_pre_selected_point(pos)
 
         # 2. 存在预选中锚点时 左键拖动锚点 (移动逻辑)
         if self.is_dragging_control_point:
@@ -1586,12 +1705,12 @@ class BezierCurveEditor(QWidget):
 
                 # 如果拖动的是红色锚点，直接更新位置，不进行投影
                 if current_idx in self.red_anchors:
-                    self.control_points[current_idx] = event.pos()
+                    self.control_points[current_idx] = pos
                 # 如果拖动的是普通锚点
                 else:
                     # 无修饰键时，直接更新位置，实现无限制拖动
                     if event.modifiers() == Qt.NoModifier:
-                        self.control_points[current_idx] = event.pos()
+                        self.control_points[current_idx] = pos
                     # 如果没有锁定的直线，则使用Shift键的逻辑
                     elif event.modifiers() == Qt.ShiftModifier:
                         # 检查前一个点
@@ -1632,7 +1751,7 @@ class BezierCurveEditor(QWidget):
                                     self.control_points[next_red_idx],
                                     next_dir
                                 )
-                                if intersection:
+                                if intersection is not None:
                                     self.control_points[current_idx] = intersection
 
                         # 如果只有一个相邻的红色锚点
@@ -1640,225 +1759,57 @@ class BezierCurveEditor(QWidget):
                             red_idx = prev_red_idx if prev_red_idx is not None else next_red_idx
                             # 获取用于确定直线的另一个点
                             projected_point = self.project_point_to_line(
-                                event.pos(),
+                                pos,
                                 self.locked_line_point,
                                 self.locked_line_direction
                             )
-                            if projected_point:
+                            if projected_point is not None:
                                 self.control_points[current_idx] = projected_point
                         else:
                             # 如果没有相邻的红色锚点，直接更新位置
-                            self.control_points[current_idx] = event.pos()
+                            self.control_points[current_idx] = pos
                     else:
                         # 普通拖动模式，直接更新位置
-                        self.control_points[self.dragging_point] = event.pos()
-            self.update_curve_cache() # 刷新曲线缓存
-            self.update() # 触发重绘
+                        self.control_points[self.dragging_point] = pos
+            # 刷新曲线缓存：只有被拖动的锚点移动过，只重算包含它的分段
+            self.update_curve_cache(dirty_anchors=(self.dragging_point,) if self.dragging_point is not None else None)
+            self.update_changed_region() # 触发重绘
 
         if self.is_ctrl_dragging_deformation and self.closest_curve_point is not None:
             # Ctrl + 左键拖动：变形曲线 (修改为支持红色锚点分段)
-            current_pos = event.pos()
-            delta = current_pos - self.drag_start_pos
-
-            t = self.locked_t
-
-            # 如果没有红色锚点，按原方式计算整条曲线的影响力
-            if not self.red_anchors:
-                curve_order = len(self.control_points) - 1
-                for i in range(len(self.control_points)):
-                    influence = self.bernstein_basis_polynomial(curve_order, i, t)
-                    move_vector = QPoint(int(delta.x() * influence * 2), int(delta.y() * influence * 2))
-                    self.control_points[i] = self.control_points[i] + move_vector
-            else:
-                # 找出鼠标最近点所在的曲线分段
-                min_distance = float('inf')
-                closest_idx = -1
-                for i, point in enumerate(self.cached_curve_points):
-                    distance = self.distance(self.closest_curve_point, point)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest_idx = i
-
-                # 计算每个分段的曲线点范围
-                segments = []
-                start_idx = 0
-                segment_ranges = []
-                start_point_idx = 0
-
-                # 按索引排序红色锚点
-                sorted_red_anchors = sorted(self.red_anchors)
-
-                # 处理所有分段
-                for red_idx in sorted_red_anchors:
-                    if red_idx > start_idx:  # 确保有足够的点形成一段
-                        segments.append((start_idx, red_idx))
-                        segment_points = self.control_points[start_idx:red_idx+1]
-                        if len(segment_points) >= 2:  # 确保分段至少有两个点
-                            segment_point_count = self.curve_segments + 1
-                            segment_ranges.append((start_point_idx, start_point_idx + segment_point_count - 1))
-                            start_point_idx += segment_point_count - 1  # 减1是因为相邻分段的端点重合
-                    start_idx = red_idx
-
-                # 处理最后一段（最后一个红色锚点到结束）
-                if start_idx < len(self.control_points) - 1:
-                    segments.append((start_idx, len(self.control_points) - 1))
-                    segment_points = self.control_points[start_idx:]
-                    if len(segment_points) >= 2:  # 确保分段至少有两个点
-                        segment_point_count = self.curve_segments + 1
-                        segment_ranges.append((start_point_idx, start_point_idx + segment_point_count - 1))
-
-                # 根据closest_idx找出所在分段
-                current_segment = None
-                segment_t = t  # 默认使用全局t值
-
-                for i, (start_range, end_range) in enumerate(segment_ranges):
-                    if start_range <= closest_idx <= end_range:
-                        current_segment = segments[i]
-                        # 计算分段内的相对t值
-                        segment_length = end_range - start_range
-                        if segment_length > 0:
-                            segment_t = (closest_idx - start_range) / segment_length
-                        break
-
-                # 如果找到了所在分段，只计算该分段内锚点的影响力
-                if current_segment:
-                    segment_start, segment_end = current_segment
-                    segment_points = self.control_points[segment_start:segment_end+1]
-                    segment_curve_order = len(segment_points) - 1
-
-                    # 只计算当前分段内锚点的影响力并应用变形
-                    for i in range(segment_start, segment_end + 1):
-                        local_idx = i - segment_start  # 在分段内的索引
-                        influence = self.bernstein_basis_polynomial(segment_curve_order, local_idx, segment_t)
-                        move_vector = QPoint(int(delta.x() * influence * 2), int(delta.y() * influence * 2))
-                        self.control_points[i] = self.control_points[i] + move_vector
-                else:
-                    # 如果找不到所在分段，使用全局方式计算（兜底方案）
-                    curve_order = len(self.control_points) - 1
-                    for i in range(len(self.control_points)):
-                        influence = self.bernstein_basis_polynomial(curve_order, i, t)
-                        move_vector = QPoint(int(delta.x() * influence * 2), int(delta.y() * influence * 2))
-                        self.control_points[i] = self.control_points[i] + move_vector
-
-            self.drag_start_pos = current_pos
-            self.update_curve_cache()
-            self.update()
+            self.apply_deformation_drag(pos)
+            self.update_changed_region()
             return
         if self.dragging_curve_and_image:
             # Ctrl + 鼠标中键拖动：整体平移曲线和图片 (保持不变)
             delta = event.pos() - self.last_mouse_pos
             self.last_mouse_pos = event.pos()
 
-            for i in range(len(self.control_points)):
-                self.control_points[i] += delta
+            # 平移只累积到手势变换中，释放鼠标时再应用到控制点
+            self.compose_gesture_transform(QTransform.fromTranslate(*self.camera.document_vector(delta.x(), delta.y())))
+            self.update_pre_selected_point(pos)
 
             self.image_offset_x += delta.x()
             self.image_offset_y += delta.y()
 
-            self.update_curve_cache()
-            self.update()
+            self.update_changed_region()
             return
         elif self.dragging_curve_only:
             # 鼠标中键拖动：单独平移曲线 (保持不变)
             delta = event.pos() - self.last_mouse_pos
             self.last_mouse_pos = event.pos()
 
-            for i in range(len(self.control_points)):
-                self.control_points[i] += delta
-
-            self.update_curve_cache()
-            self.update()
+            self.compose_gesture_transform(QTransform.fromTranslate(*self.camera.document_vector(delta.x(), delta.y())))
+            self.update_pre_selected_point(pos)
+            self.update_changed_region()
             return
         elif self.is_ctrl_dragging_deformation and self.locked_closest_point is not None:
-            current_pos = event.pos()
-            delta = current_pos - self.drag_start_pos
-            t = self.locked_t
-
-            # 如果没有红色锚点，按原方式计算整条曲线的影响力
-            if not self.red_anchors:
-                curve_order = len(self.control_points) - 1
-                for i in range(len(self.control_points)):
-                    influence = self.bernstein_basis_polynomial(curve_order, i, t)
-                    move_vector = QPoint(int(delta.x() * influence * 2), int(delta.y() * influence * 2))
-                    self.control_points[i] = self.control_points[i] + move_vector
-            else:
-                # 找出鼠标最近点所在的曲线分段
-                min_distance = float('inf')
-                closest_idx = -1
-                for i, point in enumerate(self.cached_curve_points):
-                    distance = self.distance(self.locked_closest_point, point)
-                    if distance < min_distance:
-                        min_distance = distance
-                        closest_idx = i
-
-                # 计算每个分段的曲线点范围
-                segments = []
-                start_idx = 0
-                segment_ranges = []
-                start_point_idx = 0
-
-                # 按索引排序红色锚点
-                sorted_red_anchors = sorted(self.red_anchors)
-
-                # 处理所有分段
-                for red_idx in sorted_red_anchors:
-                    if red_idx > start_idx:  # 确保有足够的点形成一段
-                        segments.append((start_idx, red_idx))
-                        segment_points = self.control_points[start_idx:red_idx+1]
-                        if len(segment_points) >= 2:  # 确保分段至少有两个点
-                            segment_point_count = self.curve_segments + 1
-                            segment_ranges.append((start_point_idx, start_point_idx + segment_point_count - 1))
-                            start_point_idx += segment_point_count - 1  # 减1是因为相邻分段的端点重合
-                    start_idx = red_idx
-
-                # 处理最后一段（最后一个红色锚点到结束）
-                if start_idx < len(self.control_points) - 1:
-                    segments.append((start_idx, len(self.control_points) - 1))
-                    segment_points = self.control_points[start_idx:]
-                    if len(segment_points) >= 2:  # 确保分段至少有两个点
-                        segment_point_count = self.curve_segments + 1
-                        segment_ranges.append((start_point_idx, start_point_idx + segment_point_count - 1))
-
-                # 根据closest_idx找出所在分段
-                current_segment = None
-                segment_t = t  # 默认使用全局t值
-
-                for i, (start_range, end_range) in enumerate(segment_ranges):
-                    if start_range <= closest_idx <= end_range:
-                        current_segment = segments[i]
-                        # 计算分段内的相对t值
-                        segment_length = end_range - start_range
-                        if segment_length > 0:
-                            segment_t = (closest_idx - start_range) / segment_length
-                        break
-
-                # 如果找到了所在分段，只计算该分段内锚点的影响力
-                if current_segment:
-                    segment_start, segment_end = current_segment
-                    segment_points = self.control_points[segment_start:segment_end+1]
-                    segment_curve_order = len(segment_points) - 1
-
-                    # 只计算当前分段内锚点的影响力并应用变形
-                    for i in range(segment_start, segment_end + 1):
-                        local_idx = i - segment_start  # 在分段内的索引
-                        influence = self.bernstein_basis_polynomial(segment_curve_order, local_idx, segment_t)
-                        move_vector = QPoint(int(delta.x() * influence * 2), int(delta.y() * influence * 2))
-                        self.control_points[i] = self.control_points[i] + move_vector
-                else:
-                    # 如果找不到所在分段，使用全局方式计算（兜底方案）
-                    curve_order = len(self.control_points) - 1
-                    for i in range(len(self.control_points)):
-                        influence = self.bernstein_basis_polynomial(curve_order, i, t)
-                        move_vector = QPoint(int(delta.x() * influence * 2), int(delta.y() * influence * 2))
-                        self.control_points[i] = self.control_points[i] + move_vector
-
-            self.drag_start_pos = current_pos
-            self.update_curve_cache()
+            self.apply_deformation_drag(pos)
 
         # 【新增：曲线旋转的移动逻辑 -  更换为基于拖动距离计算角度, 动态速度】
         if self.is_rotating_curve and self.rotation_pivot_point is not None:
             current_pos = event.pos()
-            delta = current_pos - self.rotation_start_pos  # 鼠标拖动向量
+            delta = current_pos - self.rotation_start_pos  # 从按下右键到当前位置的鼠标拖动向量
 
             distance = math.sqrt(delta.x()**2 + delta.y()**2) # 计算鼠标拖动距离 (直线距离)
             # 使用 self.rect_height_large 动态设置旋转速度：移动这个距离旋转 360° (2*pi 弧度)
@@ -1871,15 +1822,15 @@ class BezierCurveEditor(QWidget):
             if delta.x() < 0:
                 rotation_angle = -rotation_angle #  向左拖动时，逆时针旋转 (负角度)
 
-            # 旋转所有控制点 (保持不变)
-            rotated_control_points = []
-            for point in self.control_points:
-                rotated_point = self.rotate_point(point, self.rotation_pivot_point, rotation_angle) # 调用旋转函数
-                rotated_control_points.append(rotated_point)
-            self.control_points = rotated_control_points # 更新控制点
-
-            self.update_curve_cache() # 刷新曲线缓存
-            self.update() # 触发重绘
+            # 每个鼠标移动事件旋转一次 rotation_angle；被合并的事件按同样的角度计入，旋转量与帧率无关.
+            # 累计角度只用于重建手势变换，释放鼠标时再应用到控制点
+            self.rotation_angle += rotation_angle * merged_events
+            pivot_x, pivot_y = self.rotation_pivot_point.x(), self.rotation_pivot_point.y()
+            self.gesture_transform = (
+                QTransform().translate(pivot_x, pivot_y).rotateRadians(self.rotation_angle).translate(-pivot_x, -pivot_y)
+            )
+            self.update_pre_selected_point(pos)
+            self.update_changed_region() # 触发重绘
             return # 旋转时提前返回，避免执行其他移动逻辑
 
         self.is_ctrl_pressed = bool(event.modifiers() & Qt.ControlModifier)
@@ -1887,15 +1838,18 @@ class BezierCurveEditor(QWidget):
         self.is_shift_pressed = bool(event.modifiers() & Qt.ShiftModifier)  # 新增：跟踪 Shift 键状态
         self.update_preview_slider(event)
 
-        ctrl_highlight_threshold = self.outline_width * 0.9 if self.outline_width > 0 else 50
+        ctrl_highlight_threshold = self.document_length(self.outline_width * 0.9 if self.outline_width > 0 else 50)
         self.update_ctrl_highlight(event, ctrl_highlight_threshold)
-        self.update()
+        self.update_changed_region()
 
     def mouseReleaseEvent(self, event):
+        self.flush_pending_mouse_move()
+        self.log_mouse_move_stats()
         if event.button() == Qt.MiddleButton:
             # 停止拖动曲线和图片/或单独拖动曲线 (保持不变)
             self.dragging_curve_only = False
             self.dragging_curve_and_image = False
+            self.bake_gesture_transform()
         elif event.button() == Qt.LeftButton:
             self.is_left_button_pressed = False # 释放左键时，更新状态
             # 2. 存在预选中锚点时 左键拖动锚点 (释放逻辑) (保持不变)
@@ -1909,6 +1863,7 @@ class BezierCurveEditor(QWidget):
                 self.drag_start_pos = None # 清空拖动起始位置
                 self.locked_closest_point = None
                 self.locked_t = None  # 清理 locked_t
+                self.deformation_context = None
                 self.update()
                 return # 提前返回，避免执行其他释放逻辑
 
@@ -1917,6 +1872,7 @@ class BezierCurveEditor(QWidget):
             # 【新增：停止曲线旋转】
             self.is_rotating_curve = False # 停止旋转
             self.rotation_start_pos = None # 清空旋转起始位置
+            self.bake_gesture_transform()
 
             self.dragging_point = None
             self.is_dragging_control_point = False
@@ -1924,15 +1880,90 @@ class BezierCurveEditor(QWidget):
             self.drag_start_pos = None
             self.locked_closest_point = None
             self.locked_t = None
+            self.deformation_context = None
             self.update()
 
+    def build_deformation_context(self, sample_idx):
+        """
+        计算 Ctrl 变形拖动的上下文：受影响的锚点范围和它们在锁定采样点处的影响力.
+
+        拖动过程中分段和影响力保持不变. 没有红色锚点时整条曲线受影响；有红色锚点时只有采样点所在分段受影响，
+        找不到分段时把整条曲线当作一条贝塞尔曲线，按采样点在整条曲线上的参数兜底（locked_t 是分段内的 t）.
+        """
+        segment_idx = self.red_segment_index.segment_of_sample(sample_idx) if sample_idx is not None else None
+        if self.red_anchors and segment_idx is not None:
+            segment_start, segment_end = self.red_segment_index.segments[segment_idx]
+            return segment_start, segment_end, self.curve_tessellation.segment_basis_row(segment_idx, sample_idx)
+
+        curve_order = len(self.control_points) - 1
+        if not self.red_anchors and self.curve_tessellation.is_uniform and sample_idx is not None:
+            influences = basis_cache.row(curve_order, self.curve_segments, sample_idx)
+        else:
+            influences = bernstein_row(curve_order, self.global_curve_param(sample_idx))
+        return 0, curve_order, influences
+
+    def global_curve_param(self, sample_idx):
+        """返回采样点在整条曲线上的参数（分段序号 + 分段内 t，按分段数归一化到 [0, 1]）；没有采样点时为 0"""
+        params = self.arc_length_table.params
+        if sample_idx is None or not 0 <= sample_idx < len(params) or params[-1] <= 0:
+            return 0.0
+        return float(params[sample_idx] / params[-1])
+
+    def apply_deformation_drag(self, current_pos):
+        """按拖动上下文移动锚点（每个锚点移动 delta * 影响力 * 2，osu! 坐标不取整），只重算移动过的锚点所在的分段"""
+        delta = current_pos - self.drag_start_pos
+        segment_start, segment_end, influences = self.deformation_context
+        moves = np.outer(influences * 2, (delta.x(), delta.y()))
+        moved = []
+        for i, (dx, dy) in zip(range(segment_start, segment_end + 1), moves.tolist()):
+            if dx or dy:
+                self.control_points[i] = self.control_points[i] + QPointF(dx, dy)
+                moved.append(i)
+        self.drag_start_pos = current_pos
+        self.update_curve_cache(dirty_anchors=moved)
+
+    def update_pre_selected_point(self, pos):
+        """
+        按鼠标位置 pos（osu! 坐标）更新预选中锚点：屏幕上 10 像素以内最近的控制点，Ctrl 按下时不预选.
+
+        旋转 / 平移手势进行中时控制点还没有移动，先把 pos 反向映射到手势开始前的坐标再查找.
+        """
+        self.pre_selected_point_index = None
+        if self.is_ctrl_pressed:
+            return
+        if self.gesture_transform is not None:
+            pos = self.gesture_transform.inverted()[0].map(pos)
+        pre_select_threshold = self.document_length(10)  # 屏幕上 10 像素
+        nearest_idx, distance = self.control_point_hash.nearest(pos.x(), pos.y(), pre_select_threshold)
+        if distance < pre_select_threshold:
+            self.pre_selected_point_index = nearest_idx
+
+    def compose_gesture_transform(self, transform):
+        """在当前手势变换之后追加 transform"""
+        if self.gesture_transform is None:
+            self.gesture_transform = transform
+        else:
+            self.gesture_transform = self.gesture_transform * transform
+
+    def bake_gesture_transform(self):
+        """把手势变换应用到控制点并刷新曲线缓存；没有手势变换时不做任何事"""
+        if self.gesture_transform is None:
+            return
+        transform = self.gesture_transform
+        self.gesture_transform = None
+        # 旋转过程中被按键、滚轮等打断时，已应用的角度不再重复计入
+        self.rotation_angle = 0.0
+        self.control_points = [transform.map(QPointF(point)) for point in self.control_points]
+        self.update_curve_cache()
+        self.update()
+
     def rotate_point(self, point, pivot, angle_radians):
         """绕基准点旋转点的函数"""
         dx = point.x() - pivot.x()
         dy = point.y() - pivot.y()
         rotated_x = dx * math.cos(angle_radians) - dy * math.sin(angle_radians) + pivot.x()
         rotated_y = dx * math.sin(angle_radians) + dy * math.cos(angle_radians) + pivot.y()
-        return QPoint(int(rotated_x), int(rotated_y))
+        return QPointF(rotated_x, rotated_y)
 
     def calculate_point_on_line(self, line_point1, line_point2, distance_from_point1):
         """计算直线上距离起点特定距离的点"""
@@ -2018,6 +2049,8 @@ class BezierCurveEditor(QWidget):
             self.update()
 
     def wheelEvent(self, event):
+        self.flush_pending_mouse_move()
+        self.bake_gesture_transform()
         # 滚轮：整体缩放曲线
         if not self.is_ctrl_pressed and not self.is_alt_pressed:
             self.save_state()
@@ -2026,7 +2059,7 @@ class BezierCurveEditor(QWidget):
             self.curve_scale *= scale_factor
 
             # 以窗口中心为基准缩放
-            center = QPoint(self.width() // 2, self.height() // 2)
+            center = QPointF(*self.camera.to_document(self.width() // 2, self.height() // 2))
             for i in range(len(self.control_points)):
                 self.control_points[i] = center + (self.control_points[i] - center) * scale_factor
             self.update_curve_cache()  # 刷新缓存
@@ -2060,95 +2093,102 @@ class BezierCurveEditor(QWidget):
 
         return curve_points
 
-    def update_curve_cache(self):
-        """刷新贝塞尔曲线缓存，支持红色锚点和曲线分段"""
+    def update_curve_cache(self, dirty_anchors=None):
+        """
+        刷新贝塞尔曲线缓存，支持红色锚点和曲线分段（每个分段一次矩阵乘法）
+
+        dirty_anchors 为本次移动过的锚点索引；传入时只重算包含这些锚点的分段（切换红锚点时传入空集合，
+        只有新出现的分段会被重算）. 不传时全部重建，插入、删除锚点等改变索引的操作必须全部重建.
+        """
+        self.document_revision += 1
+        if dirty_anchors is not None and len(self.control_point_hash) == len(self.control_points):
+            # 锚点索引不变，只把移动过的锚点挪到新格子
+            for idx in dirty_anchors:
+                point = self.control_points[idx]
+                self.control_point_hash.move(idx, point.x(), point.y())
+        else:
+            self.control_point_hash.rebuild((point.x(), point.y()) for point in self.control_points)
         if len(self.control_points) >= 2:
-            self.cached_curve_points = []
-
-            # 如果没有红色锚点，按原方式计算整条曲线
-            if not self.red_anchors:
-                for t in range(0, self.curve_segments + 1):
-                    t_normalized = t / self.curve_segments
-                    point = self.calculate_bezier_point(t_normalized, self.control_points)
-                    self.cached_curve_points.append(point)
+            self.curve_tessellation = self.curve_cache.update(
+                qpoints_to_array(self.control_points), self.red_anchors, self.curve_segments,
+                self.tessellation_tolerance(), dirty_anchors
+            )
+            self.cached_curve_array = self.curve_tessellation.points
+            self.red_segment_index = self.curve_tessellation.index
+            self.arc_length_table = ArcLengthTable.from_tessellation(self.curve_tessellation)
+            dirty_sample_ranges = self.curve_cache.dirty_sample_ranges
+            if dirty_sample_ranges is not None and self.cached_curve_points is not None:
+                # 分段布局不变，只覆盖重算过的分段对应的曲线点
+                curve_buffer = polygon_buffer(self.cached_curve_points)
+                for range_start, range_end in dirty_sample_ranges:
+                    curve_buffer[range_start:range_end + 1] = self.cached_curve_array[range_start:range_end + 1]
             else:
-                # 按照红色锚点分段计算曲线
-                # 首先将控制点按照红色锚点分段
-                segments = []
-                start_idx = 0
-
-                # 按索引排序红色锚点
-                sorted_red_anchors = sorted(self.red_anchors)
-
-                # 处理所有分段
-                for red_idx in sorted_red_anchors:
-                    if red_idx > start_idx:  # 确保有足够的点形成一段
-                        segments.append(self.control_points[start_idx:red_idx+1])
-                    start_idx = red_idx
-
-                # 处理最后一段（最后一个红色锚点到结束）
-                if start_idx < len(self.control_points) - 1:
-                    segments.append(self.control_points[start_idx:])
-
-                # 为每个分段计算贝塞尔曲线点
-                for segment in segments:
-                    if len(segment) >= 2:  # 确保分段至少有两个点
-                        # 计算当前分段的曲线点
-                        segment_points = []
-                        for t in range(0, self.curve_segments + 1):
-                            t_normalized = t / self.curve_segments
-                            point = self.calculate_bezier_point(t_normalized, segment)
-                            segment_points.append(point)
-
-                        # 如果不是第一段，移除第一个点以避免重复
-                        if self.cached_curve_points and segment_points:
-                            segment_points = segment_points[1:]
-
-                        # 将当前分段的点添加到缓存中
-                        self.cached_curve_points.extend(segment_points)
+                self.cached_curve_points = array_to_polygon(self.cached_curve_array)
         else:
+            self.curve_cache.invalidate()
+            self.curve_tessellation = None
+            self.red_segment_index = SegmentIndex([])
+            self.arc_length_table = ArcLengthTable(np.empty((0, 2)))
+            self.cached_curve_array = None
             self.cached_curve_points = None  # 如果控制点少于2个，清空缓存
 
-    def interpolate_color(self, offset, max_offset, max_color="#f177ae", min_color="#00BECA" ):
-        """根据偏移量插值计算颜色，从 #00beca 到 #f177ae"""
-        if max_offset == 0:
-            return QColor(min_color)  # 无偏移时返回最小颜色
+    def tessellation_tolerance(self):
+        """自适应采样时返回平直度容差（osu! 坐标），均匀采样时返回 None"""
+        return self.flatness_tolerance if self.adaptive_tessellation else None
 
-        # 定义颜色范围
-        min_color = QColor(min_color)
-        max_color = QColor(max_color)
-
-        # 计算插值比例
-        ratio = min(offset / max_offset, 1.0)  # 限制在 [0, 1] 区间
+    def toggle_adaptive_tessellation(self):
+        """切换均匀采样 / 自适应采样；自适应模式下曲线段数作为每个分段的采样上限"""
+        self.adaptive_tessellation = not self.adaptive_tessellation
+        self.update_curve_cache()
+        self.update()
 
-        # 线性插值计算 RGB
-        r = int(min_color.red() + (max_color.red() - min_color.red()) * (ratio ** 3))
-        g = int(min_color.green() + (max_color.green() - min_color.green()) * (ratio ** 3))
-        b = int(min_color.blue() + (max_color.blue() - min_color.blue()) * (ratio ** 3))
+    def color_lut(self, max_color="#f177ae", min_color="#00BECA"):
+        """
+        返回从 min_color 到 max_color 的渐变色查找表 (颜色列表, 预览虚线画笔列表)，各 COLOR_LUT_SIZE 项.
+        第 i 项对应插值比例 i / (COLOR_LUT_SIZE - 1)，按比例的三次方插值 RGB；每种配色只计算一次.
+        """
+        key = (max_color, min_color)
+        lut = self.color_luts.get(key)
+        if lut is None:
+            min_rgb = np.array(QColor(min_color).getRgb()[:3], dtype=np.float64)
+            max_rgb = np.array(QColor(max_color).getRgb()[:3], dtype=np.float64)
+            ratios = np.linspace(0.0, 1.0, COLOR_LUT_SIZE)[:, None] ** 3
+            colors = [QColor(r, g, b) for r, g, b in (min_rgb + (max_rgb - min_rgb) * ratios).astype(int).tolist()]
+            pens = []
+            for color in colors:
+                pen = QPen(color)
+                pen.setWidthF(3.5)
+                pen.setDashPattern([2, 2])
+                pens.append(pen)
+            lut = self.color_luts[key] = (colors, pens)
+        return lut
+
+    def color_lut_index(self, offset, max_offset):
+        """把 offset / max_offset（限制在 [0, 1] 区间）换算为渐变色查找表的下标，offset 可以是数组"""
+        if max_offset == 0:
+            return np.zeros_like(offset, dtype=int) if isinstance(offset, np.ndarray) else 0
+        ratio = np.minimum(np.asarray(offset, dtype=np.float64) / max_offset, 1.0)
+        index = (ratio * (COLOR_LUT_SIZE - 1) + 0.5).astype(int)
+        return index if isinstance(offset, np.ndarray) else int(index)
 
-        return QColor(r, g, b)
+    def interpolate_color(self, offset, max_offset, max_color="#f177ae", min_color="#00BECA" ):
+        """根据偏移量插值计算颜色，从 #00beca 到 #f177ae；返回查找表中颜色的副本，调用方可以修改透明度"""
+        colors, _ = self.color_lut(max_color, min_color)
+        return QColor(colors[self.color_lut_index(offset, max_offset)])
 
     def insert_control_point(self, pos):
         """在最近的两个连续控制点中间插入新控制点 (增加距离阈值，并使用鼠标位置作为插入点)"""
         if len(self.control_points) < 2:
             return
 
-        closest_distance = float('inf')
-        insert_segment_index = -1
-        distance_threshold = self.rect_height_large * 0.11 # self.outline_width * 0.85
+        distance_threshold = self.document_length(self.rect_height_large * 0.11) # self.outline_width * 0.85
 
-        # 遍历所有线段，寻找最近距离的线段
-        for i in range(len(self.control_points) - 1):
-            segment_start_point = self.control_points[i]
-            segment_end_point = self.control_points[i + 1]
-            segment_distance = self.point_to_line_distance(pos, segment_start_point, segment_end_point)
-
-            if segment_distance < closest_distance:
-                closest_distance = segment_distance
-                insert_segment_index = i + 1
+        # 在阈值范围内寻找最近的线段
+        closest_edge, _ = self.nearest_control_edge(pos, distance_threshold)
 
         # 只有当最近距离小于阈值时才插入
-        if insert_segment_index != -1 and closest_distance <= distance_threshold:
+        if closest_edge is not None:
+            insert_segment_index = closest_edge + 1
             # 插入位置策略更改为当前鼠标位置 pos
             new_point = pos #  直接使用鼠标点击位置 pos 作为新控制点的位置
 
@@ -2179,8 +2219,10 @@ class BezierCurveEditor(QWidget):
             msg.exec_()
             return  # 禁止删除，直接返回
 
-        for i, point in enumerate(self.control_points):
-            if (pos - point).manhattanLength() < 10:
+        # 曼哈顿距离小于阈值（屏幕上 10 像素）的点一定在同样的半径以内，先用空间哈希取候选点，再按索引顺序判断
+        delete_threshold = self.document_length(10)
+        for i in self.control_point_hash.within_radius(pos.x(), pos.y(), delete_threshold):
+            if (pos - self.control_points[i]).manhattanLength() < delete_threshold:
                 self.save_state()
 
                 # 删除红色锚点（如果当前点是红色锚点）
@@ -2235,107 +2277,85 @@ class BezierCurveEditor(QWidget):
             projection_point = line_point1 + ab * param
             return QLineF(projection_point, point).length()
 
+    def curve_sample_index(self):
+        """返回当前曲线采样点的网格索引，网格只在曲线缓存刷新后第一次使用时重建"""
+        if self.curve_sample_grid_revision != self.document_revision:
+            self.curve_sample_grid = SampleGrid(self.cached_curve_array, CURVE_SAMPLE_GRID_CELL_SIZE)
+            self.curve_sample_grid_revision = self.document_revision
+        return self.curve_sample_grid
+
+    def nearest_curve_sample(self, pos, max_distance=math.inf):
+        """返回离 pos 最近的曲线采样点 (索引, 距离)，超过 max_distance 时返回 (None, inf)"""
+        if self.cached_curve_array is None:
+            return None, math.inf
+        return self.curve_sample_index().nearest(pos.x(), pos.y(), max_distance)
+
+    def nearest_control_edge(self, pos, max_distance):
+        """返回离 pos 最近的控制多边形边 (起点索引, 距离)，超过 max_distance 时返回 (None, inf)"""
+        if len(self.control_points) < 2:
+            return None, math.inf
+        # 边索引只在曲线缓存刷新后第一次查询时重建
+        if self.control_edge_grid_revision != self.document_revision:
+            self.control_edge_grid = SegmentGrid.from_polyline(
+                qpoints_to_array(self.control_points), CONTROL_EDGE_GRID_CELL_SIZE
+            )
+            self.control_edge_grid_revision = self.document_revision
+        return self.control_edge_grid.nearest(pos.x(), pos.y(), max_distance)
+
     def update_ctrl_highlight(self, event, ctrl_highlight_threshold):
-        """更新 Ctrl 键高亮功能：计算最近点和锚点影响力，支持红色锚点分段"""
+        """更新 Ctrl 键高亮功能：计算最近点和锚点影响力，支持红色锚点分段（阈值为 osu! 坐标中的长度）"""
         self.is_ctrl_pressed = bool(event.modifiers() & Qt.ControlModifier)
         if self.is_ctrl_pressed and self.cached_curve_points is not None and len(self.cached_curve_points) > 0:
-            # 计算鼠标与曲线的最近点
-            min_distance = float('inf')
-            closest_idx = -1
-            for i, point in enumerate(self.cached_curve_points):
-                distance = self.distance(event.pos(), point)
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_idx = i
-
-            if min_distance < ctrl_highlight_threshold:
-                self.closest_curve_point = self.cached_curve_points[closest_idx]
-                t = closest_idx / self.curve_segments  # 归一化 t 值
-
-                # 计算每个锚点的影响力
-                self.anchor_influences = []
-
-                # 如果没有红色锚点，按原方式计算影响力
-                if not self.red_anchors:
-                    curve_order = len(self.control_points) - 1
-                    for i in range(len(self.control_points)):
-                        influence = self.bernstein_basis_polynomial(curve_order, i, t)
-                        self.anchor_influences.append(influence)
-                else:
-                    # 按照红色锚点分段计算影响力
-                    # 首先找出鼠标所在的曲线分段
-                    segments = []
-                    start_idx = 0
-
-                    # 按索引排序红色锚点
-                    sorted_red_anchors = sorted(self.red_anchors)
-
-                    # 处理所有分段
-                    for red_idx in sorted_red_anchors:
-                        if red_idx > start_idx:  # 确保有足够的点形成一段
-                            segments.append((start_idx, red_idx))
-                        start_idx = red_idx
-
-                    # 处理最后一段（最后一个红色锚点到结束）
-                    if start_idx < len(self.control_points) - 1:
-                        segments.append((start_idx, len(self.control_points) - 1))
-
-                    # 找出鼠标最近点所在的分段
-                    current_segment = None
-                    segment_t = t  # 默认使用全局t值
-
-                    # 计算每个分段的曲线点范围
-                    segment_ranges = []
-                    start_point_idx = 0
-
-                    for segment_start, segment_end in segments:
-                        segment_points = self.control_points[segment_start:segment_end+1]
-                        if len(segment_points) >= 2:  # 确保分段至少有两个点
-                            segment_point_count = self.curve_segments + 1
-                            segment_ranges.append((start_point_idx, start_point_idx + segment_point_count - 1))
-                            start_point_idx += segment_point_count - 1  # 减1是因为相邻分段的端点重合
-
-                    # 根据closest_idx找出所在分段
-                    for i, (start_range, end_range) in enumerate(segment_ranges):
-                        if start_range <= closest_idx <= end_range:
-                            current_segment = segments[i]
-                            # 计算分段内的相对t值
-                            segment_length = end_range - start_range
-                            if segment_length > 0:
-                                segment_t = (closest_idx - start_range) / segment_length
-                            break
-
-                    # 初始化所有锚点的影响力为0
-                    self.anchor_influences = [0.0] * len(self.control_points)
-
-                    # 如果找到了所在分段，计算该分段内锚点的影响力
-                    if current_segment:
-                        segment_start, segment_end = current_segment
-                        segment_points = self.control_points[segment_start:segment_end+1]
-                        segment_curve_order = len(segment_points) - 1
-
-                        # 只计算当前分段内锚点的影响力
-                        for i in range(segment_start, segment_end + 1):
-                            local_idx = i - segment_start  # 在分段内的索引
-                            influence = self.bernstein_basis_polynomial(segment_curve_order, local_idx, segment_t)
-                            self.anchor_influences[i] = influence
+            # 计算鼠标与曲线的最近点（只查询阈值范围内的网格）和锚点影响力
+            pos = self.document_pos(event)
+            args = (
+                self.curve_sample_index(), self.curve_tessellation, len(self.control_points),
+                pos.x(), pos.y(), ctrl_highlight_threshold
+            )
+            if self.background_computation:
+                self.background_worker.submit("highlight", self.document_revision, pos, compute_ctrl_highlight, *args)
             else:
-                self.closest_curve_point = None
-                self.anchor_influences = []
+                self.apply_ctrl_highlight(*compute_ctrl_highlight(*args))
         else:
-            self.closest_curve_point = None
-            self.anchor_influences = []
-
-    def draw_ctrl_highlight(self, painter):
-        """绘制 Ctrl 键高亮效果：最近点和锚点影响力圆圈"""
-        if self.is_ctrl_pressed and self.closest_curve_point and not self.is_alt_pressed:
+            self.apply_ctrl_highlight(None, [])
+
+    def apply_ctrl_highlight(self, closest_idx, anchor_influences):
+        """设置 Ctrl 高亮的最近点和锚点影响力"""
+        self.closest_curve_point = self.cached_curve_points[closest_idx] if closest_idx is not None else None
+        if anchor_influences or self.anchor_influences:
+            self.highlight_revision += 1
+        self.anchor_influences = anchor_influences
+
+    def apply_background_result(self, result):
+        """在 GUI 线程中接收后台计算结果，只采用最新提交、且提交后文档没有变化的结果"""
+        if not self.background_worker.is_latest(result) or result.revision != self.document_revision:
+            self.background_results_dropped += 1
+            return
+        if result.error is not None:
+            # 在槽函数中抛出异常会让 PyQt5 直接结束进程，这里只记录错误，保留上一次的预览和高亮
+            print(f"后台计算失败 ({result.channel}): {result.error!r}")
+            traceback.print_exception(type(result.error), result.error, result.error.__traceback__)
+            self.background_results_dropped += 1
+            return
+        if result.channel == "preview":
+            # 预览已关闭时丢弃
+            if self.is_preview_enabled:
+                self.apply_preview_slider(*result.value)
+        elif result.channel == "highlight":
+            if self.is_ctrl_pressed:
+                self.apply_ctrl_highlight(*result.value)
+        self.update_changed_region()
+
+    def draw_ctrl_highlight(self, painter, view, control_points):
+        """绘制 Ctrl 键高亮效果：最近点和锚点影响力圆圈（view 为 osu! 坐标 -> 屏幕坐标的变换，control_points 为屏幕坐标）"""
+        if self.is_ctrl_pressed and self.closest_curve_point is not None and not self.is_alt_pressed:
             # 如果正在拖动，使用 locked_t 计算圆形位置
             if self.is_ctrl_right_dragging and self.locked_t is not None:
                 # 从当前曲线中计算基于 locked_t 的位置
                 t = self.locked_t
-                closest_point = self.calculate_bezier_point(t, self.control_points)
+                closest_point = view.map(self.calculate_bezier_point(t, self.control_points))
             else:
-                closest_point = self.closest_curve_point
+                closest_point = view.map(self.closest_curve_point)
 
             # 绘制最近点（蓝色实心圆）
             painter.setBrush(QBrush(QColor("#495CDA")))
@@ -2389,19 +2409,19 @@ class BezierCurveEditor(QWidget):
 
                     painter.setPen(QPen(ring_color, pen_width))
                     painter.setBrush(Qt.NoBrush)
-                    painter.drawEllipse(self.control_points[i], radius, radius)
+                    painter.drawEllipse(control_points[i], radius, radius)
 
                     # 为影响力最大的点增加小同心圆
                     if i == max_influence_idx:
                         small_radius = radius * 1.6  # 小圆半径为外径的 50%
                         painter.setPen(QPen(ring_color, 3))  # 固定描边粗细为 2
-                        painter.drawEllipse(self.control_points[i], small_radius, small_radius)
+                        painter.drawEllipse(control_points[i], small_radius, small_radius)
 
                     # 筛选 normalized_influence > 0.5 的锚点
                     if normalized_influence > 0.4:
                         anchor_data.append({
                             'index': i,
-                            'point': self.control_points[i],
+                            'point': control_points[i],
                             'radius': radius,
                             'color': ring_color,
                             'alpha': alpha
@@ -2434,49 +2454,42 @@ class BezierCurveEditor(QWidget):
                         painter.setPen(QPen(avg_color, avg_thickness, Qt.DashLine))
                         painter.drawLine(point1, point2)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        # 设置窗口背景颜色
-        painter.fillRect(self.rect(), QColor("#0C0C0C"))
+    def cached_static_layers(self):
+        """
+        返回 (背景图层, 矩形边界图层) 两张 QPixmap，只在窗口大小、rect_scale 或设备像素比变化时重新绘制.
 
+        背景图层包括窗口、左侧面板和绘图区域的底色；矩形边界图层是透明底上的虚线大矩形和实线小矩形，
+        绘制在底图上方.
+        """
+        device_pixel_ratio = self.devicePixelRatioF()
+        key = (self.width(), self.height(), self.rect_scale, device_pixel_ratio)
+        if key == self.static_layers_key:
+            return self.static_layers
+
+        def new_layer(fill_color):
+            layer = QPixmap(int(self.width() * device_pixel_ratio), int(self.height() * device_pixel_ratio))
+            layer.setDevicePixelRatio(device_pixel_ratio)
+            layer.fill(fill_color)
+            return layer
+
+        background_layer = new_layer(QColor("#0C0C0C"))  # 窗口背景颜色
+        painter = QPainter(background_layer)
         # 绘制左侧面板背景
         painter.fillRect(0, 0, 80, self.height(), QColor("#262626"))
-
         # 不再绘制右侧绘图区域背景，避免覆盖曲线
         painter.fillRect(80, 0, self.width() - 80, self.height(), QColor("#202020"))
+        painter.end()
 
-        # 计算窗口中心 - 考虑左侧面板的宽度
-        # center_x = (self.width() - 80) // 2 + 80
+        boundary_layer = new_layer(Qt.transparent)
+        painter = QPainter(boundary_layer)
+        painter.setRenderHint(QPainter.Antialiasing)
         center_x = self.width() // 2
         center_y = self.height() // 2
 
-        # 绘制图片
-        if self.image:
-            painter.setOpacity(self.image_opacity)
-
-            # 计算综合缩放比例： image_scale (滑块控制) * rect_scale (Playfield Boundary 控制)
-            combined_scale = self.image_scale * self.rect_scale
-
-            # 使用综合缩放比例缩放图片
-            scaled_image = self.image.scaled(
-                int(self.image.width() * combined_scale),
-                int(self.image.height() * combined_scale),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            image_x = center_x - scaled_image.width() // 2 + self.image_offset_x
-            image_y = center_y - scaled_image.height() // 2 + self.image_offset_y
-            painter.drawPixmap(image_x, image_y, scaled_image)
-        painter.setOpacity(1.0) # 重置透明度
-
         # 计算大矩形的大小
         rect_width_large = int(self.width() * self.rect_scale)
         rect_height_large = int(rect_width_large * 3 / 4)  # 宽高比例为 4:3
 
-        self.rect_height_large = rect_height_large
-
         # 计算大矩形的左上角坐标
         rect_x_large = center_x - rect_width_large // 2
         rect_y_large = center_y - rect_height_large // 2
@@ -2504,13 +2517,264 @@ class BezierCurveEditor(QWidget):
         painter.setPen(pen_small)
         painter.setBrush(Qt.NoBrush)  # 无填充
         painter.drawRect(rect_x_small, rect_y_small, rect_width_small, rect_height_small)
+        painter.end()
 
-        # 绘制描边和圆环（位于控制点下方）
+        self.static_layers = (background_layer, boundary_layer)
+        self.static_layers_key = key
+        return self.static_layers
+
+    def cached_screen_curve(self, view):
+        """
+        返回映射到屏幕坐标的 (曲线采样点, QPainterPath)，描边和中心线共用同一个路径；没有曲线时返回 (None, None).
+
+        只在曲线缓存刷新（文档版本号变化）或视图变换变化后重建，只有悬停状态变化的重绘直接复用.
+        """
+        if self.screen_curve_key is not None and self.screen_curve_key[0] == self.document_revision \
+                and self.screen_curve_key[1] == view:
+            return self.screen_curve
         if self.cached_curve_points:
-            outline_path = QPainterPath()
-            outline_path.moveTo(self.cached_curve_points[0])
-            for point in self.cached_curve_points[1:]:
-                outline_path.lineTo(point)
+            curve_points = view.map(self.cached_curve_points)
+            curve_path = QPainterPath()
+            curve_path.addPolygon(curve_points)
+            self.screen_curve = (curve_points, curve_path)
+        else:
+            self.screen_curve = (None, None)
+        self.screen_curve_key = (self.document_revision, view)
+        return self.screen_curve
+
+    def scene_state(self):
+        """返回文档和悬停元素以外影响整帧绘制的状态（修饰键、鼠标按键、滑块、窗口大小等），变化时必须整窗重绘"""
+        return (
+            self.is_alt_pressed, self.is_ctrl_pressed, self.is_shift_pressed,
+            self.is_left_button_pressed, self.is_right_button_pressed, self.is_ctrl_right_dragging,
+            self.is_visualization_enabled, self.width(), self.height(), self.rect_scale,
+            self.outline_width, self.outline_opacity, self.image_opacity, self.image_offset_x, self.image_offset_y,
+            self.has_rotation_pivot, self.initial_slider_length,
+        )
+
+    def document_state(self):
+        """返回决定曲线、控制线和锚点绘制位置的状态：文档版本号、视图变换和旋转基准点"""
+        pivot = self.rotation_pivot_point
+        return (self.document_revision, self.view_transform(), None if pivot is None else (pivot.x(), pivot.y()))
+
+    def hover_state(self):
+        """返回只随鼠标悬停变化的绘制状态：预选锚点、高亮控制线、Alt 预览和 Ctrl 高亮；预览曲线和锚点影响力只比较版本号"""
+        def point_key(point):
+            return None if point is None else (point.x(), point.y())
+        return (
+            self.pre_selected_point_index, self.highlighted_segment_index,
+            self.is_preview_enabled, point_key(self.preview_point), self.preview_segment_index, self.preview_revision,
+            point_key(self.closest_curve_point), self.highlight_revision, self.locked_t,
+        )
+
+    def cached_document_bounds(self, view):
+        """
+        返回 (曲线包围矩形, 控制点包围矩形)，都是屏幕坐标的 QRectF，不含线宽；没有曲线或控制点时对应项为 None.
+
+        与 cached_screen_curve 一样只在文档版本号或视图变换变化后重新计算，悬停变化时直接复用.
+        """
+        if self.document_bounds_key is not None and self.document_bounds_key[0] == self.document_revision \
+                and self.document_bounds_key[1] == view:
+            return self.document_bounds
+        curve_points, curve_path = self.cached_screen_curve(view)
+        curve_rect = curve_path.boundingRect() if curve_points else None
+        control_rect = view.map(QPolygonF([QPointF(point) for point in self.control_points])).boundingRect() \
+            if self.control_points else None
+        self.document_bounds = (curve_rect, control_rect)
+        self.document_bounds_key = (self.document_revision, view)
+        return self.document_bounds
+
+    def shift_guide_rect(self, index, view):
+        """返回 Shift 悬停在锚点 index 上时切线或可移动直线在屏幕上占据的矩形，裁剪到窗口范围内"""
+        if index in self.red_anchors:
+            tangent_line = self.tangent_guide_line(index)
+            points, margin = (list(tangent_line) if tangent_line else []), 3
+        else:
+            lines, intersection = self.anchor_guide_lines(index, self.control_points[index])
+            points = [point for line in lines for point in line]
+            if intersection is not None:
+                points.append(intersection)
+            margin = 4  # 交点画笔宽度为 7
+        if not points:
+            return QRectF()
+        rect = view.map(QPolygonF(points)).boundingRect().adjusted(-margin, -margin, margin, margin)
+        # 可移动直线长度为窗口对角线的 4 倍，窗口之外的部分不需要重绘
+        return rect.intersected(QRectF(self.rect()))
+
+    def hover_rect(self):
+        """
+        返回悬停元素在屏幕上占据的矩形（QRectF），没有悬停元素时返回空矩形.
+
+        只映射悬停元素涉及的几个控制点；需要整条曲线或全部控制点的范围时使用 cached_document_bounds.
+        """
+        view = self.view_transform()
+        count = len(self.control_points)
+        rect = QRectF()
+
+        def around(indices_or_points, margin):
+            """控制点索引或屏幕坐标点的包围矩形向外扩展 margin 像素（线宽、圆环半径）"""
+            points = [view.map(QPointF(self.control_points[item])) if isinstance(item, int) else item
+                      for item in indices_or_points]
+            return QPolygonF(points).boundingRect().adjusted(-margin, -margin, margin, margin)
+
+        # 预选锚点：圆环和前后各两条高亮控制线；没有按下 Alt / Ctrl / 左键时所有控制线还会变暗，影响力染色覆盖整条曲线；
+        # Shift 按下时还有切线或可移动直线
+        index = self.pre_selected_point_index
+        if index is not None and index < count:
+            rect = rect.united(around(range(max(index - 2, 0), min(index + 3, count)), 10))
+            if not self.is_alt_pressed and not self.is_ctrl_pressed and not self.is_left_button_pressed:
+                _, control_rect = self.cached_document_bounds(view)
+                rect = rect.united(control_rect.adjusted(-2, -2, 2, 2))
+            if self.is_shift_pressed:
+                rect = rect.united(self.shift_guide_rect(index, view))
+            elif self.is_visualization_enabled and not self.is_alt_pressed and not self.is_ctrl_pressed:
+                curve_rect, _ = self.cached_document_bounds(view)
+                if curve_rect is not None:
+                    margin = self.outline_width * 0.25 + 2
+                    rect = rect.united(curve_rect.adjusted(-margin, -margin, margin, margin))
+
+        # Alt 插入时高亮的控制线及其前后各一条
+        index = self.highlighted_segment_index
+        if index is not None and index + 1 < count:
+            rect = rect.united(around(range(max(index - 1, 0), min(index + 3, count)), 2))
+
+        # Alt 预览：预览点、预览曲线和预览点到相邻锚点的连线
+        if self.is_preview_enabled:
+            preview_point = view.map(self.preview_point) if self.preview_point is not None else None
+            if preview_point is not None:
+                rect = rect.united(around([preview_point], 6))
+            if self.preview_slider_points and self.is_visualization_enabled:
+                rect = rect.united(view.map(self.preview_slider_points).boundingRect().adjusted(-3, -3, 3, 3))
+            if self.preview_segment_index != -1 and preview_point is not None and count:
+                if self.is_ctrl_pressed:
+                    ends = [0 if self.preview_segment_index == 0 else count - 1]
+                else:
+                    ends = list(range(max(self.preview_segment_index - 1, 0), min(self.preview_segment_index + 1, count)))
+                rect = rect.united(around([preview_point] + ends, 2))
+
+        # Ctrl 高亮：最近点的羽化圆（半径最大为基础半径的 2.5 倍）和锚点影响力圆环
+        if self.is_ctrl_pressed and self.closest_curve_point is not None and not self.is_alt_pressed:
+            if self.is_ctrl_right_dragging and self.locked_t is not None:
+                closest_point = view.map(self.calculate_bezier_point(self.locked_t, self.control_points))
+            else:
+                closest_point = view.map(self.closest_curve_point)
+            rect = rect.united(around([closest_point], 41))
+            # 没有影响力的锚点圆环完全透明；影响力全为 0 时第一个锚点按最大影响力绘制
+            if self.anchor_influences and self.is_visualization_enabled and count:
+                influenced = [i for i, influence in zip(range(count), self.anchor_influences) if influence > 0]
+                if len(influenced) == count:
+                    _, control_rect = self.cached_document_bounds(view)
+                    rect = rect.united(control_rect.adjusted(-24, -24, 24, 24))
+                else:
+                    rect = rect.united(around(influenced or [0], 24))
+        return rect
+
+    def document_rect(self, hover_rect=None):
+        """
+        返回文档相关内容在屏幕上占据的矩形（QRectF）：曲线描边、头尾圆环、控制线、锚点、旋转基准点、
+        滑条长度面板和悬停元素. 曲线和控制点的范围来自 cached_document_bounds；已经算好的悬停区域可以由 hover_rect 传入.
+        """
+        view = self.view_transform()
+        rect = self.hover_rect() if hover_rect is None else hover_rect
+        curve_rect, control_rect = self.cached_document_bounds(view)
+        if curve_rect is not None:
+            # 外侧描边宽度为 outline_width * 9 / 8，头尾圆环半径为 outline_width * 17 / 32
+            margin = self.outline_width * 0.6 + 2
+            rect = rect.united(curve_rect.adjusted(-margin, -margin, margin, margin))
+        if control_rect is not None:
+            rect = rect.united(control_rect.adjusted(-12, -12, 12, 12))
+        if self.has_rotation_pivot and (self.is_alt_pressed or self.is_right_button_pressed):
+            pivot = self.camera_transform().map(self.rotation_pivot_point)
+            rect = rect.united(QRectF(pivot.x() - 12, pivot.y() - 12, 24, 24))
+        _, panel_rect = self.slider_length_panel(QFontMetrics(QApplication.font(), self))
+        if panel_rect is not None:
+            rect = rect.united(QRectF(panel_rect))
+        return rect
+
+    def slider_length_panel(self, metrics):
+        """
+        返回左下角滑条长度面板的 (比值文本, 面板矩形)，不显示面板时返回 (None, None).
+
+        面板左侧是两个按钮，右侧是标题和比值两行文字，宽度随文字变化；paintEvent 和局部重绘共用这里的布局.
+        """
+        if not (self.cached_curve_points and len(self.cached_curve_points) > 1 and self.initial_slider_length > 0):
+            return None, None
+        ratio = int(self.calculate_curve_length()) / int(self.initial_slider_length)
+        length_text = f"{ratio:.2f}x"
+        padding = 8
+        button_size = 34
+        title_width = metrics.width(self.msg_slider_length_ratio)
+        value_width = metrics.width(length_text)
+        text_height = metrics.height()
+        total_width = button_size * 2 + padding * 3 + max(title_width, value_width) + 12
+        total_height = max(text_height * 2 + padding * 2, button_size + padding * 2)
+        # 左侧面板宽度为80，稍微偏移一点
+        return length_text, QRect(90, self.height() - total_height - 10, total_width, total_height)
+
+    def current_frame(self):
+        """返回当前的 (场景状态, 文档状态, 悬停状态, 悬停区域, 文档区域)，paintEvent 结束时记录为 painted_frame"""
+        hover_rect = self.hover_rect()
+        return self.scene_state(), self.document_state(), self.hover_state(), hover_rect, self.document_rect(hover_rect)
+
+    def update_changed_region(self):
+        """
+        只请求重绘上一次绘制以来发生变化的区域，代替整窗的 update().
+
+        只有悬停元素变化时重绘新旧悬停区域；文档或手势变换变化时重绘新旧文档区域；场景状态变化时整窗重绘；
+        什么都没变化时不重绘. 多次请求在下一次绘制前由 Qt 合并为一个区域.
+        """
+        if self.painted_frame is None:
+            self.update()
+            return
+        scene_state, document_state, hover_state, hover_rect, document_rect = self.painted_frame
+        if self.scene_state() != scene_state:
+            self.update()
+            return
+        if self.document_state() != document_state:
+            old_rect, new_rect = document_rect, self.document_rect()
+        elif self.hover_state() != hover_state:
+            old_rect, new_rect = hover_rect, self.hover_rect()
+        else:
+            return
+        # 抗锯齿的边缘可能超出几何包围矩形半个像素，多留 2 像素
+        self.update(old_rect.united(new_rect).toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # 背景和矩形边界只在窗口大小或矩形大小变化时重新绘制，每帧直接贴图
+        background_layer, boundary_layer = self.cached_static_layers()
+        painter.drawPixmap(0, 0, background_layer)
+
+        # 计算窗口中心 - 考虑左侧面板的宽度
+        # center_x = (self.width() - 80) // 2 + 80
+        center_x = self.width() // 2
+        center_y = self.height() // 2
+
+        # 绘制图片
+        if self.image:
+            painter.setOpacity(self.image_opacity)
+
+            scaled_image = self.scaled_background_image()
+            image_width, image_height = self.scaled_image_size
+            image_x = center_x - image_width // 2 + self.image_offset_x
+            image_y = center_y - image_height // 2 + self.image_offset_y
+            painter.drawPixmap(image_x, image_y, scaled_image)
+        painter.setOpacity(1.0) # 重置透明度
+
+        # 矩形边界绘制在图片上方
+        painter.drawPixmap(0, 0, boundary_layer)
+        self.rect_height_large = int(int(self.width() * self.rect_scale) * 3 / 4)  # 与矩形边界图层中的大矩形一致
+
+        # 曲线相关的内容在 osu! 坐标中，绘制前映射到屏幕坐标（旋转 / 平移手势进行中时先应用手势变换）；
+        # 只映射点的位置，线宽和半径仍然以屏幕像素为单位
+        view = self.view_transform()
+        control_points = [view.map(QPointF(point)) for point in self.control_points]
+        curve_points, curve_path = self.cached_screen_curve(view)
+
+        # 绘制描边和圆环（位于控制点下方）
+        if curve_points:
 
             # 绘制外侧白色描边
             outer_width = self.outline_width + self.outline_width / 8
@@ -2518,18 +2782,18 @@ class BezierCurveEditor(QWidget):
             outer_color.setAlphaF(self.outline_opacity)  # 使用描边的透明度
             painter.setPen(QPen(outer_color, outer_width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
             painter.setBrush(Qt.NoBrush)
-            painter.drawPath(outline_path)
+            painter.drawPath(curve_path)
 
             # 绘制内侧粉色描边
             inner_color = QColor("#F766A7")
             inner_color.setAlphaF(self.outline_opacity)  # 使用描边的透明度
             painter.setPen(QPen(inner_color, self.outline_width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
             painter.setBrush(Qt.NoBrush)
-            painter.drawPath(outline_path)
+            painter.drawPath(curve_path)
 
             # 绘制头尾空心白色圆环
-            start_point = self.control_points[0]
-            end_point = self.control_points[-1]
+            start_point = control_points[0]
+            end_point = control_points[-1]
             ring_radius = self.outline_width * (17 / 32)
 
             # 计算圆环的线宽为半径的 1/8
@@ -2552,8 +2816,8 @@ class BezierCurveEditor(QWidget):
         # 绘制控制线
         painter.setOpacity(0.1 if self.is_alt_pressed or self.is_ctrl_pressed or self.is_left_button_pressed or self.pre_selected_point_index is not None else 0.6)
         painter.setPen(QPen(QColor("#FFFFFF"), 1, Qt.DashLine))
-        for i in range(len(self.control_points) - 1):
-            painter.drawLine(self.control_points[i], self.control_points[i + 1])
+        for i in range(len(control_points) - 1):
+            painter.drawLine(control_points[i], control_points[i + 1])
         painter.setOpacity(1.0) # 恢复透明度
         # 绘制高亮显示的控制线段
         if self.pre_selected_point_index is not None and len(self.control_points) > 1:  # 检查是否有预选锚点且控制点足够
@@ -2566,34 +2830,34 @@ class BezierCurveEditor(QWidget):
             # 绘制相邻的前一条线段 (如果存在)
             if pre_selected_idx > 0:
                 painter.setPen(QPen(highlight_color, 2, Qt.DashLine))  # 高亮粗虚线
-                start_point_prev = self.control_points[pre_selected_idx - 1]
-                end_point_prev = self.control_points[pre_selected_idx]
+                start_point_prev = control_points[pre_selected_idx - 1]
+                end_point_prev = control_points[pre_selected_idx]
                 painter.drawLine(start_point_prev, end_point_prev)
 
             # 绘制相邻的后一条线段 (如果存在)
             if pre_selected_idx < len(self.control_points) - 1:
                 painter.setPen(QPen(highlight_color, 2, Qt.DashLine))  # 高亮粗虚线
-                start_point_next = self.control_points[pre_selected_idx]
-                end_point_next = self.control_points[pre_selected_idx + 1]
+                start_point_next = control_points[pre_selected_idx]
+                end_point_next = control_points[pre_selected_idx + 1]
                 painter.drawLine(start_point_next, end_point_next)
 
             # 绘制前第二条线段 (如果存在)
             if pre_selected_idx > 1:
                 painter.setPen(QPen(secondary_color, 2, Qt.DashLine))  # 次高亮细虚线
-                start_point_prev_second = self.control_points[pre_selected_idx - 2]
-                end_point_prev_second = self.control_points[pre_selected_idx - 1]
+                start_point_prev_second = control_points[pre_selected_idx - 2]
+                end_point_prev_second = control_points[pre_selected_idx - 1]
                 painter.drawLine(start_point_prev_second, end_point_prev_second)
 
             # 绘制后第二条线段 (如果存在)
             if pre_selected_idx < len(self.control_points) - 2:
                 painter.setPen(QPen(secondary_color, 2, Qt.DashLine))  # 次高亮细虚线
-                start_point_next_second = self.control_points[pre_selected_idx + 1]
-                end_point_next_second = self.control_points[pre_selected_idx + 2]
+                start_point_next_second = control_points[pre_selected_idx + 1]
+                end_point_next_second = control_points[pre_selected_idx + 2]
                 painter.drawLine(start_point_next_second, end_point_next_second)
 
         # 绘制控制点
         painter.setOpacity(1.0)
-        for i, point in enumerate(self.control_points):
+        for i, point in enumerate(control_points):
             # 根据锚点类型设置颜色（红色锚点或白色锚点）
             if i in self.red_anchors:
                 painter.setPen(QPen(QColor("#FF0000"), 4))  # 红色锚点
@@ -2601,23 +2865,19 @@ class BezierCurveEditor(QWidget):
 
                 # 当Shift按下且鼠标悬停在红锚点上时，显示切线方向
                 if self.is_shift_pressed and i == self.pre_selected_point_index:
-                    tangent_dir = self.calculate_tangent_line(i)
-                    if tangent_dir:
-                        # 绘制长度为20的绿色线段表示切线方向
-                        line_length = 200
-                        start_x = point.x() - tangent_dir[0] * line_length
-                        start_y = point.y() - tangent_dir[1] * line_length
-                        end_x = point.x() + tangent_dir[0] * line_length
-                        end_y = point.y() + tangent_dir[1] * line_length
+                    tangent_line = self.tangent_guide_line(i)
+                    if tangent_line:
+                        # 绘制绿色线段表示切线方向（在 osu! 坐标中计算端点再映射到屏幕）
+                        start, end = tangent_line
                         painter.setPen(QPen(QColor("#00FF00"), 3, Qt.DashLine))  # 绿色线段
-                        painter.drawLine(QPoint(int(start_x), int(start_y)), QPoint(int(end_x), int(end_y)))
+                        painter.drawLine(view.map(start), view.map(end))
             else:
                 painter.setPen(QPen(QColor("#FFFFFF"), 5))  # 白色锚点
 
                 # 当Shift按下且鼠标悬停在白锚点上时，显示可移动直线
                 if self.is_shift_pressed and i == self.pre_selected_point_index:
                     # 使用统一的函数计算并绘制锚点直线
-                    self.calculate_and_draw_anchor_lines(painter, i, point)
+                    self.calculate_and_draw_anchor_lines(painter, i, self.control_points[i], view)
 
             painter.drawPoint(point)
             if i == self.pre_selected_point_index:
@@ -2640,24 +2900,20 @@ class BezierCurveEditor(QWidget):
                 painter.restore()  # 恢复画笔状态
 
         # 绘制全局贝塞尔曲线（蓝色实线）
-        if self.cached_curve_points:
-            path = QPainterPath()
-            path.moveTo(self.cached_curve_points[0])
-            for point in self.cached_curve_points[1:]:
-                path.lineTo(point)
+        if curve_points:
             painter.setPen(QPen(QColor("#0000FF"), 2))
-            painter.drawPath(path)
+            painter.drawPath(curve_path)
 
         if self.is_visualization_enabled: #  <--  新增：总开关，控制可视化效果是否绘制
             if not self.is_alt_pressed and not self.is_ctrl_pressed and not self.is_shift_pressed: # 非 Alt 状态下
                 # 绘制影响力权重染色
                 painter.setOpacity(0.1 if self.is_left_button_pressed else 0.5) # 设置染色层的整体透明度
-                self.draw_influence_weights(painter)
+                self.draw_influence_weights(painter, curve_points)
                 painter.setOpacity(1.0) # 恢复透明度
 
-        self.draw_ctrl_highlight(painter) # 调用 Ctrl 高亮绘制函数
+        self.draw_ctrl_highlight(painter, view, control_points) # 调用 Ctrl 高亮绘制函数
 
-        if self.highlighted_segment_index is not None and self.highlighted_segment_index + 1 < len(self.control_points): # 检查是否有需要高亮显示的线段
+        if self.highlighted_segment_index is not None and self.highlighted_segment_index + 1 < len(control_points): # 检查是否有需要高亮显示的线段
             highlighted_index = self.highlighted_segment_index
             adjacent_color = QColor("#FEFD02")  # 相邻线段颜色
             adjacent_color.setAlphaF(0.7)
@@ -2665,44 +2921,49 @@ class BezierCurveEditor(QWidget):
             # 绘制相邻的前一条线段 (如果存在)
             if highlighted_index > 0:
                 painter.setPen(QPen(adjacent_color, 2, Qt.DashLine))
-                start_point_adjacent_prev = self.control_points[highlighted_index - 1]
-                end_point_adjacent_prev = self.control_points[highlighted_index]
+                start_point_adjacent_prev = control_points[highlighted_index - 1]
+                end_point_adjacent_prev = control_points[highlighted_index]
                 painter.drawLine(start_point_adjacent_prev, end_point_adjacent_prev)
 
             # 绘制相邻的后一条线段 (如果存在)
-            if highlighted_index < len(self.control_points) - 2: # 注意索引范围
+            if highlighted_index < len(control_points) - 2: # 注意索引范围
                 painter.setPen(QPen(adjacent_color, 2, Qt.DashLine))
-                start_point_adjacent_next = self.control_points[highlighted_index + 1]
-                end_point_adjacent_next = self.control_points[highlighted_index + 2]
+                start_point_adjacent_next = control_points[highlighted_index + 1]
+                end_point_adjacent_next = control_points[highlighted_index + 2]
                 painter.drawLine(start_point_adjacent_next, end_point_adjacent_next)
 
         # --- 绘制预览效果 ---
         if self.is_preview_enabled:
+            preview_point = view.map(self.preview_point) if self.preview_point is not None else None
             # 添加锚点时的预览点
-            if self.preview_point is not None:
+            if preview_point is not None:
                 # 根据插入位置选择颜色（Ctrl 添加起点/终点用绿色）
                 if self.is_ctrl_pressed:
                     painter.setBrush(QBrush(QColor("#00FF00")))  # 绿色表示起点/终点
                 else:
                     painter.setBrush(QBrush(QColor("#fefd02")))  # 黄色表示中间点
                 painter.setPen(Qt.NoPen)
-                painter.drawEllipse(self.preview_point, 5, 5)
+                painter.drawEllipse(preview_point, 5, 5)
 
             # 绘制预览曲线（删除或添加时都显示）
             if self.preview_slider_points and self.is_visualization_enabled:
+                preview_slider_polygon = view.map(self.preview_slider_points)
+                preview_slider_points = polygon_buffer(preview_slider_polygon)  # 与 preview_slider_polygon 共享内存
                 painter.setBrush(Qt.NoBrush)
                 max_offset = max(self.preview_offsets) if self.preview_offsets and any(o > 0 for o in self.preview_offsets) else 1.0
 
-                for i in range(1, len(self.preview_slider_points)):
-                    offset = self.preview_offsets[i] if i < len(self.preview_offsets) else self.preview_offsets[-1]
-                    # 删除预览时 max_color 为 #FF0000 添加预览时为 #fefd02
-                    max_color = "#FF0000" if self.preview_point is None else "#fefd02"
-                    color = self.interpolate_color(offset, max_offset, max_color=max_color,)
-                    pen = QPen(color)
-                    pen.setWidthF(3.5)
-                    pen.setDashPattern([2, 2])
-                    painter.setPen(pen)
-                    painter.drawLine(self.preview_slider_points[i - 1], self.preview_slider_points[i])
+                # 删除预览时 max_color 为 #FF0000 添加预览时为 #fefd02
+                max_color = "#FF0000" if preview_point is None else "#fefd02"
+                _, preview_pens = self.color_lut(max_color=max_color)
+                # 第 i 段（点 i - 1 到点 i）的颜色由点 i 的偏移量决定，超出偏移量列表的部分沿用最后一个偏移量
+                offsets = np.asarray(self.preview_offsets, dtype=np.float64)
+                offsets = np.pad(offsets, (0, max(len(preview_slider_points) - len(offsets), 0)), mode="edge")
+                segment_colors = self.color_lut_index(offsets[1:len(preview_slider_points)], max_offset)
+                # 同一颜色级别的线段合并成一次 drawLines 调用，每段仍单独起始虚线样式
+                segment_lines = np.stack((preview_slider_points[:-1], preview_slider_points[1:]), axis=1)
+                for color_index in np.unique(segment_colors).tolist():
+                    painter.setPen(preview_pens[color_index])
+                    painter.drawLines(array_to_polygon(segment_lines[segment_colors == color_index].reshape(-1, 2)))
 
             if self.preview_segment_index != -1:
                 pen = QPen(QColor("#00FF00" if self.is_ctrl_pressed else "#fefd02"))
@@ -2712,36 +2973,34 @@ class BezierCurveEditor(QWidget):
                 if self.is_ctrl_pressed:
                     # 起点或终点连接线
                     if self.preview_segment_index == 0:
-                        p1 = self.control_points[0]
+                        p1 = control_points[0]
                     else:
-                        p1 = self.control_points[-1]
+                        p1 = control_points[-1]
                 else:
-                    p1 = self.control_points[self.preview_segment_index - 1]
-                    p2 = self.control_points[self.preview_segment_index]
-                    painter.drawLine(self.preview_point, p2)
-                painter.drawLine(self.preview_point, p1)
+                    p1 = control_points[self.preview_segment_index - 1]
+                    p2 = control_points[self.preview_segment_index]
+                    painter.drawLine(preview_point, p2)
+                painter.drawLine(preview_point, p1)
 
         # 【新增：绘制旋转基准点】
         if self.has_rotation_pivot and (self.is_alt_pressed or self.is_right_button_pressed): # Alt 或 右键按下时显示
             painter.setPen(QPen(Qt.green, 2)) # 绿色画笔
-            pivot_x, pivot_y = self.rotation_pivot_point.x(), self.rotation_pivot_point.y()
+            pivot = self.camera_transform().map(self.rotation_pivot_point).toPoint()  # 基准点是旋转的不动点，不受手势变换影响
+            pivot_x, pivot_y = pivot.x(), pivot.y()
             cross_size = 10 # 十字大小
             painter.drawLine(pivot_x - cross_size, pivot_y, pivot_x + cross_size, pivot_y) # 横线
             painter.drawLine(pivot_x, pivot_y - cross_size, pivot_x, pivot_y + cross_size) # 竖线
 
 
         # 在窗口底部中间显示滑条长度信息
-        if self.cached_curve_points and len(self.cached_curve_points) > 1 and self.initial_slider_length > 0:
+        painter.setFont(QApplication.font())
+        metrics = painter.fontMetrics()
+        length_text, panel_rect = self.slider_length_panel(metrics)
+        if panel_rect is not None:
             self.current_slider_length = self.calculate_curve_length()
-            ratio = int(self.current_slider_length) / int(self.initial_slider_length)
-            length_text = f"{ratio:.2f}x"
 
-            # 设置字体和计算文本尺寸
-            painter.setFont(QApplication.font())
-            metrics = painter.fontMetrics()
+            # 计算文本尺寸
             title_text = self.msg_slider_length_ratio
-            title_width = metrics.width(title_text)
-            value_width = metrics.width(length_text)
             text_height = metrics.height()
             padding = 8
 
@@ -2785,13 +3044,9 @@ class BezierCurveEditor(QWidget):
                 self.scale_to_initial_button.setIcon(QIcon(icon_path))
                 self.scale_to_initial_button.setIconSize(QSize(24, 24))
 
-            # 计算背景矩形的尺寸和位置 - 移动到左下角
-            rect_x = 90  # 左侧面板宽度为80，稍微偏移一点            
+            # 背景矩形的尺寸和位置 - 左下角
+            rect_x, rect_y, total_width, total_height = panel_rect.x(), panel_rect.y(), panel_rect.width(), panel_rect.height()
             text_x = rect_x + button_size * 2 + padding * 2  # 文字位置从两个按钮后开始
-            total_width = button_size * 2 + padding * 3 + max(title_width, value_width) + 12
-            total_height = max(text_height * 2 + padding * 2, button_size + padding * 2)
-
-            rect_y = self.height() - total_height - 10
 
             # 更新按钮位置
             button_y = rect_y + (total_height - button_size) // 2
@@ -2813,9 +3068,10 @@ class BezierCurveEditor(QWidget):
             painter.drawText(text_x + 9, rect_y + padding + text_height * 2 + 4, length_text)
 
         painter.end()
+        self.painted_frame = self.current_frame()
 
-    def draw_influence_weights(self, painter):
-        """绘制影响力权重染色（黄色圆圈），支持红色锚点分段"""
+    def draw_influence_weights(self, painter, curve_points=None):
+        """绘制影响力权重染色（黄色圆圈），支持红色锚点分段；curve_points 为映射到屏幕坐标的曲线采样点，默认不映射"""
         if self.pre_selected_point_index is None:
             return
 
@@ -2828,139 +3084,51 @@ class BezierCurveEditor(QWidget):
         influence_color = QColor("#FFFF00")
         dragged_point_index = self.pre_selected_point_index
 
-        # 初始化变量，避免引用前未定义的错误
-        current_segment = None
-        current_segment_range = None
-        segment_influence_weights = []
-
-        # 如果没有红色锚点，按原方式计算影响力权重
-        if not self.red_anchors:
-            curve_order = len(self.control_points) - 1
-
-            # 计算每段影响力权重
-            for t in range(0, self.curve_segments):
-                t_start = t / self.curve_segments
-                t_end = (t + 1) / self.curve_segments
-                t_mid = (t_start + t_end) / 2
-
-                if dragged_point_index == 0:
-                    t_value_for_weight = t_start
-                elif dragged_point_index == len(self.control_points) - 1:
-                    t_value_for_weight = t_end
-                else:
-                    t_value_for_weight = t_mid
-
-                influence_weight = self.bernstein_basis_polynomial(curve_order, dragged_point_index, t_value_for_weight)
-                segment_influence_weights.append({'index': t, 'weight': influence_weight})
-        else:
-            # 按照红色锚点分段计算影响力权重
-            segments = []
-            start_idx = 0
-            segment_ranges = []
-            start_point_idx = 0
-
-            # 按索引排序红色锚点
-            sorted_red_anchors = sorted(self.red_anchors)
-
-            # 处理所有分段
-            for red_idx in sorted_red_anchors:
-                if red_idx > start_idx:  # 确保有足够的点形成一段
-                    segments.append((start_idx, red_idx))
-                    segment_points = self.control_points[start_idx:red_idx+1]
-                    if len(segment_points) >= 2:  # 确保分段至少有两个点
-                        segment_point_count = self.curve_segments + 1
-                        segment_ranges.append((start_point_idx, start_point_idx + segment_point_count - 1))
-                        start_point_idx += segment_point_count - 1  # 减1是因为相邻分段的端点重合
-                start_idx = red_idx
-
-            # 处理最后一段（最后一个红色锚点到结束）
-            if start_idx < len(self.control_points) - 1:
-                segments.append((start_idx, len(self.control_points) - 1))
-                segment_points = self.control_points[start_idx:]
-                if len(segment_points) >= 2:  # 确保分段至少有两个点
-                    segment_point_count = self.curve_segments + 1
-                    segment_ranges.append((start_point_idx, start_point_idx + segment_point_count - 1))
-
-            # 初始化影响力权重列表，与缓存曲线点数量一致
-            total_points = len(self.cached_curve_points) if self.cached_curve_points else self.curve_segments
-            for t in range(0, total_points):
-                segment_influence_weights.append({'index': t, 'weight': 0.0})
-
-            # 找出拖动点所在的分段
-            found_segment = False
-            for i, (start, end) in enumerate(segments):
-                if start <= dragged_point_index <= end:
-                    current_segment = (start, end)
-                    if i < len(segment_ranges):
-                        current_segment_range = segment_ranges[i]
-                    found_segment = True
-                    break
-
-            # 如果找到了拖动点所在的分段，计算该分段的影响力权重
-            if found_segment and current_segment and current_segment_range:
-                segment_start, segment_end = current_segment
-                range_start, range_end = current_segment_range
-                segment_points = self.control_points[segment_start:segment_end+1]
-                segment_curve_order = len(segment_points) - 1
-                segment_dragged_index = dragged_point_index - segment_start
-
-                # 只计算当前分段内的曲线点的影响力权重
-                for t in range(0, total_points):
-                    # 检查当前点是否在当前分段范围内
-                    if range_start <= t <= range_end:
-                        local_t = (t - range_start) / (range_end - range_start) if range_end > range_start else 0
-
-                        if segment_dragged_index == 0:
-                            t_value_for_weight = local_t * 0.1  # 靠近起点
-                        elif segment_dragged_index == len(segment_points) - 1:
-                            t_value_for_weight = 0.9 + local_t * 0.1  # 靠近终点
-                        else:
-                            t_value_for_weight = local_t
-
-                        # 只计算当前分段内的影响力权重
-                        if 0 <= segment_dragged_index <= segment_curve_order:
-                            influence_weight = self.bernstein_basis_polynomial(segment_curve_order, segment_dragged_index, t_value_for_weight)
-                            # 将计算的权重值赋给对应的曲线点
-                            segment_influence_weights[t]['weight'] = influence_weight
-
-        # 确保segment_influence_weights不为空
-        if not segment_influence_weights:
+        if not self.cached_curve_points:
             return
 
+        # 每个曲线采样点的影响力权重，与缓存曲线点一一对应
+        segment_influence_weights = np.zeros(len(self.cached_curve_points))
+
+        # 找出拖动点所在的分段；拖动点不是红锚点也不是首尾点，所以一定位于某个分段内部
+        segment_idx = self.red_segment_index.segment_of_anchor(dragged_point_index)
+        if segment_idx is not None:
+            # 只填充当前分段内曲线点的影响力权重
+            segment_start, _ = self.red_segment_index.segments[segment_idx]
+            range_start, range_end = self.red_segment_index.sample_ranges[segment_idx]
+            segment_influence_weights[range_start:range_end + 1] = self.curve_tessellation.segment_weights(
+                segment_idx, dragged_point_index - segment_start
+            )
+
         # 找出最大影响力权重，用于归一化
-        max_influence_weight = max(segment['weight'] for segment in segment_influence_weights) if segment_influence_weights else 0
+        max_influence_weight = segment_influence_weights.max()
 
         # 如果没有有效的影响力权重，直接返回
         if max_influence_weight <= 0:
             return
 
-        # 绘制染色圆圈 - 修改为绘制所有曲线点
-        if self.cached_curve_points:
-            # 新增：确保绘制所有曲线点，而不仅仅是当前分段
-            for t in range(len(self.cached_curve_points)):
-                if t < len(segment_influence_weights):
-                    influence_weight = segment_influence_weights[t]['weight']
-                    normalized_influence_weight = influence_weight / max_influence_weight
-
-                    # 只绘制有影响力的点（优化性能）
-                    if normalized_influence_weight > 0.01:
-                        # 透明度映射
-                        max_alpha = 0.8
-                        min_alpha = 0
-                        alpha = min_alpha + (max_alpha - min_alpha) * (normalized_influence_weight ** 2)
-                        influence_color.setAlphaF(alpha)
-
-                        # 半径映射
-                        max_radius = self.outline_width * 0.25
-                        min_radius = 0
-                        radius = min_radius + (max_radius - min_radius) * (normalized_influence_weight ** 2)
-
-                        painter.setBrush(QBrush(influence_color))
-                        painter.setPen(Qt.NoPen)
-
-                        # 使用缓存的曲线点
-                        point_mid = self.cached_curve_points[t]
-                        painter.drawEllipse(point_mid, radius, radius)
+        # 半径和透明度都与归一化权重的平方成正比
+        max_radius = self.outline_width * 0.25
+        max_alpha = 0.8
+        if max_radius <= 0:
+            return
+        if curve_points is None:
+            curve_points = self.cached_curve_points
+
+        # 只绘制有影响力的点（归一化权重 > 0.01），把权重的平方量化为 INFLUENCE_WEIGHT_LEVELS 级，
+        # 同一级的圆圈颜色和半径相同，用 RoundCap 画笔的 drawPoints 一次画完（点的直径等于画笔宽度）
+        normalized_influence_weights = segment_influence_weights / max_influence_weight
+        visible = np.flatnonzero(normalized_influence_weights > 0.01)
+        levels = np.minimum(
+            (normalized_influence_weights[visible] ** 2 * INFLUENCE_WEIGHT_LEVELS).astype(int), INFLUENCE_WEIGHT_LEVELS - 1
+        )
+        screen_points = polygon_buffer(curve_points)
+        painter.setBrush(Qt.NoBrush)
+        for level in np.unique(levels).tolist():
+            strength = (level + 0.5) / INFLUENCE_WEIGHT_LEVELS  # 取这一级的中间值
+            influence_color.setAlphaF(max_alpha * strength)
+            painter.setPen(QPen(influence_color, 2 * max_radius * strength, Qt.SolidLine, Qt.RoundCap))
+            painter.drawPoints(array_to_polygon(screen_points[visible[levels == level]]))
 
     def get_insert_position(self, pos):
         """根据鼠标位置判断插入起点还是终点，返回插入索引"""
@@ -2972,122 +3140,57 @@ class BezierCurveEditor(QWidget):
         dist_to_end = self.distance(pos, end_point)
         return 0 if dist_to_start < dist_to_end else len(self.control_points)
 
+    def apply_preview_slider(self, preview_slider_points, preview_offsets):
+        """设置预览曲线的采样点和偏移量，预览曲线变化时预览版本号加 1"""
+        if preview_slider_points is None and self.preview_slider_points is None:
+            return
+        self.preview_slider_points = preview_slider_points
+        self.preview_offsets = preview_offsets
+        self.preview_revision += 1
+
     def update_preview_slider(self, event):
         """更新预览滑条效果，根据 Alt + Ctrl 或 Alt 键触发不同功能"""
         if len(self.control_points) < 2:
             self.is_preview_enabled = False
             self.preview_point = None
-            self.preview_slider_points = None
-            self.preview_offsets = None
+            self.apply_preview_slider(None, None)
             self.preview_segment_index = -1
             self.highlighted_segment_index = None
             return
 
+        pos = self.document_pos(event)  # 鼠标位置（osu! 坐标）
         # 优先检查 Alt + Ctrl 组合：添加头尾锚点
         if self.is_alt_pressed and self.is_ctrl_pressed:
             # Alt + Ctrl：添加起点或终点锚点
-            insert_index = self.get_insert_position(event.pos())
+            insert_index = self.get_insert_position(pos)
             if insert_index is not None:
                 if insert_index == 0:
                     self.preview_segment_index = 0
                 else:
                     self.preview_segment_index = len(self.control_points) - 1
 
-                self.preview_point = event.pos()
+                self.preview_point = pos
                 self.is_preview_enabled = True
                 self.highlighted_segment_index = None
 
                 # 计算预览曲线
                 preview_control_points = self.control_points[:]
                 preview_control_points.insert(insert_index, self.preview_point)
-                self.preview_slider_points = []
-                self.preview_offsets = []
-
-                # 如果没有红色锚点，按原方式计算预览曲线
-                if not self.red_anchors:
-                    for t in range(0, self.curve_segments + 1):
-                        t_normalized = t / self.curve_segments
-                        point = self.calculate_bezier_point(t_normalized, preview_control_points)
-                        self.preview_slider_points.append(point)
-                        if self.cached_curve_points and len(self.cached_curve_points) > t:
-                            orig_point = self.cached_curve_points[t]
-                            offset = self.distance(point, orig_point)
-                        else:
-                            offset = 0
-                        self.preview_offsets.append(offset)
-                else:
-                    # 按照红色锚点分段计算预览曲线
-                    # 更新红色锚点索引，考虑插入新点后的索引变化
-                    preview_red_anchors = set()
-                    for idx in self.red_anchors:
-                        if idx >= insert_index:
-                            preview_red_anchors.add(idx + 1)  # 插入点后的红色锚点索引+1
-                        else:
-                            preview_red_anchors.add(idx)  # 插入点前的红色锚点索引不变
-
-                    # 首先将控制点按照红色锚点分段
-                    segments = []
-                    start_idx = 0
-
-                    # 按索引排序红色锚点
-                    sorted_red_anchors = sorted(preview_red_anchors)
-
-                    # 处理所有分段
-                    for red_idx in sorted_red_anchors:
-                        if red_idx > start_idx:  # 确保有足够的点形成一段
-                            segments.append(preview_control_points[start_idx:red_idx+1])
-                        start_idx = red_idx
-
-                    # 处理最后一段（最后一个红色锚点到结束）
-                    if start_idx < len(preview_control_points) - 1:
-                        segments.append(preview_control_points[start_idx:])
-
-                    # 为每个分段计算贝塞尔曲线点
-                    for segment in segments:
-                        if len(segment) >= 2:  # 确保分段至少有两个点
-                            # 计算当前分段的曲线点
-                            segment_points = []
-                            for t in range(0, self.curve_segments + 1):
-                                t_normalized = t / self.curve_segments
-                                point = self.calculate_bezier_point(t_normalized, segment)
-                                segment_points.append(point)
-
-                            # 如果不是第一段，移除第一个点以避免重复
-                            if self.preview_slider_points and segment_points:
-                                segment_points = segment_points[1:]
-
-                            # 将当前分段的点添加到预览曲线中
-                            self.preview_slider_points.extend(segment_points)
-
-                    # 计算与原始曲线的偏移量
-                    for i, point in enumerate(self.preview_slider_points):
-                        if self.cached_curve_points and i < len(self.cached_curve_points):
-                            orig_point = self.cached_curve_points[i]
-                            offset = self.distance(point, orig_point)
-                        else:
-                            offset = 0
-                        self.preview_offsets.append(offset)
+                # 更新红色锚点索引，考虑插入新点后的索引变化
+                preview_red_anchors = {idx + 1 if idx >= insert_index else idx for idx in self.red_anchors}
+                self.compute_preview_curve(preview_control_points, preview_red_anchors, inserted=insert_index,
+                                           cursor_pos=pos)
             else:
                 self.is_preview_enabled = False
                 self.preview_point = None
-                self.preview_slider_points = None
-                self.preview_offsets = None
+                self.apply_preview_slider(None, None)
                 self.preview_segment_index = -1
                 self.highlighted_segment_index = None
 
         # 仅 Alt 键：添加中间锚点或删除预选锚点
         elif self.is_alt_pressed:
-            min_distance = float('inf')
-            insert_segment_index = -1
-            distance_threshold = self.rect_height_large * 0.11 if self.rect_height_large > 0 else 50
-
-            for i in range(len(self.control_points) - 1):
-                start_point = self.control_points[i]
-                end_point = self.control_points[i + 1]
-                distance = self.point_to_line_distance(event.pos(), start_point, end_point)
-                if distance < min_distance:
-                    min_distance = distance
-                    insert_segment_index = i
+            distance_threshold = self.document_length(self.rect_height_large * 0.11 if self.rect_height_large > 0 else 50)
+            insert_segment_index, min_distance = self.nearest_control_edge(pos, distance_threshold)
 
             if self.pre_selected_point_index is not None and len(self.control_points) > 2:
                 # 预览删除预选锚点
@@ -3098,164 +3201,39 @@ class BezierCurveEditor(QWidget):
 
                 preview_control_points = self.control_points[:]
 
-                # 更新红色锚点索引，考虑删除点后的索引变化
+                # 更新红色锚点索引，考虑删除点后的索引变化（删除的红色锚点不再保留）
                 preview_red_anchors = set()
                 for idx in self.red_anchors:
                     if idx == self.pre_selected_point_index:
-                        # 如果删除的是红色锚点，不添加到新集合中
                         continue
                     elif idx > self.pre_selected_point_index:
-                        # 删除点后的红色锚点索引-1
                         preview_red_anchors.add(idx - 1)
                     else:
-                        # 删除点前的红色锚点索引不变
                         preview_red_anchors.add(idx)
 
                 # 删除预选锚点
                 preview_control_points.pop(self.pre_selected_point_index)
-
-                self.preview_slider_points = []
-                self.preview_offsets = []
-
-                # 如果没有红色锚点，按原方式计算预览曲线
-                if not preview_red_anchors:
-                    for t in range(0, self.curve_segments + 1):
-                        t_normalized = t / self.curve_segments
-                        point = self.calculate_bezier_point(t_normalized, preview_control_points)
-                        self.preview_slider_points.append(point)
-                        if self.cached_curve_points and len(self.cached_curve_points) > t:
-                            orig_point = self.cached_curve_points[t]
-                            offset = self.distance(point, orig_point)
-                        else:
-                            offset = 0
-                        self.preview_offsets.append(offset)
-                else:
-                    # 按照红色锚点分段计算预览曲线
-                    # 首先将控制点按照红色锚点分段
-                    segments = []
-                    start_idx = 0
-
-                    # 按索引排序红色锚点
-                    sorted_red_anchors = sorted(preview_red_anchors)
-
-                    # 处理所有分段
-                    for red_idx in sorted_red_anchors:
-                        if red_idx > start_idx:  # 确保有足够的点形成一段
-                            segments.append(preview_control_points[start_idx:red_idx+1])
-                        start_idx = red_idx
-
-                    # 处理最后一段（最后一个红色锚点到结束）
-                    if start_idx < len(preview_control_points) - 1:
-                        segments.append(preview_control_points[start_idx:])
-
-                    # 为每个分段计算贝塞尔曲线点
-                    for segment in segments:
-                        if len(segment) >= 2:  # 确保分段至少有两个点
-                            # 计算当前分段的曲线点
-                            segment_points = []
-                            for t in range(0, self.curve_segments + 1):
-                                t_normalized = t / self.curve_segments
-                                point = self.calculate_bezier_point(t_normalized, segment)
-                                segment_points.append(point)
-
-                            # 如果不是第一段，移除第一个点以避免重复
-                            if self.preview_slider_points and segment_points:
-                                segment_points = segment_points[1:]
-
-                            # 将当前分段的点添加到预览曲线中
-                            self.preview_slider_points.extend(segment_points)
-
-                    # 计算与原始曲线的偏移量
-                    for i, point in enumerate(self.preview_slider_points):
-                        if self.cached_curve_points and i < len(self.cached_curve_points):
-                            orig_point = self.cached_curve_points[i]
-                            offset = self.distance(point, orig_point)
-                        else:
-                            offset = 0
-                        self.preview_offsets.append(offset)
+                self.compute_preview_curve(preview_control_points, preview_red_anchors, deleted=self.pre_selected_point_index,
+                                           cursor_pos=pos)
             elif insert_segment_index is not None and min_distance < distance_threshold and insert_segment_index + 1 < len(self.control_points):
                 # 预览添加中间锚点
                 self.highlighted_segment_index = insert_segment_index
-                self.preview_point = event.pos()
+                self.preview_point = pos
                 self.is_preview_enabled = True
                 self.preview_segment_index = insert_segment_index + 1
 
                 preview_control_points = self.control_points[:]
                 preview_control_points.insert(self.preview_segment_index, self.preview_point)
-                self.preview_slider_points = []
-                self.preview_offsets = []
-
-                # 如果没有红色锚点，按原方式计算预览曲线
-                if not self.red_anchors:
-                    for t in range(0, self.curve_segments + 1):
-                        t_normalized = t / self.curve_segments
-                        point = self.calculate_bezier_point(t_normalized, preview_control_points)
-                        self.preview_slider_points.append(point)
-                        if self.cached_curve_points and len(self.cached_curve_points) > t:
-                            orig_point = self.cached_curve_points[t]
-                            offset = self.distance(point, orig_point)
-                        else:
-                            offset = 0
-                        self.preview_offsets.append(offset)
-                else:
-                    # 更新红色锚点索引，考虑插入新点后的索引变化
-                    preview_red_anchors = set()
-                    for idx in self.red_anchors:
-                        if idx >= self.preview_segment_index:
-                            preview_red_anchors.add(idx + 1)  # 插入点后的红色锚点索引+1
-                        else:
-                            preview_red_anchors.add(idx)  # 插入点前的红色锚点索引不变
-
-                    # 按照红色锚点分段计算预览曲线
-                    # 首先将控制点按照红色锚点分段
-                    segments = []
-                    start_idx = 0
-
-                    # 按索引排序红色锚点
-                    sorted_red_anchors = sorted(preview_red_anchors)
-
-                    # 处理所有分段
-                    for red_idx in sorted_red_anchors:
-                        if red_idx > start_idx:  # 确保有足够的点形成一段
-                            segments.append(preview_control_points[start_idx:red_idx+1])
-                        start_idx = red_idx
-
-                    # 处理最后一段（最后一个红色锚点到结束）
-                    if start_idx < len(preview_control_points) - 1:
-                        segments.append(preview_control_points[start_idx:])
-
-                    # 为每个分段计算贝塞尔曲线点
-                    for segment in segments:
-                        if len(segment) >= 2:  # 确保分段至少有两个点
-                            # 计算当前分段的曲线点
-                            segment_points = []
-                            for t in range(0, self.curve_segments + 1):
-                                t_normalized = t / self.curve_segments
-                                point = self.calculate_bezier_point(t_normalized, segment)
-                                segment_points.append(point)
-
-                            # 如果不是第一段，移除第一个点以避免重复
-                            if self.preview_slider_points and segment_points:
-                                segment_points = segment_points[1:]
-
-                            # 将当前分段的点添加到预览曲线中
-                            self.preview_slider_points.extend(segment_points)
-
-                    # 计算与原始曲线的偏移量
-                    for i, point in enumerate(self.preview_slider_points):
-                        if self.cached_curve_points and i < len(self.cached_curve_points):
-                            orig_point = self.cached_curve_points[i]
-                            offset = self.distance(point, orig_point)
-                        else:
-                            offset = 0
-                        self.preview_offsets.append(offset)
+                # 更新红色锚点索引，考虑插入新点后的索引变化
+                preview_red_anchors = {idx + 1 if idx >= self.preview_segment_index else idx for idx in self.red_anchors}
+                self.compute_preview_curve(preview_control_points, preview_red_anchors, inserted=self.preview_segment_index,
+                                           cursor_pos=pos)
             else:
                 self.highlighted_segment_index = None
                 self.preview_point = None
                 self.is_preview_enabled = False
                 self.preview_segment_index = -1
-                self.preview_slider_points = None
-                self.preview_offsets = None
+                self.apply_preview_slider(None, None)
 
         else:
             # 无修饰键时清除预览
@@ -3263,19 +3241,32 @@ class BezierCurveEditor(QWidget):
             self.preview_point = None
             self.is_preview_enabled = False
             self.preview_segment_index = -1
-            self.preview_slider_points = None
-            self.preview_offsets = None
+            self.apply_preview_slider(None, None)
+
+    def compute_preview_curve(self, preview_control_points, preview_red_anchors, inserted=None, deleted=None,
+                              cursor_pos=None):
+        """
+        计算预览曲线及其与原始曲线逐点的偏移量
+
+        inserted / deleted 为插入锚点（编辑后索引）/ 删除锚点（编辑前索引）的位置，给出时只重新细分
+        包含该锚点的分段，其余分段复用曲线缓存. 后台计算开启时结果由 apply_background_result 设置.
+        """
+        use_cache = self.curve_tessellation is not None and (inserted is not None or deleted is not None)
+        args = (
+            self.curve_cache if use_cache else None, self.cached_curve_array,
+            qpoints_to_array(preview_control_points), preview_red_anchors, self.curve_segments,
+            self.tessellation_tolerance(), inserted, deleted,
+            self.curve_sample_index() if self.adaptive_tessellation and self.cached_curve_array is not None else None
+        )
+        if self.background_computation:
+            self.background_worker.submit("preview", self.document_revision, cursor_pos, compute_preview_result, *args)
+        else:
+            self.apply_preview_slider(*compute_preview_result(*args))
 
     def calculate_bezier_point(self, t, control_points):
         """根据参数 t 计算贝塞尔曲线上的点"""
-        n = len(control_points) - 1
-        x, y = 0, 0
-        for i, point in enumerate(control_points):
-            # 计算贝塞尔基函数
-            coefficient = self.binomial_coefficient(n, i) * (1 - t) ** (n - i) * t ** i
-            x += point.x() * coefficient
-            y += point.y() * coefficient
-        return QPoint(int(x), int(y))
+        x, y = evaluate_point(qpoints_to_array(control_points), t)
+        return QPointF(x, y)
 
     def distance(self, p1, p2):
         """计算两点之间距离的辅助函数 (使用距离公式)"""
@@ -3346,13 +3337,36 @@ class BezierCurveEditor(QWidget):
         proj_x = line_point.x() + proj_length * line_direction[0]
         proj_y = line_point.y() + proj_length * line_direction[1]
 
-        return QPoint(int(proj_x), int(proj_y))
+        return QPointF(proj_x, proj_y)
+
+    def tangent_guide_line(self, point_idx):
+        """
+        Shift 悬停在红色锚点上时显示的切线方向线段，返回 osu! 坐标的 (起点, 终点)，没有切线方向时返回 None.
+
+        线段以锚点为中心，两侧各长屏幕上 200 像素.
+        """
+        tangent_dir = self.calculate_tangent_line(point_idx)
+        if not tangent_dir:
+            return None
+        anchor = self.control_points[point_idx]
+        line_length = self.document_length(200)
+        start_x = anchor.x() - tangent_dir[0] * line_length
+        start_y = anchor.y() - tangent_dir[1] * line_length
+        end_x = anchor.x() + tangent_dir[0] * line_length
+        end_y = anchor.y() + tangent_dir[1] * line_length
+        return QPointF(start_x, start_y), QPointF(end_x, end_y)
+
+    def anchor_guide_lines(self, anchor_idx, anchor_point):
+        """
+        计算 Shift 悬停在白色锚点上时显示的可移动直线，返回 (线段列表, 交点)，坐标均为 osu! 坐标.
 
-    def calculate_and_draw_anchor_lines(self, painter, anchor_idx, anchor_point):
-        """计算并绘制锚点可移动的直线
-        painter: QPainter对象
         anchor_idx: 锚点索引
-        anchor_point: 锚点位置"""
+        anchor_point: 锚点位置（osu! 坐标）
+        前后都是红色锚点时为两个红色锚点到两条直线交点的线段；只有一个相邻红色锚点时为穿过锚点的长直线.
+        没有线段时返回 ([], None).
+        """
+        lines = []
+        intersection = None
         # 检查前后是否有红色锚点
         prev_red_idx = None
         next_red_idx = None
@@ -3391,9 +3405,8 @@ class BezierCurveEditor(QWidget):
                 angle_rad = math.acos(max(-1.0, min(1.0, dot_product)))
                 angle_deg = math.degrees(angle_rad)
 
-                # 如果夹角大于30度，绘制两条直线的交点
+                # 如果夹角大于30度，使用两条直线的交点；夹角小于等于30度时没有线段
                 if angle_deg > 30:
-                    # 计算两条直线的交点
                     intersection = self.calculate_line_intersection(
                         self.control_points[prev_red_idx],
                         prev_dir,
@@ -3401,21 +3414,10 @@ class BezierCurveEditor(QWidget):
                         next_dir
                     )
 
-                    if intersection:
-                        # 绘制从N-1点到焦点的直线
-                        painter.setPen(QPen(QColor("#00FF00"), 2, Qt.DashLine))  # 绿色虚线
-                        painter.drawLine(self.control_points[prev_red_idx], intersection)
-
-                        # 绘制从N+1点到焦点的直线
-                        painter.setPen(QPen(QColor("#00FF00"), 2, Qt.DashLine))  # 绿色虚线
-                        painter.drawLine(self.control_points[next_red_idx], intersection)
-
-                        # 绘制交点（小圆点）
-                        painter.setPen(QPen(QColor("#00FF00"), 7))  # 绿色点
-                        painter.drawPoint(intersection)
-                # 如果夹角小于等于30度，不绘制任何内容
-                # else:
-                #     # 这里不再绘制任何内容
+                    if intersection is not None:
+                        # 从N-1点到交点、从N+1点到交点的直线
+                        lines.append((self.control_points[prev_red_idx], intersection))
+                        lines.append((self.control_points[next_red_idx], intersection))
 
         # 如果只有一个相邻的红色锚点
         elif prev_red_idx is not None or next_red_idx is not None:
@@ -3433,17 +3435,30 @@ class BezierCurveEditor(QWidget):
 
                 # 计算足够长的直线长度（窗口对角线长度的2倍）
                 window_diagonal = math.sqrt(self.width() * self.width() + self.height() * self.height())
-                line_length = window_diagonal * 2
+                line_length = self.document_length(window_diagonal * 2)
 
                 # 计算直线的起点和终点
                 start_x = anchor_point.x() - dir_vector[0] * line_length
                 start_y = anchor_point.y() - dir_vector[1] * line_length
                 end_x = anchor_point.x() + dir_vector[0] * line_length
                 end_y = anchor_point.y() + dir_vector[1] * line_length
+                lines.append((QPointF(start_x, start_y), QPointF(end_x, end_y)))
+        return lines, intersection
 
-                # 绘制直线
-                painter.setPen(QPen(QColor("#00FF00"), 2, Qt.DashLine))  # 绿色虚线
-                painter.drawLine(QPoint(int(start_x), int(start_y)), QPoint(int(end_x), int(end_y)))
+    def calculate_and_draw_anchor_lines(self, painter, anchor_idx, anchor_point, view):
+        """计算并绘制锚点可移动的直线
+        painter: QPainter对象
+        anchor_idx: 锚点索引
+        anchor_point: 锚点位置（osu! 坐标）
+        view: osu! 坐标 -> 屏幕坐标的变换，直线在 osu! 坐标中计算，绘制时再映射"""
+        lines, intersection = self.anchor_guide_lines(anchor_idx, anchor_point)
+        for start, end in lines:
+            painter.setPen(QPen(QColor("#00FF00"), 2, Qt.DashLine))  # 绿色虚线
+            painter.drawLine(view.map(start), view.map(end))
+        if intersection is not None:
+            # 绘制交点（小圆点）
+            painter.setPen(QPen(QColor("#00FF00"), 7))  # 绿色点
+            painter.drawPoint(view.map(intersection))
 
     def calculate_line_intersection(self, p1, dir1, p2, dir2):
         """计算两条直线的交点
@@ -3474,19 +3489,11 @@ class BezierCurveEditor(QWidget):
         intersect_x = p1.x() + t * dir1[0]
         intersect_y = p1.y() + t * dir1[1]
 
-        return QPoint(int(intersect_x), int(intersect_y))
+        return QPointF(intersect_x, intersect_y)
 
     def binomial_coefficient(self, n, k):
         """计算二项式系数 C(n, k)"""
-        if k < 0 or k > n:
-            return 0
-        if k == 0 or k == n:
-            return 1
-        k = min(k, n - k)  # 利用对称性优化计算
-        result = 1
-        for i in range(k):
-            result = result * (n - i) // (i + 1)
-        return result
+        return binomial_coefficient(n, k)
 
     def save_state(self):
         """保存当前状态到历史记录"""
@@ -3506,6 +3513,7 @@ class BezierCurveEditor(QWidget):
     def auto_backup(self):
         """自动备份当前状态"""
         backup_data = {
+            'coordinate_space': 'osu',  # 控制点保存在 osu! 坐标中；旧版备份没有这一项，保存的是屏幕坐标
             'control_points': self.control_points,
             'red_anchors': self.red_anchors,
             'history': self.history,
@@ -3533,6 +3541,11 @@ class BezierCurveEditor(QWidget):
                     self.red_anchors = backup_data.get('red_anchors', set())  # 恢复红色锚点信息
                     self.history = backup_data.get('history', [])
                     self.future = backup_data.get('future', [])
+                    if backup_data.get('coordinate_space') != 'osu':
+                        # 兼容旧版备份：按当前窗口把屏幕坐标转换为 osu! 坐标
+                        self.control_points = self.screen_points_to_document(self.control_points)
+                        self.history = [(self.screen_points_to_document(state[0]),) + tuple(state[1:]) for state in self.history]
+                        self.future = [(self.screen_points_to_document(state[0]),) + tuple(state[1:]) for state in self.future]
                     self.update_curve_cache()
                     self.update()
                 except Exception as e:
@@ -3558,6 +3571,7 @@ class BezierCurveEditor(QWidget):
                     print(f"Failed to remove backup: {e}")
             # 清理临时SVG文件
             self.clean_temp_svg_files()
+            self.background_worker.shutdown()
             event.accept()
         elif reply == QMessageBox.No:
             # 不保存，直接清理备份并退出
@@ -3568,6 +3582,7 @@ class BezierCurveEditor(QWidget):
                     print(f"Failed to remove backup: {e}")
             # 清理临时SVG文件
             self.clean_temp_svg_files()
+            self.background_worker.shutdown()
             event.accept()
         else:  # Cancel
             event.ignore()  # 取消关闭
@@ -3605,6 +3620,32 @@ class BezierCurveEditor(QWidget):
                 label.setWindowOpacity(1.0)
             self.update()
 
+    def scaled_background_image(self):
+        """
+        返回按 image_scale * rect_scale 缩放后的底图，只在图片、缩放比例或设备像素比变化时重新缩放.
+
+        拖动图片缩放或矩形大小滑块时使用快速缩放，松开滑块后的下一次重绘再平滑缩放. 图片按物理像素缩放，
+        scaled_image_size 为绘制时的逻辑尺寸.
+        """
+        # 计算综合缩放比例： image_scale (滑块控制) * rect_scale (Playfield Boundary 控制)
+        combined_scale = self.image_scale * self.rect_scale
+        device_pixel_ratio = self.devicePixelRatioF()
+        smooth = not any(self.sliders[name].isSliderDown() for name in ("scale", "rect_scale"))
+        key = (self.image.cacheKey(), combined_scale, device_pixel_ratio, smooth)
+        if key != self.scaled_image_key:
+            scaled_image = self.image.scaled(
+                int(self.image.width() * combined_scale * device_pixel_ratio),
+                int(self.image.height() * combined_scale * device_pixel_ratio),
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation if smooth else Qt.FastTransformation
+            )
+            scaled_image.setDevicePixelRatio(device_pixel_ratio)
+            self.scaled_image = scaled_image
+            self.scaled_image_size = (int(scaled_image.width() / device_pixel_ratio),
+                                      int(scaled_image.height() / device_pixel_ratio))
+            self.scaled_image_key = key
+        return self.scaled_image
+
     def update_image_scale(self):
         """更新图片缩放比例"""
         self.image_scale = self.sliders["scale"].value() / 100.0
@@ -3636,18 +3677,9 @@ class BezierCurveEditor(QWidget):
         self.update()
 
     def update_rect_scale(self):
-        """更新矩形的大小，并连带缩放曲线和背景图片"""
-        old_rect_scale = self.rect_scale
+        """更新矩形的大小，并连带缩放曲线和背景图片（曲线只更新视图相机，不重算缓存）"""
         self.rect_scale = self.sliders["rect_scale"].value() / 100.0
-        scale_factor = self.rect_scale / old_rect_scale if old_rect_scale != 0 else 1.0
-
-        center = QPoint(self.width() // 2, self.height() // 2)
-
-        # 缩放控制点 (保持不变)
-        for i in range(len(self.control_points)):
-            self.control_points[i] = center + (self.control_points[i] - center) * scale_factor
-
-        self.update_curve_cache()  # 刷新缓存
+        self.update_camera()
         self.update_circle_size()  # 更新描边尺寸
         self.update()
 
@@ -3670,45 +3702,12 @@ class BezierCurveEditor(QWidget):
             return False  # 少于 2 个点时不保存，返回 False 表示失败
 
         try:
+            osu_points = self.editor_points_to_osu()
+            start_x, start_y = osu_points[0]
+            # 沿用原有的文件格式：重复输出的是红锚点的下一个点
+            curve_data = format_curve_points(osu_points, {idx + 1 for idx in self.red_anchors})
             with open(file_name, "w") as file:
-                # 计算窗口中心和矩形边界
-                center_x = self.width() // 2
-                center_y = self.height() // 2
-                rect_width = int(self.width() * self.rect_scale)
-                rect_height = int(rect_width * 3 / 4)
-                rect_x = center_x - rect_width // 2
-                rect_y = center_y - rect_height // 2
-                rect_bottom_left_current_x = rect_x
-                rect_bottom_left_current_y = rect_y + rect_height
-                rect_top_right_current_x = rect_x + rect_width
-                rect_top_right_current_y = rect_y
-
-                # 保存第一个控制点
-                first_point = self.control_points[0]
-                remapped_first_point = self.remap_coordinates(
-                    first_point,
-                    rect_bottom_left_current_x, rect_bottom_left_current_y,
-                    rect_top_right_current_x, rect_top_right_current_y
-                )
-                file.write(
-                    f"{int(remapped_first_point.x())},{int(remapped_first_point.y())},1000,2,0,B"
-                )
-
-                # 保存后续控制点
-                for i, point in enumerate(self.control_points[1:], 1):  # 从索引1开始
-                    remapped_point = self.remap_coordinates(
-                        point,
-                        rect_bottom_left_current_x, rect_bottom_left_current_y,
-                        rect_top_right_current_x, rect_top_right_current_y
-                    )
-                    file.write(f"|{int(remapped_point.x())}:{int(remapped_point.y())}")
-
-                    # 如果是红锚点，则重复输出该点坐标
-                    if i-1 in self.red_anchors:  # i-1是因为self.control_points[1:]从索引1开始，但red_anchors中的索引从0开始
-                        file.write(f"|{int(remapped_point.x())}:{int(remapped_point.y())}")
-
-                # 写入滑条参数
-                file.write(",1,100\n")
+                file.write(f"{start_x},{start_y},1000,2,0,{curve_data},1,100\n")
             return True  # 保存成功返回 True
         except Exception as e:
             print(f"Save control points failed: {e}")  # 可选错误日志
@@ -3752,58 +3751,9 @@ class BezierCurveEditor(QWidget):
                     # 示例格式：x,y,time,type,curve_type,B|...
                     parts = content.split(",")
                     if len(parts) >= 6 and parts[5].startswith("B|"):
-                        # 计算窗口中心 (从 export_points 函数中复制 - 确保 rect_bottom_left_current_x 等变量被定义)
-                        center_x = self.width() // 2
-                        center_y = self.height() // 2
-                        rect_width = int(self.width() * self.rect_scale)
-                        rect_height = int(rect_width * 3 / 4)
-                        rect_x = center_x - rect_width // 2
-                        rect_y = center_y - rect_height // 2
-                        rect_bottom_left_current_x = rect_x
-                        rect_bottom_left_current_y = rect_y + rect_height
-                        rect_top_right_current_x = rect_x + rect_width
-                        rect_top_right_current_y = rect_y
-
-                        # 第一个滑条点
-                        start_x = int(parts[0])
-                        start_y = int(parts[1])
-
-                        # 对第一个点也应用 remap_coordinates 反向映射  !!!
-                        remapped_first_point = self.remap_coordinates(
-                            QPoint(start_x, start_y),
-                            rect_bottom_left_current_x, rect_bottom_left_current_y,
-                            rect_top_right_current_x, rect_top_right_current_y,
-                            reverse=True
-                        )
-                        self.control_points = [remapped_first_point] # 使用反向映射后的第一个点
-
-                        # 解析剩余的滑条点
-                        slider_points = parts[5][2:].split("|")  # 去掉 "B|"
-                        remapped_slider_points = [] # 用于存储反向映射后的滑条点
-                        prev_point = None # 用于存储前一个点，检测连续相同点
-                        for i, point in enumerate(slider_points):
-                            x, y = point.split(":")
-                            current_point = QPoint(int(x), int(y))
-
-                            # 检查是否与前一个点坐标相同（红锚点标记）
-                            if prev_point is not None and prev_point.x() == current_point.x() and prev_point.y() == current_point.y():
-                                # 如果与前一个点坐标相同，则跳过此点（因为已经添加过了）
-                                # 并将前一个点的索引添加到红锚点集合中
-                                self.red_anchors.add(len(self.control_points) + len(remapped_slider_points) - 1)
-                                prev_point = None # 重置前一个点，避免连续三个相同点的情况
-                                continue
-
-                            # 正常处理点坐标
-                            new_point_remapped = self.remap_coordinates( # 调用 remap_coordinates 进行反向映射
-                                current_point,
-                                rect_bottom_left_current_x, rect_bottom_left_current_y,
-                                rect_top_right_current_x, rect_top_right_current_y,
-                                reverse=True # 传入 reverse=True 参数，执行反向映射
-                            )
-                            remapped_slider_points.append(new_point_remapped) # 将反向映射后的点添加到 remapped_slider_points 列表
-                            prev_point = current_point # 更新前一个点
-
-                        self.control_points.extend(remapped_slider_points) # 将反向映射后的滑条点列表添加到 self.control_points
+                        # 解析滑条点（含第一个点），并反向映射到编辑器坐标
+                        slider_points, self.red_anchors = parse_curve_points(parts[5], (int(parts[0]), int(parts[1])))
+                        self.control_points = self.osu_points_to_editor(slider_points)
                         self.save_state()
                         self.update_curve_cache()  # 刷新缓存
                         self.update()
@@ -3830,61 +3780,41 @@ class BezierCurveEditor(QWidget):
             if self.save_control_points_to_file(file_name):
                 QMessageBox.information(self, self.msg_title_prompt, self.msg_points_export_success.format(file_name=file_name))
 
-    def remap_coordinates(self, point, rect_bottom_left_x, rect_bottom_left_y, rect_top_right_x, rect_top_right_y, reverse=False):
-        """
-        将点坐标从一个坐标系重新映射到另一个坐标系.
-        支持正向映射 (当前坐标系 -> 新坐标系) 和反向映射 (新坐标系 -> 当前坐标系).
-
-        Args:
-            point: 要重新映射的 QPoint 对象.
-            rect_bottom_left_x: 红色矩形左下角在**当前坐标系**中的 X 坐标.
-            rect_bottom_left_y: 红色矩形左下角在**当前坐标系**中的 Y 坐标.
-            rect_top_right_x: 红色矩形右上角在**当前坐标系**中的 X 坐标.
-            rect_top_right_y: 红色矩形右上角在**当前坐标系**中的 Y 坐标.
-            reverse: 如果为 True, 执行**反向映射** (新坐标系 -> 当前坐标系). 默认为 False (正向映射).
-
-        Returns:
-            重新映射后的 QPoint 对象.
-        """
-        current_x = point.x()
-        current_y = point.y()
-
-        # 新的坐标系的范围 (已更新)
-        new_x_min = -65
-        new_x_max = 575
-        new_y_min = -56
-        new_y_max = 424
-
-        # 当前坐标系中红色矩形的宽度和高度
-        rect_width_current = rect_top_right_x - rect_bottom_left_x
-        rect_height_current = rect_bottom_left_y - rect_top_right_y
-
-        if rect_width_current == 0 or rect_height_current == 0:
-            return QPoint(0, 0)  # 避免除以零
-
-        # 计算 X 和 Y 坐标的比例和偏移
-        scale_x = (new_x_max - new_x_min) / rect_width_current
-        scale_y = (new_y_max - new_y_min) / rect_height_current
-        offset_x = new_x_min - rect_bottom_left_x * scale_x
-        offset_y = new_y_max - rect_bottom_left_y * scale_y
-
-        if reverse: # 反向映射 (新坐标系 -> 当前坐标系)
-            # 反向计算比例和偏移 (实际上比例不变，只需要反向应用偏移)
-            reverse_scale_x = 1.0 / scale_x if scale_x != 0 else 0 # 避免除以零
-            reverse_scale_y = 1.0 / scale_y if scale_y != 0 else 0 # 避免除以零
-            reverse_offset_x = -offset_x / scale_x if scale_x != 0 else 0
-            reverse_offset_y = -offset_y / scale_y if scale_y != 0 else 0
-
-
-            new_x = reverse_scale_x * (current_x - new_x_min)  + rect_bottom_left_x # 反向映射 X 坐标
-            new_y = reverse_scale_y * (current_y - new_y_max) + rect_bottom_left_y # 反向映射 Y 坐标 (注意 Y 轴反转)
-
-
-        else: # 正向映射 (当前坐标系 -> 新坐标系) - 默认
-            new_x = scale_x * current_x + offset_x # 正向映射 X 坐标
-            new_y = scale_y * current_y + offset_y # 正向映射 Y 坐标
-
-        return QPoint(int(new_x), int(new_y))
+    def update_camera(self):
+        """按当前窗口尺寸和矩形大小重新计算视图相机（常数时间，不触碰控制点和曲线缓存）"""
+        self.camera = ViewCamera.from_playfield(self.width(), self.height(), self.rect_scale)
+
+    def camera_transform(self):
+        """视图相机对应的 QTransform（osu! 坐标 -> 屏幕坐标）"""
+        camera = self.camera
+        return QTransform(camera.scale_x, 0, 0, camera.scale_y, camera.offset_x, camera.offset_y)
+
+    def view_transform(self):
+        """绘制曲线时使用的变换：先应用进行中的旋转 / 平移手势，再应用视图相机"""
+        if self.gesture_transform is None:
+            return self.camera_transform()
+        return self.gesture_transform * self.camera_transform()
+
+    def document_pos(self, event):
+        """鼠标事件位置（屏幕坐标）-> osu! 坐标的 QPointF"""
+        local_pos = event.localPos()
+        return QPointF(*self.camera.to_document(local_pos.x(), local_pos.y()))
+
+    def document_length(self, length):
+        """屏幕上的长度（像素）-> osu! 坐标中的长度，命中测试的像素阈值都要先换算"""
+        return self.camera.document_length(length)
+
+    def screen_points_to_document(self, points):
+        """将屏幕坐标的点列表（旧版备份的格式）转换为 osu! 坐标的 QPointF 列表"""
+        return [QPointF(*self.camera.to_document(point.x(), point.y())) for point in points]
+
+    def osu_points_to_editor(self, osu_points):
+        """将 osu! 坐标的 (x, y) 列表转换为编辑器中的 QPointF 列表（文档本身使用 osu! 坐标，无需映射）"""
+        return [QPointF(x, y) for x, y in osu_points]
+
+    def editor_points_to_osu(self):
+        """将当前控制点四舍五入为 osu! 坐标的 (x, y) 整数列表"""
+        return [(round(point.x()), round(point.y())) for point in self.control_points]
 
     def inverse_remap_coordinates(self, x, y):
         """将 BezierCurveEditor 坐标转换回 osu! 坐标"""
@@ -0,0 +1,54 @@
+"""
+测试公共设置：无界面运行 Qt，并注册只在 -m benchmark 时运行的 benchmark 标记.
+"""
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: 与 benchmarks/baseline.json 对比的性能测试，用 -m benchmark 运行")
+
+
+def pytest_collection_modifyitems(config, items):
+    if "benchmark" in (config.getoption("-m") or ""):
+        return
+    skip = pytest.mark.skip(reason="性能测试，用 -m benchmark 运行")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="session")
+def editor_module(qapp):
+    """以模块形式加载 bezier_editor_V3.5.py（文件名含点，不能直接 import）"""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("bezier_editor", os.path.join(REPO_ROOT, "bezier_editor_V3.5.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def editor(editor_module, tmp_path, monkeypatch):
+    """在临时目录中创建编辑器窗口，配置文件、备份文件都写在临时目录里"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.json").write_text('{"osu_songs_path": null, "skip_prompt": true}', encoding="utf-8")
+    widget = editor_module.BezierCurveEditor()
+    widget.resize(1600, 900)
+    yield widget
+    widget.background_worker.wait()
+    widget.background_worker.shutdown()
+    widget.clean_temp_svg_files()
+    widget.deleteLater()
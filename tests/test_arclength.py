@@ -0,0 +1,84 @@
+"""
+累计弧长表的查询与逐段暴力累加的对照.
+"""
+import math
+
+import numpy as np
+import pytest
+
+from bezier_core import ArcLengthTable, tessellate_curve
+
+
+def brute_cumulative(points):
+    cumulative = [0.0]
+    for (x0, y0), (x1, y1) in zip(points[:-1], points[1:]):
+        cumulative.append(cumulative[-1] + math.hypot(x1 - x0, y1 - y0))
+    return np.array(cumulative)
+
+
+def brute_interpolate(keys, values, key):
+    """线性扫描找到 key 所在区间并插值，超出范围时取两端的值"""
+    if key <= keys[0]:
+        return values[0]
+    for k in range(len(keys) - 1):
+        if keys[k] <= key <= keys[k + 1]:
+            fraction = (key - keys[k]) / (keys[k + 1] - keys[k])
+            return values[k] + (values[k + 1] - values[k]) * fraction
+    return values[-1]
+
+
+@pytest.fixture
+def table():
+    points = np.random.default_rng(7).uniform(0, 512, (10, 2))
+    return ArcLengthTable.from_tessellation(tessellate_curve(points, {3, 6}, 50))
+
+
+def test_total_length_and_params(table):
+    cumulative = brute_cumulative(table.points.tolist())
+    assert table.cumulative == pytest.approx(cumulative, rel=1e-12)
+    assert table.total_length == pytest.approx(cumulative[-1], rel=1e-12)
+    assert np.all(np.diff(table.params) > 0)
+    assert table.params[0] == 0.0 and table.params[-1] == 3.0   # 三个分段
+
+
+def test_distance_and_param_match_brute_force(table):
+    cumulative = brute_cumulative(table.points.tolist())
+    total = cumulative[-1]
+    for param in np.linspace(-0.5, 3.5, 97).tolist() + table.params[::7].tolist():
+        assert table.distance_at(param) == pytest.approx(brute_interpolate(table.params, cumulative, param), abs=1e-9)
+    for distance in np.linspace(-10, total + 10, 97).tolist() + cumulative[::7].tolist():
+        assert table.param_at_distance(distance) == pytest.approx(
+            brute_interpolate(cumulative, table.params, distance), abs=1e-12)
+        x, y = table.point_at_distance(distance)
+        assert x == pytest.approx(brute_interpolate(cumulative, table.points[:, 0], distance), abs=1e-9)
+        assert y == pytest.approx(brute_interpolate(cumulative, table.points[:, 1], distance), abs=1e-9)
+
+
+def test_end_values_and_out_of_range(table):
+    total = table.total_length
+    first, last = tuple(table.points[0]), tuple(table.points[-1])
+    assert table.distance_at(0.0) == 0.0 and table.distance_at(-1.0) == 0.0
+    assert table.distance_at(3.0) == pytest.approx(total) and table.distance_at(9.0) == pytest.approx(total)
+    assert table.param_at_distance(-5.0) == 0.0 and table.param_at_distance(total + 5.0) == 3.0
+    assert table.point_at_distance(-5.0) == first and table.point_at_distance(0.0) == first
+    assert table.point_at_distance(total) == pytest.approx(last) and table.point_at_distance(total + 5.0) == last
+    # 曲线终点属于最后一个分段的 t = 1，而不是不存在的第四段
+    assert table.segment_t_at_distance(-5.0) == (0, 0.0)
+    assert table.segment_t_at_distance(total + 5.0) == (2, 1.0)
+
+
+def test_segment_t_at_distance(table):
+    for distance in np.linspace(0, table.total_length, 41)[1:-1].tolist():
+        segment_idx, t = table.segment_t_at_distance(distance)
+        assert 0 <= segment_idx <= 2 and 0.0 <= t <= 1.0
+        assert segment_idx + t == pytest.approx(table.param_at_distance(distance))
+        assert table.distance_at(segment_idx + t) == pytest.approx(distance, abs=1e-9)
+
+
+def test_degenerate_tables():
+    empty = ArcLengthTable(np.empty((0, 2)))
+    assert empty.total_length == 0.0 and empty.distance_at(0.5) == 0.0
+    assert empty.param_at_distance(1.0) == 0.0 and empty.point_at_distance(1.0) is None
+    single = ArcLengthTable([(3.0, 4.0)])
+    assert single.total_length == 0.0 and single.point_at_distance(10.0) == (3.0, 4.0)
+    assert single.segment_t_at_distance(10.0) == (0, 0.0)
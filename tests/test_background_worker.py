@@ -0,0 +1,56 @@
+"""
+后台计算结果回到 GUI 线程后的处理.
+"""
+from PyQt5.QtCore import QEvent, QPointF, Qt
+from PyQt5.QtGui import QKeyEvent
+
+
+def failing_task():
+    raise RuntimeError("worker failure")
+
+
+def test_failed_task_keeps_previous_preview(editor, qapp):
+    editor.control_points = [QPointF(0, 0), QPointF(100, 300), QPointF(250, -20), QPointF(400, 350)]
+    editor.update_curve_cache()
+    editor.is_preview_enabled = True
+    previous = [QPointF(1, 2), QPointF(3, 4)], [0.5, 0.5]
+    editor.preview_slider_points, editor.preview_offsets = previous
+    dropped = editor.background_results_dropped
+
+    editor.background_worker.submit("preview", editor.document_revision, None, failing_task)
+    editor.background_worker.wait()
+    qapp.processEvents()
+
+    assert editor.background_results_dropped == dropped + 1
+    assert (editor.preview_slider_points, editor.preview_offsets) == previous
+    # 窗口仍然可以正常处理后续的后台结果
+    editor.background_worker.submit("preview", editor.document_revision, None, lambda: ([QPointF(5, 6)], [1.0]))
+    editor.background_worker.wait()
+    qapp.processEvents()
+    assert editor.preview_slider_points == [QPointF(5, 6)]
+
+
+def release_key(editor, key):
+    editor.keyReleaseEvent(QKeyEvent(QEvent.KeyRelease, key, Qt.NoModifier))
+
+
+def test_releasing_alt_drops_pending_preview(editor, qapp):
+    editor.is_preview_enabled = True
+    editor.is_alt_pressed = True
+    editor.background_worker.submit("preview", editor.document_revision, None, lambda: ([QPointF(5, 6)], [1.0]))
+    release_key(editor, Qt.Key_Alt)
+    editor.background_worker.wait()
+    qapp.processEvents()
+    assert editor.preview_slider_points is None
+
+
+def test_releasing_ctrl_drops_pending_highlight(editor, qapp):
+    editor.control_points = [QPointF(0, 0), QPointF(100, 300), QPointF(250, -20), QPointF(400, 350)]
+    editor.update_curve_cache()
+    editor.is_ctrl_pressed = True
+    editor.background_worker.submit("highlight", editor.document_revision, None, lambda: (2, [0.1, 0.2, 0.7]))
+    release_key(editor, Qt.Key_Control)
+    editor.is_ctrl_pressed = True   # 结果到达之前再次按下 Ctrl，过期的结果也不能被采用
+    editor.background_worker.wait()
+    qapp.processEvents()
+    assert editor.closest_curve_point is None and editor.anchor_influences == []
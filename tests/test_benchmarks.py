@@ -0,0 +1,51 @@
+"""
+benchmarks/baseline.json 的完整性检查，以及与基线对比的性能测试（python -m pytest -m benchmark）.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+from conftest import REPO_ROOT
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "benchmarks"))
+import bench_suite  # noqa: E402
+
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+# 只测 V3.5，与完整运行生成的基线相比亚毫秒级用例会有成倍的波动，因此只拦截慢一倍以上且超过半毫秒的退化
+TOLERANCE = 1.0
+MIN_DELTA = 0.5
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_baseline_records_every_version(baseline):
+    assert set(baseline["versions"]) == set(bench_suite.discover_versions())
+    for version, status in baseline["versions"].items():
+        if status["status"] == "skipped":
+            assert baseline["skipped"][version] == status["reason"]
+            assert version not in baseline["results"]
+        else:
+            assert status["status"] == "measured"
+            assert baseline["results"][version]
+
+
+def test_check_reports_skipped_cases(baseline):
+    key = next(iter(baseline["results"]["V3.5"]))
+    report = {"results": {}, "skipped": {"V3.5": "cannot load: SyntaxError: test"}}
+    assert bench_suite.check(report, baseline, 0.5, 0.05)[0] == ("V3.5", key, baseline["results"]["V3.5"][key], None)
+    report = {"results": {"V3.5": {}}, "skipped": {f"V3.5/{key}": "over budget"}}
+    assert bench_suite.check(report, baseline, 0.5, 0.05) == [("V3.5", key, baseline["results"]["V3.5"][key], None)]
+
+
+@pytest.mark.benchmark
+def test_no_regressions_against_baseline(baseline):
+    versions = bench_suite.discover_versions()
+    report = bench_suite.run({"V3.5": versions["V3.5"]}, bench_suite.DEFAULT_ANCHORS, bench_suite.DEFAULT_REDS,
+                             bench_suite.DEFAULT_SEGMENTS, repeat=5, budget=2.0)
+    assert bench_suite.check(report, baseline, TOLERANCE, MIN_DELTA) == []
@@ -0,0 +1,54 @@
+"""
+bezier_core 不依赖界面：可以在没有 PyQt5 和 pythonnet 的环境中导入，坐标映射和滑条字符串可以独立使用.
+"""
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import REPO_ROOT
+from bezier_core import ViewCamera, format_slider, parse_slider, playfield_rect, remap_coordinates, remap_points
+
+SLIDER = "64,192,1500,6,0,B|128:96|192:96|192:96|256:160|320:96|320:96|384:192,2,403.5"
+
+
+def test_imports_without_pyqt5_and_clr():
+    # 在子进程中把 PyQt5 和 clr 置为 None，任何导入都会抛出 ImportError
+    code = (
+        "import sys\n"
+        "for name in ('PyQt5', 'PyQt5.QtCore', 'PyQt5.QtGui', 'PyQt5.QtWidgets', 'clr'):\n"
+        "    sys.modules[name] = None\n"
+        "import bezier_core, pkgutil, importlib\n"
+        "for module in pkgutil.iter_modules(bezier_core.__path__):\n"
+        "    importlib.import_module('bezier_core.' + module.name)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, check=True)
+
+
+def test_slider_round_trip():
+    slider = parse_slider(SLIDER)
+    assert slider.points == [(64, 192), (128, 96), (192, 96), (256, 160), (320, 96), (384, 192)]
+    assert slider.red_anchors == {2, 4}
+    assert slider.curve_type == "B"
+    formatted = format_slider(slider.points, slider.red_anchors, slider.start_time, slider.object_type,
+                              slider.hit_sound, slider.repeats, slider.length)
+    assert formatted == SLIDER
+
+
+@pytest.mark.parametrize("size", [(1600, 900), (1280, 720), (1920, 1080), (801, 599)])
+def test_camera_and_remap_are_inverses(size):
+    rng = np.random.default_rng(0)
+    document = rng.uniform((-65, -56), (575, 424), (200, 2))
+    rect = playfield_rect(*size, 0.6)
+    camera = ViewCamera.from_playfield(*size, 0.6)
+
+    screen = np.column_stack(camera.to_screen(document[:, 0], document[:, 1]))
+    np.testing.assert_allclose(screen, remap_points(document, rect, reverse=True), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(np.column_stack(camera.to_document(screen[:, 0], screen[:, 1])), document,
+                               rtol=0, atol=1e-9)
+    np.testing.assert_allclose(remap_points(screen, rect), document, rtol=0, atol=1e-9)
+    # 红色矩形的角对应 osu! 可见区域的角
+    bottom_left_x, bottom_left_y, top_right_x, top_right_y = rect
+    assert remap_coordinates(bottom_left_x, bottom_left_y, *rect) == pytest.approx((-65, 424))
+    assert remap_coordinates(top_right_x, top_right_y, *rect) == pytest.approx((575, -56))
@@ -0,0 +1,50 @@
+"""
+Ctrl 变形拖动的上下文：兜底时按采样点在整条曲线上的参数计算影响力，而不是分段内的 t.
+"""
+import numpy as np
+from PyQt5.QtCore import QPointF
+
+from bezier_core import SegmentIndex, bernstein_row
+
+CONTROL_POINTS = [(0, 0), (100, 300), (250, -20), (400, 350), (512, 100)]
+
+
+def make_curve(editor, red_anchors=(), adaptive=False):
+    editor.control_points = [QPointF(x, y) for x, y in CONTROL_POINTS]
+    editor.red_anchors = set(red_anchors)
+    editor.adaptive_tessellation = adaptive
+    editor.update_curve_cache()
+
+
+def test_fallback_without_red_anchors_uses_curve_t(editor):
+    make_curve(editor, adaptive=True)  # 自适应采样没有预计算的基函数行，走兜底分支
+    sample_idx = len(editor.cached_curve_points) // 3
+    t = float(editor.curve_tessellation.t_values[sample_idx])
+
+    assert editor.global_curve_param(sample_idx) == t
+    segment_start, segment_end, influences = editor.build_deformation_context(sample_idx)
+    assert (segment_start, segment_end) == (0, 4)
+    assert np.allclose(influences, bernstein_row(4, t))
+
+
+def test_fallback_with_red_anchors_uses_global_param(editor):
+    make_curve(editor, red_anchors=(2,))
+    sample_idx = len(editor.cached_curve_points) * 3 // 4   # 第二个分段内
+    local_t = float(editor.curve_tessellation.t_values[sample_idx])
+    editor.locked_t = local_t
+    editor.red_segment_index = SegmentIndex([])   # 找不到采样点所在的分段
+
+    global_t = editor.global_curve_param(sample_idx)
+    assert global_t == (1 + local_t) / 2
+    segment_start, segment_end, influences = editor.build_deformation_context(sample_idx)
+    assert (segment_start, segment_end) == (0, 4)
+    assert np.allclose(influences, bernstein_row(4, global_t))
+    assert not np.allclose(influences, bernstein_row(4, local_t))
+
+
+def test_global_param_without_sample(editor):
+    assert editor.global_curve_param(None) == 0.0
+    make_curve(editor)
+    assert editor.global_curve_param(None) == 0.0
+    assert editor.global_curve_param(0) == 0.0
+    assert editor.global_curve_param(len(editor.cached_curve_points) - 1) == 1.0
@@ -0,0 +1,99 @@
+"""
+旋转 / 平移手势：旋转量计入合并的鼠标事件、被按键打断时不重复旋转，手势进行中按变换后的位置预选锚点.
+"""
+import math
+
+import pytest
+from PyQt5.QtCore import QEvent, QPointF, Qt
+from PyQt5.QtGui import QKeyEvent, QMouseEvent, QTransform
+
+CONTROL_POINTS = [(0, 0), (100, 300), (250, -20), (400, 350), (512, 100)]
+
+
+def mouse_event(kind, pos, button=Qt.NoButton, buttons=Qt.NoButton, modifiers=Qt.NoModifier):
+    return QMouseEvent(kind, QPointF(*pos), button, buttons, modifiers)
+
+
+@pytest.fixture
+def curve(editor):
+    editor.control_points = [QPointF(x, y) for x, y in CONTROL_POINTS]
+    editor.update_curve_cache()
+    editor.grab()  # 绘制一次，得到旋转速度依赖的边界尺寸
+    return editor
+
+
+def reset(editor):
+    editor.control_points = [QPointF(x, y) for x, y in CONTROL_POINTS]
+    editor.update_curve_cache()
+
+
+def rotate(editor, path, coalesce_from=None, interrupt_at=None):
+    """
+    按住右键沿 path（屏幕坐标）拖动，返回释放后的控制点.
+
+    从第 coalesce_from 个移动事件起事件都在同一帧内到达、只在释放前处理一次；interrupt_at 为在第几个移动事件之后按一次键.
+    """
+    editor.rotation_pivot_point = QPointF(256, 192)
+    editor.has_rotation_pivot = True
+    editor.mousePressEvent(mouse_event(QEvent.MouseButtonPress, path[0], Qt.RightButton, Qt.RightButton))
+    for k, pos in enumerate(path[1:], 1):
+        editor.mouseMoveEvent(mouse_event(QEvent.MouseMove, pos, buttons=Qt.RightButton))
+        if coalesce_from is None or k < coalesce_from:
+            editor.flush_pending_mouse_move()
+        if k == interrupt_at:
+            editor.keyPressEvent(QKeyEvent(QEvent.KeyPress, Qt.Key_A, Qt.NoModifier))
+    editor.mouseReleaseEvent(mouse_event(QEvent.MouseButtonRelease, path[-1], Qt.RightButton))
+    return [value for point in editor.control_points for value in (point.x(), point.y())]
+
+
+def rotated(angle):
+    transform = QTransform().translate(256, 192).rotateRadians(angle).translate(-256, -192)
+    points = [transform.map(QPointF(x, y)) for x, y in CONTROL_POINTS]
+    return [value for point in points for value in (point.x(), point.y())]
+
+
+def step_angle(editor, dx):
+    """从按下位置水平拖动 dx 像素时每个移动事件的旋转角度"""
+    return math.copysign(abs(dx) / (2 * editor.rect_height_large) * math.pi, dx)
+
+
+def test_rotation_counts_coalesced_events(curve):
+    # 停在同一位置的多个移动事件无论是否在同一帧内处理，旋转量相同
+    path = [(1200, 850), (1230, 850)] + [(1260, 850)] * 5
+    expected = rotated(step_angle(curve, 30) + 5 * step_angle(curve, 60))
+    assert rotate(curve, path) == pytest.approx(expected)
+    reset(curve)
+    assert rotate(curve, path, coalesce_from=2) == pytest.approx(expected)
+
+
+def test_key_press_mid_rotation_does_not_rotate_twice(curve):
+    path = [(1200, 850)] + [(1200 + 10 * k, 850) for k in range(1, 7)]
+    expected = rotated(sum(step_angle(curve, 10 * k) for k in range(1, 7)))
+    assert rotate(curve, path) == pytest.approx(expected)
+    reset(curve)
+    assert rotate(curve, path, interrupt_at=3) == pytest.approx(expected)
+
+
+def test_rotation_does_not_flip_when_crossing_start_column(curve):
+    curve.rotation_pivot_point = QPointF(256, 192)
+    curve.has_rotation_pivot = True
+    curve.mousePressEvent(mouse_event(QEvent.MouseButtonPress, (1200, 850), Qt.RightButton, Qt.RightButton))
+    angles = []
+    for x in (1240, 1220, 1202, 1198, 1180):
+        curve.process_mouse_move(mouse_event(QEvent.MouseMove, (x, 850), buttons=Qt.RightButton))
+        angles.append(curve.rotation_angle)
+    # 越过按下位置所在的列时，累计角度只变化这一次移动的小角度
+    assert abs(angles[3] - angles[2]) < 2 * abs(step_angle(curve, 2)) + 1e-12
+    assert angles[2] > 0
+
+
+def test_pre_select_follows_pending_pan(curve):
+    anchor = curve.control_points[3]
+    screen_x, screen_y = curve.camera.to_screen(anchor.x(), anchor.y())
+    # 在锚点上按下中键平移，锚点跟随光标移动，光标始终停在它上面
+    curve.mousePressEvent(mouse_event(QEvent.MouseButtonPress, (screen_x, screen_y), Qt.MiddleButton, Qt.MiddleButton))
+    curve.process_mouse_move(mouse_event(QEvent.MouseMove, (screen_x + 60, screen_y + 40), buttons=Qt.MiddleButton))
+
+    assert curve.gesture_transform is not None
+    assert curve.control_points[3] == anchor
+    assert curve.pre_selected_point_index == 3
@@ -0,0 +1,47 @@
+"""
+鼠标移动合并：同一帧内的移动事件只处理最新一次，统计收到、处理和合并的事件数.
+"""
+import time
+
+from PyQt5.QtCore import QEvent, QPointF, Qt
+from PyQt5.QtGui import QMouseEvent
+
+
+def move(editor, x, y):
+    editor.mouseMoveEvent(QMouseEvent(QEvent.MouseMove, QPointF(x, y), Qt.NoButton, Qt.NoButton, Qt.NoModifier))
+
+
+def test_moves_within_a_frame_are_merged(editor):
+    processed = []
+    editor.process_mouse_move = lambda event, merged_events=1: processed.append((event.pos(), merged_events))
+
+    for x in range(5):
+        move(editor, 100 + x, 200)
+    editor.flush_pending_mouse_move()
+    move(editor, 300, 200)
+    editor.flush_pending_mouse_move()
+    editor.flush_pending_mouse_move()  # 没有待处理的移动时什么也不做
+
+    assert [(pos.x(), pos.y(), merged) for pos, merged in processed] == [(104, 200, 5), (300, 200, 1)]
+    stats = editor.mouse_move_stats()
+    assert (stats["received"], stats["processed"], stats["merged"]) == (6, 2, 4)
+    assert stats["merge_rate"] == 4 / 6
+
+
+def test_slow_processing_stretches_the_frame_interval(editor):
+    editor.last_mouse_move_time = time.perf_counter()
+    editor.last_mouse_move_ms = 100.0
+    move(editor, 100, 200)
+    assert editor.mouse_move_timer.remainingTime() > 50
+
+
+def test_stats_are_logged_on_release(editor, editor_module, monkeypatch, capsys):
+    release = QMouseEvent(QEvent.MouseButtonRelease, QPointF(0, 0), Qt.LeftButton, Qt.NoButton, Qt.NoModifier)
+    editor.mouseReleaseEvent(release)
+    assert capsys.readouterr().out == ""
+
+    monkeypatch.setattr(editor_module, "LOG_MOUSE_MOVE_STATS", True)
+    move(editor, 100, 200)
+    move(editor, 110, 200)
+    editor.mouseReleaseEvent(release)
+    assert "收到 2，处理 1，合并 1 (50%)" in capsys.readouterr().out
@@ -0,0 +1,42 @@
+"""
+局部重绘的区域估计：文档范围按版本号缓存，Shift 悬停时的区域限制在窗口内.
+"""
+from PyQt5.QtCore import QPointF, QRectF
+
+
+def make_curve(editor):
+    editor.control_points = [QPointF(x, y) for x, y in [(0, 0), (100, 300), (250, -20), (400, 350), (512, 100)]]
+    editor.red_anchors = {3}
+    editor.update_curve_cache()
+
+
+def test_document_bounds_cached_per_revision(editor):
+    make_curve(editor)
+    view = editor.view_transform()
+    bounds = editor.cached_document_bounds(view)
+    assert editor.cached_document_bounds(view) is bounds
+
+    editor.control_points[1] = QPointF(120, 280)
+    editor.update_curve_cache(dirty_anchors=(1,))
+    assert editor.cached_document_bounds(view) is not bounds
+
+
+def test_shift_hover_rect_is_bounded(editor):
+    make_curve(editor)
+    editor.is_shift_pressed = True
+    window = QRectF(editor.rect())
+    for index in (2, 3):  # 与红色锚点相邻的白色锚点显示可移动直线，红色锚点显示切线
+        editor.pre_selected_point_index = index
+        rect = editor.hover_rect()
+        assert not rect.isEmpty()
+        # 切线和可移动直线裁剪到窗口，其余悬停元素最多超出窗口圆环半径
+        assert window.adjusted(-12, -12, 12, 12).contains(rect)
+
+
+def test_hover_state_tracks_preview_revision(editor):
+    make_curve(editor)
+    state = editor.hover_state()
+    editor.apply_preview_slider(None, None)
+    assert editor.hover_state() == state
+    editor.apply_preview_slider(editor.cached_curve_points, [0.0] * len(editor.cached_curve_points))
+    assert editor.hover_state() != state
@@ -0,0 +1,98 @@
+"""
+空间索引与逐点暴力计算的对照：随机点集、占用格子之外的查询点、max_distance 限制和等距时的最小索引.
+"""
+import math
+
+import numpy as np
+import pytest
+
+from bezier_core import PointHash, SampleGrid, SegmentGrid, point_segment_distances
+
+
+def brute_nearest(distances, max_distance=math.inf):
+    """距离相同时 argmin 取索引最小的点"""
+    if not len(distances):
+        return None, math.inf
+    k = int(np.argmin(distances))
+    if distances[k] > max_distance:
+        return None, math.inf
+    return k, float(distances[k])
+
+
+def random_points(rng, count):
+    # 整数坐标并带重复点，查询点也取整数坐标，这样等距的情况确实会出现
+    points = rng.integers(0, 64, (count, 2)).astype(np.float64)
+    return np.vstack((points, points[:count // 4]))
+
+
+def random_queries(rng, count):
+    # 一部分查询点远离所有已占用的格子
+    return np.vstack((rng.integers(-8, 72, (count, 2)), rng.integers(-400, 400, (count // 4, 2)))).astype(np.float64)
+
+
+@pytest.mark.parametrize("cell_size", [1.0, 7.0, 50.0])
+def test_sample_grid_matches_brute_force(cell_size):
+    rng = np.random.default_rng(11)
+    points = random_points(rng, 200)
+    grid = SampleGrid(points, cell_size)
+    queries = random_queries(rng, 200)
+
+    for x, y in queries.tolist():
+        distances = np.hypot(points[:, 0] - x, points[:, 1] - y)
+        assert grid.nearest(x, y) == brute_nearest(distances)
+        for max_distance in (0.0, 3.0, 20.0):
+            assert grid.nearest(x, y, max_distance) == brute_nearest(distances, max_distance)
+            assert grid.within_radius(x, y, max_distance).tolist() == np.flatnonzero(distances <= max_distance).tolist()
+
+    differences = queries[:, None, :] - points[None, :, :]
+    expected = np.hypot(differences[..., 0], differences[..., 1]).min(axis=1)
+    assert np.array_equal(grid.nearest_distances(queries), expected)
+    assert np.array_equal(grid.nearest_distances(queries, block_size=7), expected)
+
+
+def test_sample_grid_empty():
+    grid = SampleGrid(np.empty((0, 2)), 8.0)
+    assert grid.nearest(1.0, 2.0) == (None, math.inf)
+    assert np.all(np.isinf(grid.nearest_distances([(0.0, 0.0), (5.0, 5.0)])))
+
+
+@pytest.mark.parametrize("cell_size", [1.0, 7.0, 50.0])
+def test_point_hash_matches_brute_force(cell_size):
+    rng = np.random.default_rng(12)
+    points = [tuple(point) for point in random_points(rng, 60).tolist()]
+    point_hash = PointHash(cell_size, points)
+
+    def check(x, y):
+        distances = [math.hypot(px - x, py - y) for px, py in points]
+        for radius in (0.0, 3.0, 20.0):
+            assert point_hash.within_radius(x, y, radius) == [i for i, d in enumerate(distances) if d <= radius]
+            assert point_hash.nearest(x, y, radius) == brute_nearest(np.array(distances), radius)
+
+    for step in range(300):
+        # 移动距离大于格子边长，点会在格子之间迁移；也会移动到已有点上制造等距
+        index = int(rng.integers(len(points)))
+        if step % 5 == 0:
+            x, y = points[int(rng.integers(len(points)))]
+        else:
+            x, y = rng.integers(-100, 164, 2).astype(np.float64).tolist()
+        points[index] = (x, y)
+        point_hash.move(index, x, y)
+        if step % 10 == 0:
+            for qx, qy in random_queries(rng, 8).tolist():
+                check(qx, qy)
+    assert len(point_hash) == len(points)
+    # 移动之后的状态与按最终点集重建的结果一致
+    assert point_hash._cells == PointHash(cell_size, points)._cells
+
+
+@pytest.mark.parametrize("cell_size", [1.0, 7.0, 50.0])
+def test_segment_grid_matches_brute_force(cell_size):
+    rng = np.random.default_rng(13)
+    vertices = random_points(rng, 80)
+    grid = SegmentGrid.from_polyline(vertices, cell_size)
+    starts, ends = vertices[:-1], vertices[1:]
+
+    for x, y in random_queries(rng, 200).tolist():
+        distances = point_segment_distances(np.array([[x, y]]), starts, ends)
+        for max_distance in (0.0, 3.0, 20.0, 1000.0):
+            assert grid.nearest(x, y, max_distance) == brute_nearest(distances, max_distance)
@@ -0,0 +1,91 @@
+"""
+按分段缓存的细分：增量更新和预览复用的分段必须与整条曲线重新细分的结果完全相同.
+"""
+import numpy as np
+import pytest
+
+from bezier_core import CurveCache, tessellate_curve
+
+NUM_SEGMENTS = 50
+
+
+def assert_same(tessellation, points, red_anchors, tolerance):
+    expected = tessellate_curve(points, red_anchors, NUM_SEGMENTS, tolerance)
+    assert np.array_equal(tessellation.points, expected.points)
+    assert np.array_equal(tessellation.t_values, expected.t_values)
+    assert tessellation.segments == expected.segments
+    assert tessellation.sample_ranges == expected.sample_ranges
+
+
+@pytest.mark.parametrize("tolerance", [None, 0.5])
+def test_dirty_updates_match_full_rebuild(tolerance):
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 512, (12, 2))
+    red_anchors = {4, 8}
+    cache = CurveCache()
+    cache.update(points, red_anchors, NUM_SEGMENTS, tolerance)
+
+    for step in range(200):
+        action = rng.choice(["move", "move_many", "toggle_red", "insert", "delete"])
+        if action == "move":
+            idx = int(rng.integers(len(points)))
+            points[idx] += rng.normal(0, 20, 2)
+            dirty = (idx,)
+        elif action == "move_many":
+            dirty = tuple(int(idx) for idx in rng.choice(len(points), 3, replace=False))
+            points[list(dirty)] += rng.normal(0, 20, (3, 2))
+        elif action == "toggle_red":
+            idx = int(rng.integers(1, len(points) - 1))
+            red_anchors ^= {idx}
+            dirty = ()
+        elif action == "insert":
+            idx = int(rng.integers(1, len(points)))
+            points = np.insert(points, idx, rng.uniform(0, 512, 2), axis=0)
+            red_anchors = {red if red < idx else red + 1 for red in red_anchors}
+            dirty = (idx,)
+        elif len(points) > 4:
+            idx = int(rng.integers(1, len(points) - 1))
+            points = np.delete(points, idx, axis=0)
+            red_anchors = {red if red < idx else red - 1 for red in red_anchors if red != idx}
+            dirty = (min(idx, len(points) - 1),)
+        else:
+            continue
+        tessellation = cache.update(points, red_anchors, NUM_SEGMENTS, tolerance, dirty_anchors=dirty)
+        assert_same(tessellation, points, red_anchors, tolerance)
+        if action in ("move", "move_many"):
+            # 只移动锚点时分段布局不变，只重算包含移动过的锚点的分段
+            touched = [i for i, (start, end) in enumerate(tessellation.segments)
+                       if any(start <= idx <= end for idx in dirty)]
+            assert cache.rebuilt_segments == len(touched)
+
+
+POINTS = np.random.default_rng(2).uniform(0, 512, (10, 2))
+RED_ANCHORS = {3, 6}   # 分段 (0, 3)、(3, 6)、(6, 9)
+
+
+@pytest.mark.parametrize("tolerance", [None, 0.5])
+@pytest.mark.parametrize("inserted, segment_idx", [(2, 0), (5, 1), (8, 2)])
+def test_preview_insert_matches_full_tessellation(tolerance, inserted, segment_idx):
+    cache = CurveCache()
+    cache.update(POINTS, RED_ANCHORS, NUM_SEGMENTS, tolerance)
+    points = np.insert(POINTS, inserted, (256.0, 192.0), axis=0)
+    red_anchors = {red if red < inserted else red + 1 for red in RED_ANCHORS}
+
+    tessellation, rebuilt = cache.preview(points, red_anchors, NUM_SEGMENTS, tolerance, inserted=inserted)
+    assert_same(tessellation, points, red_anchors, tolerance)
+    assert rebuilt == [segment_idx]
+
+
+@pytest.mark.parametrize("tolerance", [None, 0.5])
+@pytest.mark.parametrize("deleted, segment_idx", [(1, 0), (4, 1), (8, 2)])
+def test_preview_delete_matches_full_tessellation(tolerance, deleted, segment_idx):
+    cache = CurveCache()
+    cache.update(POINTS, RED_ANCHORS, NUM_SEGMENTS, tolerance)
+    points = np.delete(POINTS, deleted, axis=0)
+    red_anchors = {red if red < deleted else red - 1 for red in RED_ANCHORS}
+
+    tessellation, rebuilt = cache.preview(points, red_anchors, NUM_SEGMENTS, tolerance, deleted=deleted)
+    assert_same(tessellation, points, red_anchors, tolerance)
+    assert rebuilt == [segment_idx]
+    # 预览不修改缓存
+    assert_same(cache.tessellation, POINTS, RED_ANCHORS, tolerance)